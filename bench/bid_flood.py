@@ -0,0 +1,89 @@
+import os
+import sys
+
+os.environ.setdefault("SQLITE_DB_PATH", ":memory:")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["BID_BATCH_MS"] = "0"
+
+import asyncio
+import time
+from bench.offline import offline_app, close_app, api_calls, statements, bid_update, new_auction_update
+
+CHANNEL, CHAT, SELLER = -1001, -2001, 7
+
+# python -m bench.bid_flood [messages]
+# Handler cost of bids that go through against bids the flood control drops.
+# Every message goes through Application.process_update, so the cost is the
+# full handler path. A dropped bid may only run the one indexed lookup that
+# finds the auction's bot; exits 1 if dropped bids wrote to the DB or called
+# the Bot API (beyond the one warning per user per window).
+
+
+async def _measure(app, updates):
+    s0, c0 = statements(), api_calls(app)
+    started = time.perf_counter()
+    for update in updates:
+        await app.process_update(update)
+    took = time.perf_counter() - started
+    return took / len(updates) * 1e6, (statements() - s0) / len(updates), (api_calls(app) - c0) / len(updates)
+
+
+async def main(messages: int) -> int:
+    from db.connection import DB
+    from controllers.bid import flood_control
+    app = await offline_app("1:bench")
+    limiter = flood_control(app.bot_data)
+    DB.execute("INSERT INTO bindings (user_id, channel_id) VALUES (?, ?)", (SELLER, CHANNEL))
+    DB.commit()
+    await app.process_update(new_auction_update(app, 1, SELLER, '/sa "Bench lot" 10 10 1 600 0 "bench"'))
+    post_id = DB.execute("SELECT channel_post_id FROM auctions").fetchone()[0]
+    update_id = 10
+
+    def bids(users, per_user, start_amount):
+        nonlocal update_id
+        out = []
+        amount = start_amount
+        for _ in range(per_user):
+            for user in users:
+                update_id += 1
+                out.append(bid_update(app, update_id, user, CHAT, CHANNEL, post_id, str(amount)))
+                amount += 1
+        return out
+
+    # Accepted bids, with the limits out of the way
+    users_limit, chats_limit = limiter.users.limit, limiter.chats.limit
+    limiter.users.limit = limiter.chats.limit = 10 ** 9
+    accepted = await _measure(app, bids(range(100, 300), 1, 10))
+    limiter.users.limit, limiter.chats.limit = users_limit, chats_limit
+
+    # One user flooding: everything past BID_USER_LIMIT per window is dropped
+    before = dict(limiter.counters)
+    one_user = await _measure(app, flood := bids([9], messages, 10 ** 6))
+    dropped_one = limiter.counters["dropped_user"] - before["dropped_user"]
+
+    # Many users flooding the same chat: the chat limit takes over
+    before = dict(limiter.counters)
+    many = await _measure(app, crowd := bids(range(10 ** 5, 10 ** 5 + 500), max(1, messages // 500), 10 ** 7))
+    dropped_many = sum(limiter.counters[k] - before[k] for k in ("dropped_user", "dropped_chat"))
+
+    print(f"{'scenario':<28}{'us/msg':>10}{'sql/msg':>10}{'api/msg':>10}")
+    print(f"{'accepted bids':<28}{accepted[0]:>10.1f}{accepted[1]:>10.2f}{accepted[2]:>10.3f}")
+    print(f"{'1 user flooding':<28}{one_user[0]:>10.1f}{one_user[1]:>10.4f}{one_user[2]:>10.4f}  dropped={dropped_one}")
+    print(f"{'500 users, 1 chat':<28}{many[0]:>10.1f}{many[1]:>10.4f}{many[2]:>10.4f}  dropped={dropped_many}")
+    print(f"flood control: {limiter.stats()}")
+    await close_app(app)
+
+    # Only the bids that got through may touch the DB; dropped ones cost at most one warning per user
+    def bounded(result, sent, dropped, users):
+        allowed = sent - dropped
+        return result[1] * sent <= allowed * accepted[1] * 2 and result[2] * sent <= allowed * 2 + users
+
+    ok = bounded(one_user, len(flood), dropped_one, 1) and bounded(many, len(crowd), dropped_many, 500)
+    print("OK: flooded bids are dropped before any write or API call" if ok else "FAIL: flooded bids reached the DB or the Bot API")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    from config.settings import configure_logging
+    configure_logging()
+    sys.exit(asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)))
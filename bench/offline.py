@@ -0,0 +1,116 @@
+import json
+from collections import Counter
+from telegram import Update
+from telegram.ext import Application
+from setups.startup_check import OfflineRequest
+from utils.time import now
+
+# Shared by the `python -m bench.<name>` scripts: the real Application and
+# handlers, run against the local Bot API stand-in of the start-up check.
+
+
+# OfflineRequest that also answers sendMessage/sendPhoto with a message and
+# counts every Bot API call by method
+class CountingRequest(OfflineRequest):
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+        self._message_id = 1000
+
+    async def do_request(self, url, method, request_data=None, **timeouts):
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls[endpoint] += 1
+        if endpoint in ("sendMessage", "sendPhoto"):
+            params = request_data.parameters if request_data else {}
+            self._message_id += 1
+            result = {
+                "message_id": self._message_id,
+                "date": now(),
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "channel"},
+            }
+            return 200, json.dumps({"ok": True, "result": result}).encode()
+        return await super().do_request(url, method, request_data, **timeouts)
+
+
+async def offline_app(token: str) -> Application:
+    from bot import create_apps
+    from db.connection import DB
+    requests = CountingRequest()
+    app = create_apps([token], lambda _token: (requests, OfflineRequest()))[0]
+    app.bot_data["requests"] = requests
+    DB.open()
+    await app.initialize()
+    await app.start()
+    return app
+
+
+async def close_app(app: Application):
+    await app.stop()
+    await app.shutdown()
+
+
+def api_calls(app: Application) -> int:
+    return sum(n for method, n in app.bot_data["requests"].calls.items() if method != "getMe")
+
+
+# SQL statements (and commits) run so far
+def statements() -> int:
+    from db.connection import DB
+    return sum(st.count for st in DB.stats.values())
+
+
+# A reply in `chat_id` to the auto-forward of channel post `post_id`
+def bid_update(app: Application, update_id: int, user_id: int, chat_id: int, channel_id: int, post_id: int, text: str) -> Update:
+    ts = now()
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": ts,
+            "chat": {"id": chat_id, "type": "supergroup", "title": "discussion"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "text": text,
+            "reply_to_message": {
+                "message_id": post_id,
+                "date": ts,
+                "chat": {"id": chat_id, "type": "supergroup", "title": "discussion"},
+                "is_automatic_forward": True,
+                "forward_origin": {
+                    "type": "channel",
+                    "chat": {"id": channel_id, "type": "channel", "title": "channel"},
+                    "message_id": post_id,
+                    "date": ts,
+                },
+            },
+        },
+    }, app.bot)
+
+
+# `/sa` photo post from `user_id` in a private chat with the bot
+def new_auction_update(app: Application, update_id: int, user_id: int, caption: str) -> Update:
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": now(),
+            "chat": {"id": user_id, "type": "private", "first_name": f"user{user_id}"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "photo": [{"file_id": "bench", "file_unique_id": "bench", "width": 1, "height": 1}],
+            "caption": caption,
+        },
+    }, app.bot)
+
+
+# A command such as "/search lamp" from `user_id` in a private chat with the bot
+def command_update(app: Application, update_id: int, user_id: int, text: str) -> Update:
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": now(),
+            "chat": {"id": user_id, "type": "private", "first_name": f"user{user_id}"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+            "text": text,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}],
+        },
+    }, app.bot)
@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+
+_tmp = tempfile.TemporaryDirectory(prefix="bench-search-")
+os.environ["SQLITE_DB_PATH"] = os.path.join(_tmp.name, "search.db")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("DB_SLOW_MS", "600000")
+
+import asyncio
+import statistics
+import time
+from bench.offline import offline_app, close_app, command_update
+
+WORDS = (
+    "vintage brass lamp watch camera lens film rolex seiko omega leica canon nikon tripod record vinyl "
+    "guitar amp pedal coin stamp silver gold ring chair table desk sofa print poster comic card lego"
+).split()
+QUERIES = (["vintage"], ["vintage", "lamp"], ["vin*"], ["item", "12345"])
+STATUSES = (("LIVE",), ("ENDED",), ("LIVE", "ENDED"))
+
+# python -m bench.search_1m [lots]
+# /search against a large auction history (1M lots by default, 1 in 50 LIVE).
+# Times each query shape with and without SEARCH_RANK_CAP on a read-only
+# connection, then sends /search through the real handler while a ticker
+# measures how long the event loop is held. Exits 1 if the capped queries are
+# not several times cheaper than ranking every match, or if a search stalls
+# the loop.
+
+
+def _fill(db, lots: int):
+    db.conn.create_function("word", 1, lambda i: WORDS[i % len(WORDS)], deterministic=True)
+    db.execute(
+        """
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO auctions (channel_post_id, channel_id, sb, rp, min_inc, end_time, anti_snipe, highest_bid,
+                              status, title, description, owner_user_id, bot_id)
+        SELECT i, -100 - i % 20, 10, 10, 1, 1800000000 + i, 0, 0, CASE WHEN i % 50 = 0 THEN 'LIVE' ELSE 'ENDED' END,
+               word(i * 7) || ' ' || word(i * 13 / 3) || ' ' || word(i * 31 / 7),
+               word(i * 17 / 5) || ' ' || word(i * 3 / 11) || ' item ' || i, i % 1000, 1
+        FROM n
+        """,
+        (lots,),
+    )
+    db.commit()
+
+
+def _time(conn, terms, statuses, cap, runs=3) -> float:
+    from db.search import search
+    took = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        search(conn, terms, statuses, None, 11, 0, cap)
+        took.append(time.perf_counter() - started)
+    return statistics.median(took) * 1000
+
+
+async def _loop_lag(app, searches: int):
+    worst, ticks, stop = 0.0, 0, asyncio.Event()
+
+    async def ticker():
+        nonlocal worst, ticks
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, time.perf_counter() - started - 0.001)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    for i in range(searches):
+        terms = " ".join(QUERIES[i % len(QUERIES)])
+        await app.process_update(command_update(app, 100 + i, 7, f"/search {terms} status:all"))
+    took = time.perf_counter() - started
+    stop.set()
+    await task
+    return took / searches * 1000, worst * 1000, ticks
+
+
+async def main(lots: int) -> int:
+    from db.connection import DB, open_reader
+    from config.settings import SEARCH_RANK_CAP
+    app = await offline_app("1:bench")
+
+    started = time.perf_counter()
+    _fill(DB, lots)
+    print(f"filled {lots} lots in {time.perf_counter() - started:.1f}s")
+
+    reader = open_reader()
+    rows = []
+    try:
+        for terms in QUERIES:
+            for statuses in STATUSES:
+                rows.append((" ".join(terms), "+".join(statuses).lower(),
+                             _time(reader, terms, statuses, 2 ** 62), _time(reader, terms, statuses, SEARCH_RANK_CAP)))
+    finally:
+        reader.close()
+
+    print(f"{'query':<18}{'status':<12}{'all ms':>10}{f'cap {SEARCH_RANK_CAP} ms':>16}")
+    for query, status, full, capped in rows:
+        print(f"{query:<18}{status:<12}{full:>10.1f}{capped:>16.1f}")
+    per_search, lag, ticks = await _loop_lag(app, 20)
+    print(f"/search via handler: {per_search:.1f} ms/search, worst loop stall {lag:.1f} ms over {ticks} ticks")
+    await close_app(app)
+
+    full_worst, capped_worst = max(r[2] for r in rows), max(r[3] for r in rows)
+    ok = capped_worst * 3 <= full_worst and lag < 25
+    print(
+        f"OK: worst query {capped_worst:.1f} ms (uncapped {full_worst:.1f} ms), loop never held past 25 ms"
+        if ok else f"FAIL: worst query {capped_worst:.1f} ms (uncapped {full_worst:.1f} ms), loop stall {lag:.1f} ms"
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    from config.settings import configure_logging
+    configure_logging()
+    try:
+        sys.exit(asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)))
+    finally:
+        _tmp.cleanup()
@@ -1,65 +1,261 @@
+import time
+_T0 = time.perf_counter()
+
+import asyncio
+import importlib
+import signal
+import sys
+from typing import List, Optional
+from telegram import Update
 from telegram.ext import (
+    Application,
     ApplicationBuilder,
     MessageHandler,
     CommandHandler,
+    TypeHandler,
     filters,
 )
-from config.settings import BOT_TOKEN, logger
-from controllers.new_auction import handle_newauction
-from controllers.schedule_auction import handle_scheduleauction
-from controllers.bid import handle_bid
-from controllers.summary import handle_summary
-from controllers.help import handle_help
-from controllers.bind import handle_bind
-from controllers.view_schedule import handle_view_schedule
-from controllers.cancel import handle_cancel
-from setups.scheduler import on_startup
+from config.settings import BOT_TOKENS, UPDATE_CONCURRENCY, STARTUP_BUDGET_MS, HA_ENABLED, logger, configure_logging
+from setups.bots import register, bot_id_from_token
+from setups.dispatch import DISPATCH
+from utils import startup
 
-def main():
-    app = (
-        ApplicationBuilder()
-        .token(BOT_TOKEN)
-        .post_init(on_startup)
-        .build()
-    )
+startup.begin(_T0)
+
+# Controllers are imported the first time their handler runs, so start-up only
+# pays for the ones the first updates actually need.
+def _lazy(target: str):
+    module, _, name = target.rpartition(".")
+    handler = None
+
+    async def callback(update, context):
+        nonlocal handler
+        if handler is None:
+            handler = getattr(importlib.import_module(module), name)
+        return await handler(update, context)
+
+    return callback
+
+async def _first_update(update: Update, context):
+    if startup.first_update():
+        logger.info("Startup: %s", startup.report())
+
+# Application factory. `request` / `updates_request` replace the HTTP layer
+# (the start-up check answers the Bot API locally).
+def build_app(token: str, request=None, updates_request=None) -> Application:
+    builder = ApplicationBuilder().token(token)
+    if UPDATE_CONCURRENCY > 1:
+        builder = builder.concurrent_updates(DISPATCH)
+    if request is not None:
+        builder = builder.request(request).get_updates_request(updates_request)
+    app = builder.build()
+
+    app.add_handler(TypeHandler(Update, _first_update, block=False), group=-1)
 
     app.add_handler(CommandHandler(
         "help",
-        handle_help,
+        _lazy("controllers.help.handle_help"),
         filters=filters.ChatType.PRIVATE,
     ))
     app.add_handler(CommandHandler(
         "summary",
-        handle_summary,
+        _lazy("controllers.summary.handle_summary"),
         filters=filters.ChatType.PRIVATE,
     ))
     app.add_handler(CommandHandler(
         "bind",
-        handle_bind,
+        _lazy("controllers.bind.handle_bind"),
         filters=filters.ChatType.PRIVATE,
     ))
     app.add_handler(CommandHandler(
         "viewschedule",
-        handle_view_schedule,
+        _lazy("controllers.view_schedule.handle_view_schedule"),
         filters=filters.ChatType.PRIVATE,
     ))
     app.add_handler(CommandHandler(
         "cancel",
-        handle_cancel,
+        _lazy("controllers.cancel.handle_cancel"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "stats",
+        _lazy("controllers.stats.handle_stats"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "search",
+        _lazy("controllers.search.handle_search"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "export",
+        _lazy("controllers.export.handle_export"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "maxbid",
+        _lazy("controllers.max_bid.handle_maxbid"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "watch",
+        _lazy("controllers.watch.handle_watch"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "unwatch",
+        _lazy("controllers.watch.handle_unwatch"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "outbox",
+        _lazy("controllers.outbox.handle_outbox"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "flood",
+        _lazy("controllers.flood.handle_flood"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "dispatch",
+        _lazy("controllers.dispatch.handle_dispatch"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "profile",
+        _lazy("controllers.profile.handle_profile"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "dbstats",
+        _lazy("controllers.db_stats.handle_dbstats"),
+        filters=filters.ChatType.PRIVATE,
+    ))
+    app.add_handler(CommandHandler(
+        "backup",
+        _lazy("controllers.backup.handle_backup"),
         filters=filters.ChatType.PRIVATE,
     ))
     app.add_handler(MessageHandler(
         filters.PHOTO & filters.ChatType.PRIVATE & filters.CaptionRegex(r'^/schedulesa(\s|$)'),
-        handle_scheduleauction
+        _lazy("controllers.schedule_auction.handle_scheduleauction")
     ))
     app.add_handler(MessageHandler(
         filters.PHOTO & filters.ChatType.PRIVATE & filters.CaptionRegex(r'^/sa(\s|$)'),
-        handle_newauction
+        _lazy("controllers.new_auction.handle_newauction")
     ))
-    app.add_handler(MessageHandler(filters.TEXT & filters.ChatType.GROUPS & filters.REPLY, handle_bid))
+    app.add_handler(MessageHandler(
+        filters.IS_AUTOMATIC_FORWARD & filters.ChatType.GROUPS,
+        _lazy("controllers.auto_forward.handle_auto_forward"),
+    ))
+    app.add_handler(MessageHandler(
+        filters.TEXT & filters.ChatType.GROUPS & filters.REPLY,
+        _lazy("controllers.bid.handle_bid"),
+    ))
+    return app
+
+def create_apps(tokens, request_factory=None) -> List[Application]:
+    apps = []
+    for token in tokens:
+        requests = request_factory(token) if request_factory else (None, None)
+        app = build_app(token, *requests)
+        register(bot_id_from_token(token), app)
+        apps.append(app)
+    return apps
+
+# One event loop polls every configured bot; DB, scheduler and caches are shared.
+async def run(tokens, request_factory=None, stop: Optional[asyncio.Event] = None):
+    startup.record("import", startup.elapsed())
+    started = time.perf_counter()
+    apps = create_apps(tokens, request_factory)
+    startup.record("apps", time.perf_counter() - started)
+
+    # The DB opens here rather than at import
+    from db.connection import DB
+    from setups.scheduler import on_startup, on_shutdown
+    DB.open()
+
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
 
-    logger.info("🤖 Auction bot running")
-    app.run_polling()
+    started = time.perf_counter()
+    for app in apps:
+        await app.initialize()
+    startup.record("initialize", time.perf_counter() - started)
+    lease_task = None
+    try:
+        # A standby stays here, following the active instance, until it gets the lease
+        if HA_ENABLED:
+            from setups import standby
+            if not await standby.wait_for_lease(stop):
+                return
+            lease_task = loop.create_task(standby.hold_lease(stop))
+        await on_startup(apps)
+        for app in apps:
+            await app.start()
+            await app.updater.start_polling()
+            logger.info("🤖 Auction bot running: @%s", app.bot.username)
+        await stop.wait()
+    finally:
+        for app in reversed(apps):
+            if app.updater.running:
+                await app.updater.stop()
+            if app.running:
+                await app.stop()
+        await on_shutdown(apps)
+        for app in reversed(apps):
+            await app.shutdown()
+        if lease_task:
+            lease_task.cancel()
+            standby.release()
+
+# python bot.py --startup-check [budget_ms]
+# Starts the whole bot against a local stand-in for the Bot API and an
+# in-memory DB (unless SQLITE_DB_PATH is set), waits for one synthetic update
+# and exits 1 if it was handled later than the budget after process start.
+async def startup_check(budget_ms: float) -> int:
+    from setups.startup_check import OfflineRequest, first_update_payload
+    stop = asyncio.Event()
+    token = "1:startup-check"
+
+    def requests(_token):
+        return OfflineRequest(), OfflineRequest([first_update_payload()])
+
+    async def stop_after_first_update():
+        while startup.time_to_first_update() is None:
+            await asyncio.sleep(0.01)
+        stop.set()
+
+    waiter = asyncio.get_running_loop().create_task(stop_after_first_update())
+    try:
+        await asyncio.wait_for(run([token], requests, stop), timeout=max(budget_ms / 1000 * 10, 30))
+    finally:
+        waiter.cancel()
+
+    took = startup.time_to_first_update()
+    print(f"startup: {startup.report()}")
+    if took is None or took * 1000 > budget_ms:
+        print(f"FAIL: time to first update {'n/a' if took is None else f'{took * 1000:.0f}ms'} > budget {budget_ms:g}ms")
+        return 1
+    print(f"OK: time to first update {took * 1000:.0f}ms <= budget {budget_ms:g}ms")
+    return 0
+
+def main():
+    configure_logging()
+    if "--startup-check" in sys.argv[1:]:
+        import os
+        os.environ.setdefault("SQLITE_DB_PATH", ":memory:")
+        args = [a for a in sys.argv[1:] if a != "--startup-check"]
+        sys.exit(asyncio.run(startup_check(float(args[0]) if args else STARTUP_BUDGET_MS)))
+    if not BOT_TOKENS:
+        raise RuntimeError("BOT_TOKEN (or BOT_TOKENS) environment variable not set")
+    asyncio.run(run(BOT_TOKENS))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,126 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Tuple
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+
+class _Event:
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: dict):
+        self.event = event
+        self.fields = fields
+
+    # Rendered lazily, on the listener thread
+    def __str__(self) -> str:
+        if not self.fields:
+            return self.event
+        return self.event + " " + " ".join(f"{k}={v!r}" if isinstance(v, str) else f"{k}={v}" for k, v in self.fields.items())
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The queue never leaves the process, so skip the eager formatting QueueHandler.prepare
+    # does on the caller's thread. Log args must not be mutated after the call.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {"ts": round(record.created, 3), "level": record.levelname, "logger": record.name}
+        if isinstance(record.msg, _Event):
+            out["event"] = record.msg.event
+            out.update(record.msg.fields)
+        else:
+            out["msg"] = record.getMessage()
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class KeyValueFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        head = f"ts={record.created:.3f} level={record.levelname} logger={record.name}"
+        if isinstance(record.msg, _Event):
+            line = f"{head} event={record.msg}"
+        else:
+            line = f"{head} msg={record.getMessage()!r}"
+        if record.exc_info:
+            line += " exc=" + repr(self.formatException(record.exc_info))
+        return line
+
+
+# Keeps every Nth occurrence of an event and at most `rate_cap` per second,
+# remembering how many were dropped so the next emitted line can report it.
+class EventSampler:
+    def __init__(self, sample_rate: float, rate_cap: int):
+        self.every = max(1, round(1 / sample_rate)) if sample_rate > 0 else 0
+        self.rate_cap = rate_cap
+        self._state: Dict[str, list] = {}
+
+    def allow(self, event: str) -> Tuple[bool, int]:
+        # state: [seen, window_start, emitted_in_window, suppressed]
+        st = self._state.get(event)
+        if st is None:
+            st = self._state[event] = [0, 0.0, 0, 0]
+        st[0] += 1
+        if not self.every or (st[0] - 1) % self.every:
+            st[3] += 1
+            return False, 0
+        if self.rate_cap:
+            t = time.monotonic()
+            if t - st[1] >= 1.0:
+                st[1] = t
+                st[2] = 0
+            if st[2] >= self.rate_cap:
+                st[3] += 1
+                return False, 0
+            st[2] += 1
+        suppressed, st[3] = st[3], 0
+        return True, suppressed
+
+
+_sampler = EventSampler(1.0, 0)
+
+
+def log_event(logger: logging.Logger, level: int, event: str, *, sampled: bool = False, **fields):
+    if not logger.isEnabledFor(level):
+        return
+    if sampled:
+        emit, suppressed = _sampler.allow(event)
+        if not emit:
+            return
+        if suppressed:
+            fields["suppressed"] = suppressed
+    logger.log(level, _Event(event, fields))
+
+
+def setup_logging(level: str = "INFO", fmt: str = "text", sample_rate: float = 1.0, rate_cap: int = 0):
+    global _sampler
+    _sampler = EventSampler(sample_rate, rate_cap)
+
+    stream = logging.StreamHandler(sys.stderr)
+    if fmt == "json":
+        stream.setFormatter(JsonFormatter())
+    elif fmt == "kv":
+        stream.setFormatter(KeyValueFormatter())
+    else:
+        stream.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    # Formatting and stderr writes happen on the listener thread, not the event loop
+    q = queue.SimpleQueue()
+    listener = QueueListener(q, stream, respect_handler_level=True)
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(_DeferredQueueHandler(q))
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
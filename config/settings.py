@@ -2,20 +2,131 @@ import os
 import logging
 from dotenv import load_dotenv
 from datetime import timezone, timedelta
+from config.log import setup_logging
 
 load_dotenv()
 
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
+# Several storefront bots can share one process: BOT_TOKENS="token1,token2". The first is primary.
+BOT_TOKENS = [t.strip() for t in os.environ.get("BOT_TOKENS", "").split(",") if t.strip()]
+if BOT_TOKEN and BOT_TOKEN not in BOT_TOKENS:
+    BOT_TOKENS.insert(0, BOT_TOKEN)
 BIND_SECRET = os.environ.get("BIND_SECRET")
 DEFAULT_CHANNEL_ID = int(os.environ.get("CHANNEL_ID", 0))
+ADMIN_USER_IDS = {
+    int(x) for x in os.environ.get("ADMIN_USER_IDS", "").replace(",", " ").split() if x.strip()
+}
+
+# Outbox delivery of Telegram side effects
+OUTBOX_POLL_SECONDS = float(os.environ.get("OUTBOX_POLL_SECONDS", 1))
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", 50))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 8))
+OUTBOX_BASE_DELAY = int(os.environ.get("OUTBOX_BASE_DELAY", 2))
+OUTBOX_MAX_DELAY = int(os.environ.get("OUTBOX_MAX_DELAY", 300))
+# Deliveries in flight at once, each to a different chat
+OUTBOX_CONCURRENCY = int(os.environ.get("OUTBOX_CONCURRENCY", 8))
+# Seconds a dead-lettered row is kept before it is pruned
+OUTBOX_DEAD_RETENTION = int(os.environ.get("OUTBOX_DEAD_RETENTION", 7 * 86400))
+
+# Bid flood control (sliding window, per user and per discussion chat)
+BID_RATE_WINDOW = float(os.environ.get("BID_RATE_WINDOW", 10))
+BID_USER_LIMIT = int(os.environ.get("BID_USER_LIMIT", 5))
+BID_CHAT_LIMIT = int(os.environ.get("BID_CHAT_LIMIT", 100))
+BID_FLOOD_WARN = _env_flag("BID_FLOOD_WARN", True)
+# Bids on the same auction arriving within this many ms are resolved together (0 = one at a time)
+BID_BATCH_MS = float(os.environ.get("BID_BATCH_MS", 50))
+
+# Concurrent update handling: at most UPDATE_CONCURRENCY handlers run at once
+# (1 = PTB's one-at-a-time default); updates for the same discussion thread or
+# private chat stay in order. UPDATE_MAX_PENDING bounds updates waiting in total.
+# Handlers share one SQLite connection and mostly serialize on it; the overlap
+# is in Bot API awaits, which a handful of slots already covers.
+UPDATE_CONCURRENCY = int(os.environ.get("UPDATE_CONCURRENCY", 8))
+UPDATE_MAX_PENDING = int(os.environ.get("UPDATE_MAX_PENDING", 1024))
+
+# Outbid / ending-soon DMs, merged per recipient per window
+NOTIFY_WINDOW = float(os.environ.get("NOTIFY_WINDOW", 30))
+NOTIFY_MAX_PER_FLUSH = int(os.environ.get("NOTIFY_MAX_PER_FLUSH", 150))
+NOTIFY_ENDING_SOON = int(os.environ.get("NOTIFY_ENDING_SOON", 300))
+
+# Opt-in "time left" line on live captions. One ticker every COUNTDOWN_TICK seconds
+# edits only lots that crossed one of COUNTDOWN_MARKS (seconds), at most
+# COUNTDOWN_EDITS_PER_TICK per tick, nearest-to-closing first.
+COUNTDOWN_ENABLED = _env_flag("COUNTDOWN_ENABLED", False)
+COUNTDOWN_TICK = float(os.environ.get("COUNTDOWN_TICK", 30))
+COUNTDOWN_EDITS_PER_TICK = int(os.environ.get("COUNTDOWN_EDITS_PER_TICK", 10))
+COUNTDOWN_MARKS = tuple(sorted(
+    (int(x) for x in os.environ.get("COUNTDOWN_MARKS", "86400,21600,3600,1800,600,300,60").replace(",", " ").split()),
+    reverse=True,
+))
+
+# Read-only JSON API over live auction state for the storefront (API_PORT=0 turns it off).
+# Long-polls (?since=<version>) wait at most API_LONGPOLL_MAX seconds.
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT", 0))
+API_LONGPOLL_MAX = float(os.environ.get("API_LONGPOLL_MAX", 30))
 
-if not BOT_TOKEN:
-    raise RuntimeError("BOT_TOKEN environment variable not set")
+# /search ranks only the newest SEARCH_RANK_CAP matching lots, so a common
+# word costs the same however large the auction history grows
+SEARCH_RANK_CAP = int(os.environ.get("SEARCH_RANK_CAP", 2000))
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+# SQLite statement timing: statements slower than DB_SLOW_MS are logged with their query plan
+DB_SLOW_MS = float(os.environ.get("DB_SLOW_MS", 50))
+DB_STATS_MAX = int(os.environ.get("DB_STATS_MAX", 200))
+
+# Online backups of the DB: gzipped, integrity-checked snapshots in BACKUP_DIR
+# every BACKUP_INTERVAL seconds (0 = only on /backup now), newest BACKUP_KEEP
+# kept. BACKUP_PAGES pages are copied per step, with a
+# BACKUP_STEP_PAUSE second pause between steps.
+BACKUP_DIR = os.environ.get(
+    "BACKUP_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "backups"),
+)
+BACKUP_INTERVAL = float(os.environ.get("BACKUP_INTERVAL", 0))
+BACKUP_KEEP = int(os.environ.get("BACKUP_KEEP", 7))
+BACKUP_PAGES = int(os.environ.get("BACKUP_PAGES", 256))
+BACKUP_STEP_PAUSE = float(os.environ.get("BACKUP_STEP_PAUSE", 0.005))
+
+# Hot standby: with HA_ENABLED every instance competes for a lease row in settings.
+# The holder polls and schedules and renews every LEASE_RENEW seconds; the others
+# follow its commits every STANDBY_POLL seconds and take over once LEASE_TTL lapses.
+HA_ENABLED = _env_flag("HA_ENABLED")
+LEASE_TTL = int(os.environ.get("LEASE_TTL", 10))
+LEASE_RENEW = float(os.environ.get("LEASE_RENEW", 3))
+STANDBY_POLL = float(os.environ.get("STANDBY_POLL", 1))
+
+# Budget for `python bot.py --startup-check`: process start to first handled update
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 3000))
+
+# Runtime profiling: /profile is refused unless PROFILING_ENABLED is set.
+# PROFILE_ON_START=<seconds> profiles the first seconds after startup.
+PROFILING_ENABLED = _env_flag("PROFILING_ENABLED")
+PROFILE_ON_START = float(os.environ.get("PROFILE_ON_START", 0))
+PROFILE_MAX_SECONDS = float(os.environ.get("PROFILE_MAX_SECONDS", 120))
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "profiles"),
 )
+
+# Logging: LOG_FORMAT is text | kv | json. High-volume bid rejections are sampled
+# (keep 1 in 1/LOG_SAMPLE_RATE) and capped at LOG_RATE_CAP lines per second per event.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").strip().lower()
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", 0.1))
+LOG_RATE_CAP = int(os.environ.get("LOG_RATE_CAP", 20))
 logger = logging.getLogger("auction-bot")
 
+
+# Called by entry points (bot.main, bench and CLI scripts); importing settings leaves logging alone
+def configure_logging():
+    return setup_logging(LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE_RATE, LOG_RATE_CAP)
+
 SG_TZ = timezone(timedelta(hours=8))
\ No newline at end of file
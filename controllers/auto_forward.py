@@ -0,0 +1,26 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from telegram.constants import MessageOriginType
+from config.settings import logger
+from db.connection import DB
+from db.auctions import AUCTIONS
+from db.thread_index import index_message
+
+# Telegram copies each channel post into the linked discussion group. Indexing
+# that copy lets every reply in its comment thread resolve to the auction directly.
+async def handle_auto_forward(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.is_automatic_forward:
+        return
+
+    origin = msg.forward_origin
+    if not origin or origin.type != MessageOriginType.CHANNEL:
+        return
+
+    ref = AUCTIONS.find_by_post(origin.chat.id, origin.message_id)
+    if not ref:
+        return
+
+    index_message(msg.chat.id, msg.message_id, ref.auction_id)
+    DB.commit()
+    logger.debug("auto_forward: indexed chat=%s message=%s auction_id=%s", msg.chat.id, msg.message_id, ref.auction_id)
@@ -0,0 +1,61 @@
+import os
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import ADMIN_USER_IDS, BACKUP_DIR, BACKUP_INTERVAL, BACKUP_KEEP
+from setups.backup import LAST, run_backup
+from utils.captions import fmt_time
+
+
+def _report(result) -> str:
+    lines = [
+        f"💾 <b>Last backup</b>: {fmt_time(result['finished_at'])} in {result['seconds']:.1f}s",
+    ]
+    for f in result["files"]:
+        lines.append(
+            f"<code>{f['file']}</code> {f['bytes'] / 1048576:.1f} MiB, {f['seconds']:.1f}s, "
+            f"{f['steps']} steps, integrity ok"
+        )
+    for error in result["errors"]:
+        lines.append(f"❌ {error}")
+    return "\n".join(lines)
+
+
+async def handle_backup(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    if msg.from_user.id not in ADMIN_USER_IDS:
+        await msg.reply_text("❌ Admins only.")
+        return
+
+    tokens = msg.text.strip().split()
+    if len(tokens) == 2 and tokens[1].lower() == "now":
+        await msg.reply_text("💾 Backup started…")
+        result = await run_backup()
+        if result is None:
+            await msg.reply_text("⏳ A backup is already running.")
+        else:
+            await msg.reply_text(_report(result), parse_mode="HTML")
+        return
+
+    schedule = f"every {BACKUP_INTERVAL / 3600:g}h" if BACKUP_INTERVAL > 0 else "off (use /backup now)"
+    footer = f"\n\nSchedule: {schedule}, keeping {BACKUP_KEEP} in <code>{BACKUP_DIR}</code>"
+    if LAST:
+        await msg.reply_text(_report(LAST) + footer, parse_mode="HTML")
+        return
+
+    # Nothing ran since startup: fall back to what is on disk
+    names = sorted(
+        (n for n in os.listdir(BACKUP_DIR) if n.endswith(".db.gz")) if os.path.isdir(BACKUP_DIR) else [],
+        key=lambda n: os.path.getmtime(os.path.join(BACKUP_DIR, n)),
+    )
+    if not names:
+        await msg.reply_text("No backups yet." + footer, parse_mode="HTML")
+        return
+    newest = names[-1]
+    mtime = int(os.path.getmtime(os.path.join(BACKUP_DIR, newest)))
+    await msg.reply_text(
+        f"💾 No backup since restart. Newest on disk: <code>{newest}</code> ({fmt_time(mtime)})" + footer,
+        parse_mode="HTML",
+    )
@@ -1,203 +1,324 @@
 import re
-from datetime import datetime
+import logging
+from typing import List, NamedTuple, Optional
 from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import MessageOriginType
-from config.settings import SG_TZ, logger
+from config.log import log_event
+from config.settings import (
+    logger,
+    BID_RATE_WINDOW,
+    BID_USER_LIMIT,
+    BID_CHAT_LIMIT,
+    BID_FLOOD_WARN,
+    BID_BATCH_MS,
+)
 from db.connection import DB
+from db.auctions import AUCTIONS
+from db.outbox import enqueue, caption_key
+from db.proxy_bids import load_proxies, display_name
+from db.watchers import watch
+from db.thread_index import index_message
+from db import channel_stats
 from utils.time import now
+from utils.captions import bid_caption
+from utils.proxy_bidding import resolve_proxies
+from utils.rate_limit import BidFloodControl
+from utils.batching import KeyedBatcher
+from setups.notifications import notify_price_change
+from setups.bots import bot_for, owner_id
+from setups import api
+
+# One limiter per Application, kept in its bot_data
+def flood_control(bot_data: dict) -> BidFloodControl:
+    flood = bot_data.get("flood")
+    if flood is None:
+        flood = bot_data["flood"] = BidFloodControl(BID_USER_LIMIT, BID_CHAT_LIMIT, BID_RATE_WINDOW)
+    return flood
+
+
+class PendingBid(NamedTuple):
+    chat_id: int
+    message_id: int
+    user_id: int
+    name: str
+    amount: Optional[int]  # None for "sb"
+    ts: int
+    bot_id: int
 
 async def handle_bid(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = update.message
     if not msg or not msg.text or not msg.reply_to_message:
         if msg:
-            logger.info(
-                "handle_bid: ignored (missing fields) chat=%s user=%s has_text=%s has_reply=%s",
-                getattr(msg.chat, "id", None),
-                getattr(msg.from_user, "id", None),
-                bool(msg.text),
-                bool(msg.reply_to_message),
+            log_event(
+                logger, logging.INFO, "handle_bid.ignored_missing_fields", sampled=True,
+                chat=getattr(msg.chat, "id", None),
+                user=getattr(msg.from_user, "id", None),
+                has_text=bool(msg.text),
+                has_reply=bool(msg.reply_to_message),
             )
         return
 
     text = msg.text.strip()
     if not (re.fullmatch(r"\d+", text) or text.lower() == "sb"):
-        logger.info(
-            "handle_bid: invalid text format chat=%s user=%s text=%r",
-            msg.chat.id,
-            msg.from_user.id,
-            text,
+        log_event(
+            logger, logging.INFO, "handle_bid.invalid_text", sampled=True,
+            chat=msg.chat.id,
+            user=msg.from_user.id,
+            text=text[:64],
         )
         return
 
-    origin = msg.reply_to_message.forward_origin
-    if not origin or origin.type != MessageOriginType.CHANNEL:
-        logger.info(
-            "handle_bid: reply is not a forwarded channel post chat=%s user=%s origin=%s",
-            msg.chat.id,
-            msg.from_user.id,
-            getattr(origin, "type", None),
+    # Flood control comes before any lookup, write or API call. Each bot keeps
+    # its own counts: in a discussion group shared by several bots, every one
+    # of them sees (and counts) the same replies.
+    flood = flood_control(context.bot_data)
+    dropped = flood.check(msg.from_user.id, msg.chat.id)
+    if dropped:
+        log_event(
+            logger, logging.INFO, "handle_bid.flood_dropped", sampled=True,
+            scope=dropped,
+            chat=msg.chat.id,
+            user=msg.from_user.id,
         )
+        if dropped == "user" and BID_FLOOD_WARN and flood.should_warn(msg.from_user.id):
+            try:
+                await msg.reply_text("🐢 Too many bids, slow down a little.")
+            except Exception as e:
+                logger.debug("handle_bid: flood warning failed user=%s error=%s", msg.from_user.id, e)
         return
 
-    channel_post_id = origin.message_id
-    origin_channel_id = origin.chat.id
-    logger.debug(
-        "handle_bid: origin resolved channel_id=%s post_id=%s",
-        origin_channel_id,
-        channel_post_id,
+    # Replies to the auto-forwarded post, to an earlier bid, or anywhere in the
+    # post's comment thread all resolve through one primary-key lookup.
+    reply_id = msg.reply_to_message.message_id
+    ref = AUCTIONS.find_by_thread(msg.chat.id, reply_id, msg.message_thread_id)
+
+    if not ref:
+        origin = msg.reply_to_message.forward_origin
+        if not origin or origin.type != MessageOriginType.CHANNEL:
+            log_event(
+                logger, logging.INFO, "handle_bid.not_channel_reply", sampled=True,
+                chat=msg.chat.id,
+                user=msg.from_user.id,
+                origin=getattr(origin, "type", None),
+            )
+            return
+
+        # Posts that predate the index (or whose auto-forward was missed)
+        ref = AUCTIONS.find_by_post(origin.chat.id, origin.message_id)
+        if not ref:
+            log_event(
+                logger, logging.INFO, "handle_bid.auction_not_found", sampled=True,
+                channel_id=origin.chat.id,
+                post_id=origin.message_id,
+            )
+            return
+        try:
+            index_message(msg.chat.id, reply_id, ref.auction_id)
+            DB.commit()
+        except Exception as e:
+            logger.warning("handle_bid: thread index backfill failed chat=%s error=%s", msg.chat.id, e)
+            DB.rollback()
+
+    log_event(
+        logger, logging.DEBUG, "handle_bid.origin_resolved",
+        auction_id=ref.auction_id,
+        channel_id=ref.channel_id,
+        post_id=ref.channel_post_id,
     )
 
-    row = DB.execute(
-        """
-        SELECT channel_id, title, sb, rp, min_inc, end_time, anti_snipe, highest_bid, highest_bidder, description
-        FROM auctions
-        WHERE channel_id = ? AND channel_post_id = ?
-        """,
-        (origin_channel_id, channel_post_id),
-    ).fetchone()
-
-    if not row:
-        logger.info(
-            "handle_bid: auction not found channel_id=%s post_id=%s",
-            origin_channel_id,
-            channel_post_id,
-        )
+    # Every bot in the discussion group sees the reply; only the auction's own bot handles it
+    if owner_id(ref.bot_id) != context.bot.id:
+        return
+
+    item = PendingBid(
+        msg.chat.id,
+        msg.message_id,
+        msg.from_user.id,
+        msg.from_user.first_name or "User",
+        None if text.lower() == "sb" else int(text),
+        now(),
+        context.bot.id,
+    )
+    if BID_BATCH_MS > 0:
+        BATCHER.submit(ref.auction_id, item)
+    else:
+        await resolve_bids(ref.auction_id, [item])
+
+
+async def resolve_bids(auction_id: int, items: List[PendingBid]):
+    try:
+        await _resolve_bids(auction_id, items)
+    except Exception as e:
+        logger.exception("handle_bid: batch failed auction_id=%s bids=%d error=%s", auction_id, len(items), e)
+        DB.rollback()
+        await _reply_failed(items)
+
+
+# Sent directly: the outbox lives in the DB that just failed
+async def _reply_failed(items: List[PendingBid]):
+    for item in items:
+        try:
+            await bot_for(item.bot_id).send_message(
+                chat_id=item.chat_id,
+                reply_to_message_id=item.message_id,
+                allow_sending_without_reply=True,
+                text="❌ Your bid could not be processed. Please send it again.",
+            )
+        except Exception as e:
+            logger.warning("handle_bid: failure reply failed chat=%s error=%s", item.chat_id, e)
+
+
+# Evaluates a batch of bids on one auction in arrival order against the fresh
+# row, then writes the outcome, edits the caption and notifies once. Each bid
+# keeps its own anti-snipe / proxy-outbid reply.
+async def _resolve_bids(auction_id: int, items: List[PendingBid]):
+    a = AUCTIONS.get(auction_id)
+    if not a:
         return
 
-    channel_id_row, title, sb, rp, min_inc, end_time, anti, highest, highest_bidder, description = row
+    # Running state, advanced bid by bid
+    end_time, highest, holder, anchor = a.end_time, a.highest_bid, a.highest_bidder, a.reply_anchor
+    sb, min_inc, anti = a.sb, a.min_inc, a.anti_snipe
+    bot_id = items[0].bot_id
 
     if highest is None:
-        logger.warning(
-            "handle_bid: legacy highest_bid NULL channel_id=%s post_id=%s — treating as 0",
-            channel_id_row,
-            channel_post_id,
-        )
-
-    if now() > end_time or highest is None:
-        logger.info(
-            "handle_bid: ignored due to ended_or_null ended=%s null_highest=%s channel_id=%s post_id=%s",
-            now() > end_time,
-            highest is None,
-            channel_id_row,
-            channel_post_id,
+        log_event(
+            logger, logging.WARNING, "handle_bid.legacy_null_highest",
+            channel_id=a.channel_id,
+            post_id=a.channel_post_id,
         )
         return
 
-    if text.lower() == "sb":
-        if highest == 0:
-            bid = sb
-            logger.info(
-                "handle_bid: SB accepted chat=%s user=%s bid=%s",
-                msg.chat.id,
-                msg.from_user.id,
-                bid,
+    proxies = load_proxies(auction_id)
+    holder_name = None
+    accepted = []  # (item, sniped, price after proxies if a max bid took over, else None)
+    for item in items:
+        if a.status != "LIVE" or item.ts > end_time:
+            log_event(
+                logger, logging.INFO, "handle_bid.ended", sampled=True,
+                auction_id=auction_id,
+                user=item.user_id,
             )
+            continue
+
+        if item.amount is None:
+            if highest != 0:
+                log_event(
+                    logger, logging.INFO, "handle_bid.sb_rejected", sampled=True,
+                    chat=item.chat_id,
+                    user=item.user_id,
+                    highest=highest,
+                )
+                continue
+            bid = sb
         else:
-            logger.info(
-                "handle_bid: SB rejected (already started) chat=%s user=%s highest=%s",
-                msg.chat.id,
-                msg.from_user.id,
-                highest,
+            bid = item.amount
+
+        min_valid = sb if highest == 0 else highest + min_inc
+        if bid < min_valid:
+            log_event(
+                logger, logging.INFO, "handle_bid.below_minimum", sampled=True,
+                chat=item.chat_id,
+                user=item.user_id,
+                bid=bid,
+                min_valid=min_valid,
+                highest=highest,
+                min_inc=min_inc,
             )
-            return
-    else:
-        bid = int(text)
-        logger.info(
-            "handle_bid: numeric bid parsed chat=%s user=%s bid=%s",
-            msg.chat.id,
-            msg.from_user.id,
-            bid,
-        )
+            continue
 
-    min_valid = sb if highest == 0 else highest + min_inc
-    if bid < min_valid:
-        logger.info(
-            "handle_bid: bid below minimum chat=%s user=%s bid=%s min_valid=%s highest=%s min_inc=%s",
-            msg.chat.id,
-            msg.from_user.id,
-            bid,
-            min_valid,
-            highest,
-            min_inc,
-        )
-        return
+        sniped = item.ts >= end_time - anti * 60
+        if sniped:
+            end_time += anti * 60
+            log_event(
+                logger, logging.INFO, "handle_bid.anti_snipe",
+                chat=item.chat_id,
+                user=item.user_id,
+                anti=anti,
+                new_end=end_time,
+            )
 
-    if now() >= end_time - anti * 60:
-        end_time += anti * 60
-        logger.info(
-            "handle_bid: anti-snipe extended chat=%s user=%s anti=%s new_end=%s",
-            msg.chat.id,
-            msg.from_user.id,
-            anti,
-            end_time,
-        )
-        await msg.reply_text(f"⏱ Anti-snipe! Extended by {anti} min")
+        bidder, bidder_name = item.user_id, item.name
+        bid_anchor = f"{item.chat_id}:{item.message_id}"
 
-    anchor = f"{msg.chat.id}:{msg.message_id}"
-    try:
-        DB.execute(
-            """
-            UPDATE auctions
-            SET highest_bid = ?, highest_bidder = ?, end_time = ?, reply_anchor = ?
-            WHERE channel_id = ? AND channel_post_id = ?
-            """,
-            (
-                bid,
-                msg.from_user.id,
-                end_time,
-                anchor,
-                channel_id_row,
-                channel_post_id,
-            ),
-        )
-        DB.commit()
-        logger.info(
-            "handle_bid: DB updated channel_id=%s post_id=%s bid=%s bidder=%s reply_anchor=%s",
-            channel_id_row,
-            channel_post_id,
-            bid,
-            msg.from_user.id,
-            anchor,
-        )
-    except Exception as e:
-        logger.exception(
-            "handle_bid: DB update failed channel_id=%s post_id=%s error=%s",
-            channel_id_row,
-            channel_post_id,
-            e,
-        )
+        # Registered maxima respond to each bid before the next one is evaluated
+        outcome = resolve_proxies(bid, bidder, sb, min_inc, proxies)
+        outbid_at = None
+        if outcome:
+            if outcome.bidder != bidder:
+                bidder_name = display_name(auction_id, outcome.bidder) or "User"
+                bid_anchor = None
+                outbid_at = outcome.bid
+            bid, bidder = outcome
+            log_event(
+                logger, logging.INFO, "handle_bid.proxy_resolved",
+                auction_id=auction_id,
+                bidder=bidder,
+                bid=bid,
+            )
+
+        highest, holder, holder_name, anchor = bid, bidder, bidder_name, bid_anchor
+        accepted.append((item, sniped, outbid_at))
+
+    if not accepted:
         return
 
-    bidder_name = msg.from_user.first_name or "User"
-    new_caption = (
-        f"🛒 <b>{title}</b>\n\n"
-        f"{description}\n\n"
-        f"💰 SB: {sb}\n"
-        f"🏷 RP: {rp}\n"
-        f"➕ Min Inc: {min_inc}\n"
-        f"🛡 Anti-snipe: {anti} min\n\n"
-        f"💰 Current bid: <b>{bid}</b>\n"
-        f"👤 Bidder: <a href='tg://user?id={msg.from_user.id}'>{bidder_name}</a>\n"
-        f"⏱ Ends: <b>{datetime.fromtimestamp(end_time, tz=SG_TZ).strftime('%Y-%m-%d %H:%M')}</b>"
+    new_caption = bid_caption(
+        a.title, a.description, sb, a.rp, min_inc, anti, highest, holder, holder_name, end_time, auction_id
     )
 
+    # Auction update and its Telegram side effects commit together; the outbox drainer delivers them.
     try:
-        await context.bot.edit_message_caption(
-            chat_id=channel_id_row,
-            message_id=channel_post_id,
+        AUCTIONS.apply_bids(auction_id, highest, holder, holder_name, end_time, anchor, len(accepted))
+        channel_stats.bump(a.channel_id, total_bids=len(accepted))
+        for item, sniped, outbid_at in accepted:
+            watch(auction_id, item.user_id, "BIDDER")
+            index_message(item.chat_id, item.message_id, auction_id)
+            if sniped:
+                enqueue(
+                    "send_message",
+                    bot_id=bot_id,
+                    chat_id=item.chat_id,
+                    reply_to_message_id=item.message_id,
+                    allow_sending_without_reply=True,
+                    text=f"⏱ Anti-snipe! Extended by {anti} min",
+                )
+            if outbid_at is not None:
+                enqueue(
+                    "send_message",
+                    bot_id=bot_id,
+                    chat_id=item.chat_id,
+                    reply_to_message_id=item.message_id,
+                    allow_sending_without_reply=True,
+                    text=f"⚡ Outbid instantly by a max bid. Current bid: {outbid_at}",
+                )
+        enqueue(
+            "edit_message_caption",
+            bot_id=bot_id,
+            dedupe_key=caption_key(a.channel_id, a.channel_post_id),
+            chat_id=a.channel_id,
+            message_id=a.channel_post_id,
             caption=new_caption,
             parse_mode="HTML",
         )
-        logger.info(
-            "handle_bid: caption updated channel_id=%s post_id=%s",
-            channel_id_row,
-            channel_post_id,
+        DB.commit()
+        log_event(
+            logger, logging.INFO, "handle_bid.accepted",
+            channel_id=a.channel_id,
+            post_id=a.channel_post_id,
+            bid=highest,
+            bidder=holder,
+            accepted=len(accepted),
+            batch=len(items),
+            reply_anchor=anchor,
         )
-    except Exception as e:
-        logger.exception(
-            "handle_bid: caption update failed channel_id=%s post_id=%s error=%s",
-            channel_id_row,
-            channel_post_id,
-            e,
-        )
\ No newline at end of file
+    except Exception:
+        DB.rollback()
+        raise
+
+    api.refresh((auction_id,))
+    notify_price_change(auction_id, a.title, highest, holder, bot_id)
+
+
+BATCHER = KeyedBatcher(BID_BATCH_MS / 1000, resolve_bids)
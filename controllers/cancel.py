@@ -38,12 +38,9 @@ async def handle_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Remove scheduled job if present
-    try:
-        scheduler = context.application.bot_data.get("scheduler")
-        if scheduler:
-            scheduler.remove_job(f"publish_{auction_id}")
-    except Exception:
-        pass
+    scheduler = context.application.bot_data.get("scheduler")
+    if scheduler:
+        scheduler.cancel(f"publish_{auction_id}")
 
     cur = DB.execute(
         "DELETE FROM auctions WHERE auction_id = ? AND status = 'SCHEDULED' AND owner_user_id = ?",
@@ -1,103 +1,114 @@
-from telegram.ext import Application
+import logging
+from config.log import log_event
+from config.settings import logger
 from db.connection import DB
+from db.auctions import AUCTIONS
+from db.outbox import enqueue, caption_key
+from db import channel_stats
+from setups.bots import bot_for, owner_id
+from setups import api
 from utils.time import now
 
-async def check_auctions(app: Application):
-    # Detect presence of single-column reply anchor to avoid legacy crashes
-    try:
-        cols = {row[1] for row in DB.execute("PRAGMA table_info(auctions)").fetchall()}
-        has_anchor = ("reply_anchor" in cols)
-    except Exception:
-        has_anchor = False
-
-    if has_anchor:
-        rows = DB.execute(
-            """
-            SELECT auction_id, channel_id, channel_post_id, title, rp, highest_bid, highest_bidder, description, reply_anchor
-            FROM auctions
-            WHERE status = 'LIVE' AND end_time <= ?
-            """,
-            (now(),),
-        ).fetchall()
-    else:
-        rows = DB.execute(
-            """
-            SELECT auction_id, channel_id, channel_post_id, title, rp, highest_bid, highest_bidder, description
-            FROM auctions
-            WHERE status = 'LIVE' AND end_time <= ?
-            """,
-            (now(),),
-        ).fetchall()
+def _ended_caption(a, mention_text) -> str:
+    if mention_text:
+        return (
+            f"🏁 <b>{a.title} — Auction Ended</b>\n\n"
+            f"{a.description}\n\n"
+            f"Winning bid: <b>{a.highest_bid}</b>\n"
+            f"👤 {mention_text}"
+        )
+    return (
+        f"🏁 <b>{a.title} — Auction Ended</b>\n\n"
+        f"{a.description}\n\n"
+        f"❌ Reserve not met."
+    )
 
-    for row in rows:
-        if has_anchor:
-            auction_id, chan_id, post_id, title, rp, bid, bidder, description, reply_anchor = row
-        else:
-            auction_id, chan_id, post_id, title, rp, bid, bidder, description = row
-            reply_anchor = None
 
-        DB.execute(
-            "UPDATE auctions SET status = 'ENDED' WHERE auction_id = ?",
-            (auction_id,),
-        )
-        DB.commit()
+def _announce(a, bot_id: int, mention_text):
+    enqueue(
+        "edit_message_caption",
+        bot_id=bot_id,
+        dedupe_key=caption_key(a.channel_id, a.channel_post_id),
+        chat_id=a.channel_id,
+        message_id=a.channel_post_id,
+        caption=_ended_caption(a, mention_text),
+        parse_mode="HTML",
+    )
 
-        if bid >= rp and bidder:
-            try:
-                user = await app.bot.get_chat(bidder)
-                bidder_name = user.first_name or "User"
-                username = getattr(user, "username", None)
-            except Exception:
-                bidder_name = "User"
-                username = None
+    # Reply to the winner’s bid to trigger a notification
+    if mention_text and a.reply_anchor:
+        try:
+            chat_id_str, msg_id_str = a.reply_anchor.split(":", 1)
+            reply_chat_id = int(chat_id_str)
+            reply_message_id = int(msg_id_str)
+        except Exception:
+            reply_chat_id = None
+            reply_message_id = None
 
-            mention_text = f"@{username}" if username else f"<a href='tg://user?id={bidder}'>{bidder_name}</a>"
-            caption = (
-                f"🏁 <b>{title} — Auction Ended</b>\n\n"
-                f"{description}\n\n"
-                f"Winning bid: <b>{bid}</b>\n"
-                f"👤 {mention_text}"
-            )
-        else:
-            caption = (
-                f"🏁 <b>{title} — Auction Ended</b>\n\n"
-                f"{description}\n\n"
-                f"❌ Reserve not met."
+        if reply_chat_id and reply_message_id:
+            enqueue(
+                "send_message",
+                bot_id=bot_id,
+                chat_id=reply_chat_id,
+                reply_to_message_id=reply_message_id,
+                allow_sending_without_reply=True,
+                text=f"🏆 Winner: {mention_text} with bid <b>{a.highest_bid}</b>",
+                parse_mode="HTML",
+                disable_web_page_preview=True,
             )
 
-        await app.bot.edit_message_caption(
-            chat_id=chan_id,
-            message_id=post_id,
-            caption=caption,
-            parse_mode="HTML",
+
+# Closes every due auction in one transaction with no await inside, so a bid
+# cannot land between reading and closing, and one slow Bot API call cannot
+# hold up the batch. Winners are named from the name stored with their bid;
+# only rows from before that name was stored are looked up, after the commit.
+async def check_auctions():
+    ts = now()
+    due = AUCTIONS.due(ts)
+    if not due:
+        return
+
+    closed = set(AUCTIONS.close_many(((a.auction_id, a.highest_bid, a.highest_bidder) for a in due), ts))
+    if not closed:
+        DB.rollback()
+        return
+
+    max_lag = 0
+    unnamed = []
+    for a in due:
+        if a.auction_id not in closed:
+            continue
+        max_lag = max(max_lag, ts - a.end_time)
+
+        met = bool(a.highest_bid >= a.rp and a.highest_bidder)
+        channel_stats.bump(
+            a.channel_id,
+            active_lots=-1,
+            ended_lots=1,
+            reserve_met_lots=int(met),
+            gmv=a.highest_bid if met else 0,
         )
 
-        # Reply to the winner’s bid to trigger a notification
-        if bid >= rp and bidder and reply_anchor:
-            try:
-                chat_id_str, msg_id_str = reply_anchor.split(":", 1)
-                reply_chat_id = int(chat_id_str)
-                reply_message_id = int(msg_id_str)
-            except Exception:
-                reply_chat_id = None
-                reply_message_id = None
+        # One poll serves every bot; side effects go out through the auction's own bot
+        bot_id = owner_id(a.bot_id)
+        if met and not a.highest_bidder_name:
+            unnamed.append((a, bot_id))
+            continue
+        mention_text = f"<a href='tg://user?id={a.highest_bidder}'>{a.highest_bidder_name}</a>" if met else None
+        _announce(a, bot_id, mention_text)
 
-            if reply_chat_id and reply_message_id:
-                try:
-                    await app.bot.send_message(
-                        chat_id=reply_chat_id,
-                        reply_to_message_id=reply_message_id,
-                        text=f"🏆 Winner: {mention_text} with bid <b>{bid}</b>",
-                        parse_mode="HTML",
-                        disable_web_page_preview=True,
-                    )
-                except Exception:
-                    try:
-                        await app.bot.send_message(
-                            chat_id=reply_chat_id,
-                            text=f"🏆 Winner: {mention_text} with bid <b>{bid}</b>",
-                            parse_mode="HTML",
-                            disable_web_page_preview=True,
-                        )
-                    except Exception:
-                        pass
\ No newline at end of file
+    DB.commit()
+    api.refresh(closed)
+    log_event(logger, logging.INFO, "check_auctions.closed", count=len(closed), max_lag_s=max_lag)
+
+    for a, bot_id in unnamed:
+        try:
+            user = await bot_for(bot_id).get_chat(chat_id=a.highest_bidder)
+            bidder_name = user.first_name or "User"
+            username = getattr(user, "username", None)
+        except Exception:
+            bidder_name = "User"
+            username = None
+        mention_text = f"@{username}" if username else f"<a href='tg://user?id={a.highest_bidder}'>{bidder_name}</a>"
+        _announce(a, bot_id, mention_text)
+        DB.commit()
@@ -0,0 +1,33 @@
+from html import escape
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import ADMIN_USER_IDS, DB_SLOW_MS
+from db.connection import DB
+
+async def handle_dbstats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    if msg.from_user.id not in ADMIN_USER_IDS:
+        await msg.reply_text("❌ Admins only.")
+        return
+
+    tokens = msg.text.strip().split()
+    if len(tokens) == 2 and tokens[1].lower() == "reset":
+        DB.reset()
+        await msg.reply_text("✅ Query stats reset.")
+        return
+
+    rows = DB.top(10)
+    if not rows:
+        await msg.reply_text("No queries recorded yet.")
+        return
+
+    lines = [f"🗄 <b>Top statements by total time</b> (slow ≥ {DB_SLOW_MS:g}ms)\n"]
+    for key, count, total, p99, worst in rows:
+        lines.append(
+            f"<code>{escape(key[:160])}</code>\n"
+            f"n={count} total={total * 1000:.1f}ms p99={p99 * 1000:.2f}ms max={worst * 1000:.2f}ms\n"
+        )
+    await msg.reply_text("\n".join(lines), parse_mode="HTML", disable_web_page_preview=True)
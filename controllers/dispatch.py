@@ -0,0 +1,25 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import ADMIN_USER_IDS, UPDATE_MAX_PENDING
+from setups.dispatch import DISPATCH
+
+async def handle_dispatch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg:
+        return
+
+    if msg.from_user.id not in ADMIN_USER_IDS:
+        await msg.reply_text("❌ Admins only.")
+        return
+
+    counters = DISPATCH.counters
+    busiest = "\n".join(f"- {':'.join(str(p) for p in key)}: {depth}" for key, depth in DISPATCH.busiest()) or "none"
+    text = (
+        "🧵 <b>Update Dispatch</b>\n\n"
+        f"Running: <b>{counters['running']}</b>/{DISPATCH.concurrency} (peak {counters['peak_running']})\n"
+        f"Processed: <b>{counters['processed']}</b>\n"
+        f"Pending cap: {UPDATE_MAX_PENDING}\n"
+        f"Deepest key queue: {counters['deepest']}\n\n"
+        f"Busiest keys:\n{busiest}"
+    )
+    await msg.reply_text(text, parse_mode="HTML")
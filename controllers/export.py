@@ -0,0 +1,69 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import SG_TZ, logger
+from db.connection import DB, open_reader
+from db.export import iter_results, write_csv
+from utils.time import now
+
+USAGE = "Usage: /export [from YYYY-MM-DD] [to YYYY-MM-DD] [gz]"
+
+async def handle_export(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    tokens = msg.text.strip().split()[1:]
+    compress = False
+    if tokens and tokens[-1].lower() in ("gz", "gzip"):
+        compress = True
+        tokens = tokens[:-1]
+    if len(tokens) > 2:
+        await msg.reply_text(USAGE)
+        return
+
+    try:
+        dates = [datetime.strptime(t, "%Y-%m-%d").replace(tzinfo=SG_TZ) for t in tokens]
+    except ValueError:
+        await msg.reply_text(f"❌ Invalid date. {USAGE}")
+        return
+
+    start_ts = int(dates[0].timestamp()) if dates else 0
+    # "to" is inclusive: export up to the end of that day
+    end_ts = int((dates[1] + timedelta(days=1)).timestamp()) if len(dates) == 2 else 2**62
+    owner = msg.from_user.id
+
+    fd, path = tempfile.mkstemp(prefix="auction-results-", suffix=".csv.gz" if compress else ".csv")
+    os.close(fd)
+    reader = open_reader()
+    try:
+        if reader is not None:
+            # Own read-only connection: the scan and CSV writing run off the event loop
+            count = await asyncio.to_thread(
+                write_csv, iter_results(reader, owner, start_ts, end_ts), path, compress
+            )
+        else:
+            # In-memory DB has no second connection; stream on the shared one
+            count = write_csv(iter_results(DB.conn, owner, start_ts, end_ts), path, compress)
+
+        if not count:
+            await msg.reply_text("No ended auctions in that range.")
+            return
+
+        filename = f"auction-results-{datetime.fromtimestamp(now(), tz=SG_TZ).strftime('%Y%m%d')}.csv" + (".gz" if compress else "")
+        with open(path, "rb") as f:
+            await msg.reply_document(document=f, filename=filename, caption=f"📦 {count} ended auction(s)")
+        logger.info("export: user=%s rows=%s compressed=%s", owner, count, compress)
+    except Exception as e:
+        logger.exception("export: failed user=%s error=%s", owner, e)
+        await msg.reply_text("❌ Export failed. Try again.")
+    finally:
+        if reader is not None:
+            reader.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
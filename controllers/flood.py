@@ -0,0 +1,28 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import ADMIN_USER_IDS, BID_RATE_WINDOW, BID_USER_LIMIT, BID_CHAT_LIMIT, BID_BATCH_MS
+from controllers.bid import BATCHER, flood_control
+
+async def handle_flood(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg:
+        return
+
+    if msg.from_user.id not in ADMIN_USER_IDS:
+        await msg.reply_text("❌ Admins only.")
+        return
+
+    stats = flood_control(context.bot_data).stats()
+    batches = BATCHER.counters
+    text = (
+        "🚦 <b>Bid Flood Control</b>\n\n"
+        f"Limits: {BID_USER_LIMIT}/user, {BID_CHAT_LIMIT}/chat per {BID_RATE_WINDOW:g}s\n"
+        f"Allowed: <b>{stats['allowed']}</b>\n"
+        f"Dropped (user): <b>{stats['dropped_user']}</b>\n"
+        f"Dropped (chat): <b>{stats['dropped_chat']}</b>\n"
+        f"Warnings sent: {stats['warned']}\n"
+        f"Tracked: {stats['tracked_users']} users, {stats['tracked_chats']} chats\n\n"
+        f"Batching: {BID_BATCH_MS:g}ms window, {batches['items']} bids in {batches['batches']} batches "
+        f"(largest {batches['largest']}, failed {batches['failed']})"
+    )
+    await msg.reply_text(text, parse_mode="HTML")
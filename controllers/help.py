@@ -26,11 +26,31 @@ async def handle_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "- /viewschedule — lists your scheduled auctions with IDs.\n\n"
         "<b>Cancel Scheduled</b>\n"
         "- /cancel &lt;auction_id&gt; — deletes your scheduled auction.\n\n"
+        "<b>Search</b>\n"
+        "- /search &lt;words&gt; [status:live|ended|all] [channel:&lt;id&gt;] [page:&lt;n&gt;] — find lots by title or description.\n\n"
+        "<b>Export Results</b>\n"
+        "- /export [from YYYY-MM-DD] [to YYYY-MM-DD] [gz] — CSV of your ended auctions.\n\n"
         "<b>Bid</b>\n"
         "- In the group, reply to the forwarded channel post.\n"
         "- Send a number (your bid) or 'SB'.\n\n"
+        "<b>Max Bid</b>\n"
+        "- /maxbid &lt;auction_id&gt; &lt;amount&gt; — in private. The bot bids for you up to your max.\n"
+        "- Your max is never shown to anyone else. /maxbid &lt;auction_id&gt; shows it to you.\n\n"
+        "<b>Watch</b>\n"
+        "- /watch &lt;auction_id&gt; — DMs about new bids and when it's ending. /watch lists them.\n"
+        "- /unwatch &lt;auction_id&gt; — stop. Bidding watches automatically; start a chat with me to receive DMs.\n\n"
         "<b>Summary</b>\n"
         "- Send /summary in private — posts a summary to the bound channel.\n"
+        "- /stats — live numbers for your bound channel (active lots, bids, GMV).\n\n"
+        "<b>Admin</b>\n"
+        "- /outbox — pending and dead-lettered channel updates.\n"
+        "- /outbox retry &lt;id|all&gt; — requeue dead-lettered updates.\n"
+        "- /flood — bid flood control counters.\n"
+        "- /dispatch — concurrent update handling: running handlers and busiest threads.\n"
+        "- /profile [seconds] [sample|cprofile] — profile the running bot (needs PROFILING_ENABLED).\n"
+        "- /dbstats [reset] — slowest SQL statements (count, total, p99).\n"
+        "- /backup [now] — last DB backup (time, duration, files); 'now' takes one.\n"
+        "- /stats &lt;channel_id&gt; | rebuild | verify — any channel's stats; recompute or check them.\n"
     )
 
     await msg.reply_text(text, parse_mode="HTML", disable_web_page_preview=True)
\ No newline at end of file
@@ -0,0 +1,118 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import logger
+from db.connection import DB
+from db.auctions import AUCTIONS
+from db.outbox import enqueue, caption_key
+from db.proxy_bids import load_proxies, display_name, register_proxy
+from db.watchers import watch
+from db import channel_stats
+from setups.notifications import notify_price_change
+from setups.bots import owner_id
+from setups import api
+from utils.captions import bid_caption
+from utils.proxy_bidding import resolve_proxies
+from utils.time import now
+
+USAGE = "Usage: /maxbid <auction_id> <amount>\nOr /maxbid <auction_id> to see your max."
+
+async def handle_maxbid(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    tokens = msg.text.strip().split()
+    if len(tokens) not in (2, 3):
+        await msg.reply_text(USAGE)
+        return
+
+    try:
+        auction_id = int(tokens[1])
+        amount = int(tokens[2]) if len(tokens) == 3 else None
+    except ValueError:
+        await msg.reply_text(USAGE)
+        return
+
+    user_id = msg.from_user.id
+
+    if amount is None:
+        row = DB.execute(
+            "SELECT max_bid FROM proxy_bids WHERE auction_id = ? AND user_id = ?",
+            (auction_id, user_id),
+        ).fetchone()
+        if row:
+            await msg.reply_text(f"🔒 Your max bid on auction {auction_id}: {row[0]}")
+        else:
+            await msg.reply_text(f"You have no max bid on auction {auction_id}.")
+        return
+
+    a = AUCTIONS.get(auction_id)
+    if not a or a.status != "LIVE":
+        await msg.reply_text("❌ Auction not found or not live.")
+        return
+
+    sb, min_inc, anti, end_time = a.sb, a.min_inc, a.anti_snipe, a.end_time
+    highest, holder = a.highest_bid, a.highest_bidder
+    bot_id = owner_id(a.bot_id)
+
+    if a.owner_user_id == user_id:
+        await msg.reply_text("❌ You can't bid on your own auction.")
+        return
+
+    if highest is None or now() > end_time:
+        await msg.reply_text("❌ This auction has ended.")
+        return
+
+    if holder == user_id and highest > 0:
+        min_valid = highest
+    else:
+        min_valid = sb if highest == 0 else highest + min_inc
+    if amount < min_valid:
+        await msg.reply_text(f"❌ Max bid must be at least {min_valid}.")
+        return
+
+    name = msg.from_user.first_name or "User"
+    try:
+        register_proxy(auction_id, user_id, amount, name)
+        watch(auction_id, user_id, "BIDDER")
+        outcome = resolve_proxies(highest, holder, sb, min_inc, load_proxies(auction_id))
+        if outcome:
+            new_bid, new_holder = outcome
+            if now() >= end_time - anti * 60:
+                end_time += anti * 60
+            holder_name = name if new_holder == user_id else (display_name(auction_id, new_holder) or "User")
+            # A holder who keeps the lead keeps their reply anchor
+            anchor = a.reply_anchor if new_holder == holder else None
+            AUCTIONS.apply_bids(auction_id, new_bid, new_holder, holder_name, end_time, anchor, 1)
+            channel_stats.bump(a.channel_id, total_bids=1)
+            enqueue(
+                "edit_message_caption",
+                bot_id=bot_id,
+                dedupe_key=caption_key(a.channel_id, a.channel_post_id),
+                chat_id=a.channel_id,
+                message_id=a.channel_post_id,
+                caption=bid_caption(
+                    a.title, a.description, sb, a.rp, min_inc, anti, new_bid, new_holder, holder_name, end_time, auction_id
+                ),
+                parse_mode="HTML",
+            )
+        DB.commit()
+    except Exception as e:
+        DB.rollback()
+        logger.exception("maxbid: failed auction_id=%s user=%s error=%s", auction_id, user_id, e)
+        await msg.reply_text("❌ Failed to register max bid. Try again.")
+        return
+
+    # Amounts stay out of the logs: maxima are private to their owner
+    logger.info("maxbid: registered auction_id=%s user=%s resolved=%s", auction_id, user_id, bool(outcome))
+
+    if outcome:
+        api.refresh((auction_id,))
+        notify_price_change(auction_id, a.title, outcome.bid, outcome.bidder, bot_id)
+
+    leading = outcome.bidder == user_id if outcome else holder == user_id
+    current = outcome.bid if outcome else highest
+    if leading:
+        await msg.reply_text(f"✅ Max bid set. You're leading at {current}.")
+    else:
+        await msg.reply_text(f"✅ Max bid set, but you've been outbid. Current bid: {current}.")
@@ -1,10 +1,37 @@
 import re
-from datetime import datetime
 from telegram import Update
+from telegram.error import BadRequest, Forbidden, RetryAfter
 from telegram.ext import ContextTypes
-from config.settings import SG_TZ
+from config.settings import logger
 from db.connection import DB
+from db.outbox import enqueue
+from db.auctions import AUCTIONS
+from db import channel_stats
+from setups import api
 from utils.time import parse_end_time
+from utils.captions import live_caption
+
+def _discard(auction_id: int):
+    DB.execute("DELETE FROM auctions WHERE auction_id = ? AND status = 'POSTING'", (auction_id,))
+    DB.commit()
+
+# A POSTING row outlives handle_newauction only when the process died
+# mid-send or Telegram's answer never came, so whether its post exists is
+# unknown. At startup no send is in flight: each row goes, and its seller is
+# told to check the channel.
+def sweep_posting() -> int:
+    rows = DB.execute("SELECT auction_id, title, owner_user_id, bot_id FROM auctions WHERE status = 'POSTING'").fetchall()
+    for auction_id, title, owner_user_id, bot_id in rows:
+        if owner_user_id:
+            enqueue(
+                "send_message",
+                bot_id=bot_id,
+                chat_id=owner_user_id,
+                text=f'⚠️ "{title}" may not have reached the channel and is not being tracked. '
+                     'If its post is there, delete it, then post the lot again.',
+            )
+        _discard(auction_id)
+    return len(rows)
 
 async def handle_newauction(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = update.message
@@ -47,25 +74,10 @@ async def handle_newauction(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await msg.reply_text("❌ No channel bound for you. Use /bind in private chat.")
         return
 
-    caption_text = (
-        f"🛒 <b>{title}</b>\n\n"
-        f"{description}\n\n"
-        f"💰 SB: {sb}\n"
-        f"🏷 RP: {rp}\n"
-        f"➕ Min Inc: {min_inc}\n"
-        f"⏱ Ends: <b>{datetime.fromtimestamp(end_time, tz=SG_TZ).strftime('%Y-%m-%d %H:%M')}</b>\n"
-        f"🛡 Anti-snipe: {anti} min\n\n"
-        f"💬 Comment with a number to bid (or 'SB')"
-    )
-
-    sent = await context.bot.send_photo(
-        chat_id=channel_id,
-        photo=photo_id,
-        caption=caption_text,
-        parse_mode="HTML",
-    )
-
-    DB.execute(
+    # The row goes in first, so the post goes out with its auction ID and
+    # needs no follow-up caption edit. It stays POSTING (invisible to bids,
+    # closing and the API) until the post exists.
+    cur = DB.execute(
         """
         INSERT INTO auctions (
             channel_id,
@@ -80,13 +92,13 @@ async def handle_newauction(update: Update, context: ContextTypes.DEFAULT_TYPE):
             highest_bidder,
             status,
             description,
-            owner_user_id
+            owner_user_id,
+            bot_id
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, NULL, 'LIVE', ?, ?)
+        VALUES (?, NULL, ?, ?, ?, ?, ?, ?, 0, NULL, 'POSTING', ?, ?, ?)
         """,
         (
             channel_id,
-            sent.message_id,
             title,
             sb,
             rp,
@@ -95,8 +107,28 @@ async def handle_newauction(update: Update, context: ContextTypes.DEFAULT_TYPE):
             anti,
             description,
             msg.from_user.id,
+            context.bot.id,
         ),
     )
     DB.commit()
+    auction_id = cur.lastrowid
+
+    caption = live_caption(title, description, sb, rp, min_inc, end_time, anti, auction_id)
+    try:
+        sent = await context.bot.send_photo(chat_id=channel_id, photo=photo_id, caption=caption, parse_mode="HTML")
+    except (BadRequest, Forbidden, RetryAfter):
+        # Telegram refused the post, so nothing went out
+        _discard(auction_id)
+        raise
+    except Exception as e:
+        # A timeout or dropped connection says nothing about whether the
+        # post went out; the row stays POSTING for sweep_posting
+        logger.warning("handle_newauction: post outcome unknown auction_id=%s error=%s", auction_id, e)
+        raise
+
+    AUCTIONS.publish_many([(auction_id, sent.message_id)])
+    channel_stats.bump(channel_id, lots_total=1, active_lots=1)
+    DB.commit()
+    api.refresh((auction_id,))
 
     await msg.reply_text("✅ Auction posted to channel.")
\ No newline at end of file
@@ -0,0 +1,74 @@
+from datetime import datetime
+from html import escape
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import SG_TZ, ADMIN_USER_IDS, logger
+from db.connection import DB
+from utils.time import now
+
+async def handle_outbox(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    if msg.from_user.id not in ADMIN_USER_IDS:
+        await msg.reply_text("❌ Admins only.")
+        return
+
+    tokens = msg.text.strip().split()
+
+    if len(tokens) == 3 and tokens[1].lower() == "retry":
+        target = tokens[2].lower()
+        if target == "all":
+            cur = DB.execute(
+                "UPDATE outbox SET status = 'PENDING', attempts = 0, next_attempt_at = ? WHERE status = 'DEAD'",
+                (now(),),
+            )
+        else:
+            try:
+                out_id = int(target)
+            except ValueError:
+                await msg.reply_text("Usage: /outbox [retry <id|all>]")
+                return
+            cur = DB.execute(
+                "UPDATE outbox SET status = 'PENDING', attempts = 0, next_attempt_at = ? WHERE id = ?",
+                (now(), out_id),
+            )
+        DB.commit()
+        logger.info("outbox: user %s requeued %s message(s) target=%s", msg.from_user.id, cur.rowcount, target)
+        await msg.reply_text(f"🔁 Requeued {cur.rowcount} message(s).")
+        return
+
+    if len(tokens) != 1:
+        await msg.reply_text("Usage: /outbox [retry <id|all>]")
+        return
+
+    counts = dict(DB.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+    oldest = DB.execute("SELECT MIN(created_at) FROM outbox WHERE status = 'PENDING'").fetchone()[0]
+    stuck = DB.execute(
+        """
+        SELECT id, method, status, attempts, next_attempt_at, last_error
+        FROM outbox
+        WHERE status = 'DEAD' OR attempts > 0
+        ORDER BY id DESC
+        LIMIT 10
+        """
+    ).fetchall()
+
+    lines = [
+        "📮 <b>Outbox</b>\n",
+        f"Pending: <b>{counts.get('PENDING', 0)}</b> | Dead: <b>{counts.get('DEAD', 0)}</b>",
+    ]
+    if oldest:
+        lines.append(f"Oldest pending: {now() - oldest}s ago")
+
+    if stuck:
+        lines.append("")
+        for out_id, method, status, attempts, next_at, error in stuck:
+            when = datetime.fromtimestamp(next_at, tz=SG_TZ).strftime('%H:%M:%S')
+            lines.append(
+                f"🆔 <code>{out_id}</code> {method} — {status}, {attempts} attempt(s), {'died' if status == 'DEAD' else 'next'} {when}\n"
+                f"<i>{escape((error or '')[:200])}</i>"
+            )
+
+    await msg.reply_text("\n".join(lines), parse_mode="HTML", disable_web_page_preview=True)
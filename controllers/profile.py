@@ -0,0 +1,65 @@
+from html import escape
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import ADMIN_USER_IDS, PROFILING_ENABLED, PROFILE_MAX_SECONDS, PROFILE_DIR, logger
+from utils.profiler import run_profile
+
+USAGE = "Usage: /profile [seconds] [sample|cprofile]"
+
+async def _profile_and_report(app, chat_id: int, seconds: float, mode: str):
+    try:
+        result = await run_profile(seconds, mode, PROFILE_DIR)
+        logger.info("profile: finished mode=%s seconds=%s files=%s", mode, seconds, result.files)
+        await app.bot.send_message(
+            chat_id=chat_id,
+            text=f"<pre>{escape(result.report[:3900])}</pre>",
+            parse_mode="HTML",
+        )
+        for path in result.files[1:]:
+            with open(path, "rb") as f:
+                await app.bot.send_document(chat_id=chat_id, document=f)
+    except Exception as e:
+        logger.exception("profile: failed: %s", e)
+        await app.bot.send_message(chat_id=chat_id, text=f"❌ Profiling failed: {e}")
+    finally:
+        app.bot_data["profiling"] = False
+
+async def handle_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    if msg.from_user.id not in ADMIN_USER_IDS:
+        await msg.reply_text("❌ Admins only.")
+        return
+
+    if not PROFILING_ENABLED:
+        await msg.reply_text("❌ Profiling disabled. Set PROFILING_ENABLED in .env.")
+        return
+
+    tokens = msg.text.strip().split()[1:]
+    seconds = 10.0
+    mode = "sample"
+    try:
+        for token in tokens:
+            if token.lower() in ("sample", "cprofile"):
+                mode = token.lower()
+            else:
+                seconds = float(token)
+    except ValueError:
+        await msg.reply_text(USAGE)
+        return
+
+    if not 1 <= seconds <= PROFILE_MAX_SECONDS:
+        await msg.reply_text(f"❌ Seconds must be between 1 and {PROFILE_MAX_SECONDS:g}.")
+        return
+
+    app = context.application
+    if app.bot_data.get("profiling"):
+        await msg.reply_text("⏳ A profile is already running.")
+        return
+    app.bot_data["profiling"] = True
+
+    # Run in the background: this handler must not hold up the update queue while profiling it
+    app.create_task(_profile_and_report(app, msg.chat.id, seconds, mode))
+    await msg.reply_text(f"🔬 Profiling the event loop for {seconds:g}s ({mode})…")
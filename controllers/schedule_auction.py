@@ -1,11 +1,11 @@
 import re
 from datetime import datetime
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from telegram import Update
 from telegram.ext import ContextTypes
 from config.settings import SG_TZ
 from db.connection import DB
 from utils.time import parse_end_time
+from setups.scheduler import schedule_publish
 
 async def handle_scheduleauction(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = update.message
@@ -39,7 +39,7 @@ async def handle_scheduleauction(update: Update, context: ContextTypes.DEFAULT_T
     anti = int(m.group(8))
     description = m.group(9)
 
-    # Use a datetime for run_date
+    # Start time is given in SG time
     try:
         start_dt = datetime.strptime(start_time_str, "%Y-%m-%d %H:%M").replace(tzinfo=SG_TZ)
     except ValueError:
@@ -62,7 +62,7 @@ async def handle_scheduleauction(update: Update, context: ContextTypes.DEFAULT_T
         await msg.reply_text("❌ No channel bound for you. Use /bind in private chat.")
         return
 
-    scheduler: AsyncIOScheduler = context.application.bot_data["scheduler"]
+    scheduler = context.application.bot_data["scheduler"]
     owner = msg.from_user.id
 
     # Persist scheduled auction
@@ -83,9 +83,10 @@ async def handle_scheduleauction(update: Update, context: ContextTypes.DEFAULT_T
             description,
             owner_user_id,
             start_time,
-            photo_file_id
+            photo_file_id,
+            bot_id
         )
-        VALUES (?, NULL, ?, ?, ?, ?, ?, ?, 0, NULL, 'SCHEDULED', ?, ?, ?, ?)
+        VALUES (?, NULL, ?, ?, ?, ?, ?, ?, 0, NULL, 'SCHEDULED', ?, ?, ?, ?, ?)
         """,
         (
             channel_id,
@@ -99,55 +100,11 @@ async def handle_scheduleauction(update: Update, context: ContextTypes.DEFAULT_T
             owner,
             int(start_dt.timestamp()),
             photo_id,
+            context.bot.id,
         ),
     )
     DB.commit()
     auction_id = cur.lastrowid
 
-    async def post_auction(a_id: int):
-        row = DB.execute(
-            """
-            SELECT title, description, sb, rp, min_inc, end_time, anti_snipe, channel_id, photo_file_id
-            FROM auctions
-            WHERE auction_id = ? AND status = 'SCHEDULED'
-            """,
-            (a_id,),
-        ).fetchone()
-        if not row:
-            return
-
-        title2, description2, sb2, rp2, min_inc2, end_time2, anti2, chan_id2, photo2 = row
-
-        caption_text = (
-            f"🛒 <b>{title2}</b>\n\n"
-            f"{description2}\n\n"
-            f"💰 SB: {sb2}\n"
-            f"🏷 RP: {rp2}\n"
-            f"➕ Min Inc: {min_inc2}\n"
-            f"⏱ Ends: <b>{datetime.fromtimestamp(end_time2, tz=SG_TZ).strftime('%Y-%m-%d %H:%M')}</b>\n"
-            f"🛡 Anti-snipe: {anti2} min\n\n"
-            f"💬 Comment with a number to bid (or 'SB')"
-        )
-
-        sent = await context.bot.send_photo(
-            chat_id=chan_id2,
-            photo=photo2,
-            caption=caption_text,
-            parse_mode="HTML",
-        )
-
-        DB.execute(
-            "UPDATE auctions SET channel_post_id = ?, status = 'LIVE' WHERE auction_id = ?",
-            (sent.message_id, a_id),
-        )
-        DB.commit()
-
-    scheduler.add_job(
-        post_auction,
-        "date",
-        run_date=start_dt,
-        args=[auction_id],
-        id=f"publish_{auction_id}",
-        replace_existing=True,
-    )
+    schedule_publish(scheduler, auction_id, int(start_dt.timestamp()))
     await msg.reply_text(f"✅ Auction scheduled to start at {start_time_str}")
\ No newline at end of file
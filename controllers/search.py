@@ -0,0 +1,81 @@
+import asyncio
+import html
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import logger
+from db.connection import DB, open_reader
+from db.search import search
+from utils.captions import fmt_time
+
+PAGE_SIZE = 10
+_STATUSES = {"live": ("LIVE",), "ended": ("ENDED",), "all": ("LIVE", "ENDED")}
+_USAGE = "Usage: /search <words, word* for prefix> [status:live|ended|all] [channel:<channel_id>] [page:<n>]"
+
+
+def _post_link(channel_id: int, post_id: int) -> str:
+    internal = str(channel_id)[4:] if str(channel_id).startswith("-100") else str(abs(channel_id))
+    return f"https://t.me/c/{internal}/{post_id}"
+
+
+async def handle_search(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    terms, status, channel_id, page = [], "live", None, 1
+    try:
+        for token in msg.text.split()[1:]:
+            key, sep, value = token.partition(":")
+            if sep and key.lower() == "status" and value.lower() in _STATUSES:
+                status = value.lower()
+            elif sep and key.lower() == "channel":
+                channel_id = int(value)
+            elif sep and key.lower() == "page":
+                page = max(1, int(value))
+            else:
+                terms.append(token)
+    except ValueError:
+        await msg.reply_text(_USAGE)
+        return
+
+    if not terms:
+        await msg.reply_text(_USAGE)
+        return
+
+    # One extra row tells whether there is a next page
+    args = (terms, _STATUSES[status], channel_id, PAGE_SIZE + 1, (page - 1) * PAGE_SIZE)
+    reader = open_reader()
+    try:
+        if reader is not None:
+            # Own read-only connection: the FTS query runs off the event loop
+            hits = await asyncio.to_thread(search, reader, *args)
+        else:
+            # In-memory DB has no second connection; query the shared one
+            hits = search(DB.conn, *args)
+    except Exception as e:
+        logger.warning("search: query failed terms=%r error=%s", terms, e)
+        await msg.reply_text("❌ Search is unavailable right now.")
+        return
+    finally:
+        if reader is not None:
+            reader.close()
+
+    query = html.escape(" ".join(terms))
+    if not hits:
+        label = "" if status == "all" else f"{status} "
+        await msg.reply_text(f"No {label}auctions match <b>{query}</b>.", parse_mode="HTML")
+        return
+
+    lines = [f"🔎 <b>{query}</b> — page {page}\n"]
+    for _rank, auction_id, lot_channel, post_id, title, st, bid, sb, end_time in hits[:PAGE_SIZE]:
+        price = f"bid <b>{bid}</b>" if bid else f"SB {sb}"
+        when = "ends" if st == "LIVE" else "ended"
+        lines.append(
+            f"🆔 <code>{auction_id}</code> <a href='{_post_link(lot_channel, post_id)}'>{html.escape(title or '')}</a>"
+            f" — {price}, {when} {fmt_time(end_time)}"
+        )
+    if len(hits) > PAGE_SIZE:
+        lines.append(f"\nMore: <code>/search {query} status:{status}"
+                     f"{f' channel:{channel_id}' if channel_id is not None else ''} page:{page + 1}</code>")
+
+    await msg.reply_text("\n".join(lines), parse_mode="HTML", disable_web_page_preview=True)
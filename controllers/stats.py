@@ -0,0 +1,61 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.settings import ADMIN_USER_IDS, logger
+from db.connection import DB
+from db import channel_stats
+
+async def handle_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    tokens = msg.text.strip().split()
+    is_admin = msg.from_user.id in ADMIN_USER_IDS
+
+    if len(tokens) >= 2 and tokens[1].lower() in ("rebuild", "verify"):
+        if not is_admin:
+            await msg.reply_text("❌ Admins only.")
+            return
+        apply = tokens[1].lower() == "rebuild"
+        mismatches = channel_stats.rebuild(apply=apply)
+        logger.info("stats: %s by user %s, %d mismatching channel(s)", tokens[1].lower(), msg.from_user.id, len(mismatches))
+        if not mismatches:
+            await msg.reply_text("✅ Channel stats match the auctions table.")
+            return
+        lines = [f"{'🔧 Corrected' if apply else '⚠️ Mismatched'} {len(mismatches)} channel(s):"]
+        for channel_id, diff in mismatches[:20]:
+            lines.append(f"{channel_id}: " + ", ".join(f"{f} {h}→{w}" for f, (h, w) in diff.items()))
+        await msg.reply_text("\n".join(lines))
+        return
+
+    if len(tokens) == 2 and is_admin:
+        try:
+            channel_id = int(tokens[1])
+        except ValueError:
+            await msg.reply_text("Usage: /stats [channel_id | rebuild | verify]")
+            return
+    else:
+        # Per-user binding lookup ONLY
+        row = DB.execute("SELECT channel_id FROM bindings WHERE user_id = ?", (msg.from_user.id,)).fetchone()
+        channel_id = row[0] if row else None
+        if not channel_id:
+            await msg.reply_text("❌ No channel bound for you. Use /bind in private chat.")
+            return
+
+    st = channel_stats.get(channel_id)
+    if not st:
+        await msg.reply_text("No auctions recorded for this channel yet.")
+        return
+
+    met_rate = 100 * st["reserve_met_lots"] / st["ended_lots"] if st["ended_lots"] else 0
+    avg_bids = st["total_bids"] / st["lots_total"] if st["lots_total"] else 0
+    await msg.reply_text(
+        f"📈 <b>Channel Stats</b> <code>{channel_id}</code>\n\n"
+        f"🟢 Active lots: <b>{st['active_lots']}</b>\n"
+        f"📦 Lots published: {st['lots_total']}\n"
+        f"🔨 Total bids: {st['total_bids']}\n"
+        f"💰 GMV: <b>{st['gmv']}</b>\n"
+        f"🏷 Reserve met: {met_rate:.1f}% of {st['ended_lots']} ended\n"
+        f"📊 Avg bids per lot: {avg_bids:.2f}",
+        parse_mode="HTML",
+    )
@@ -0,0 +1,75 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from db.connection import DB
+from db.watchers import watch, unwatch
+
+async def handle_watch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    tokens = msg.text.strip().split()
+
+    if len(tokens) == 1:
+        rows = DB.execute(
+            """
+            SELECT a.auction_id, a.title, a.highest_bid, a.status
+            FROM watchers w JOIN auctions a ON a.auction_id = w.auction_id
+            WHERE w.user_id = ? AND a.status IN ('LIVE', 'SCHEDULED')
+            ORDER BY a.end_time ASC
+            """,
+            (msg.from_user.id,),
+        ).fetchall()
+        if not rows:
+            await msg.reply_text("You are not watching any auctions. Use /watch <auction_id>.")
+            return
+        lines = ["👀 <b>Watching</b>\n"]
+        for auction_id, title, bid, status in rows:
+            lines.append(f"🆔 <code>{auction_id}</code> <b>{title}</b> — {status}, bid {bid}")
+        await msg.reply_text("\n".join(lines), parse_mode="HTML")
+        return
+
+    if len(tokens) != 2:
+        await msg.reply_text("Usage: /watch <auction_id>")
+        return
+
+    try:
+        auction_id = int(tokens[1])
+    except ValueError:
+        await msg.reply_text("❌ Invalid auction ID.")
+        return
+
+    row = DB.execute(
+        "SELECT title, status FROM auctions WHERE auction_id = ?",
+        (auction_id,),
+    ).fetchone()
+    if not row or row[1] not in ("LIVE", "SCHEDULED"):
+        await msg.reply_text("❌ Auction not found or already ended.")
+        return
+
+    watch(auction_id, msg.from_user.id)
+    DB.commit()
+    await msg.reply_text(f"👀 Watching {row[0]}. I'll DM you about new bids and when it's ending.")
+
+async def handle_unwatch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    msg = update.message
+    if not msg or not msg.text:
+        return
+
+    tokens = msg.text.strip().split()
+    if len(tokens) != 2:
+        await msg.reply_text("Usage: /unwatch <auction_id>")
+        return
+
+    try:
+        auction_id = int(tokens[1])
+    except ValueError:
+        await msg.reply_text("❌ Invalid auction ID.")
+        return
+
+    removed = unwatch(auction_id, msg.from_user.id)
+    DB.commit()
+    if removed:
+        await msg.reply_text(f"✅ Stopped watching auction {auction_id}.")
+    else:
+        await msg.reply_text("You were not watching that auction.")
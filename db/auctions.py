@@ -0,0 +1,149 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from db.connection import DB
+
+
+class _Record:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{n}={getattr(self, n)!r}' for n in self.__slots__)})"
+
+    @classmethod
+    def columns(cls, alias: str = "") -> str:
+        prefix = f"{alias}." if alias else ""
+        return ", ".join(prefix + name for name in cls.__slots__)
+
+
+# Just enough to route a bid to its auction and owning bot
+class AuctionRef(_Record):
+    __slots__ = ("auction_id", "channel_id", "channel_post_id", "bot_id")
+
+
+# Everything bid / max-bid resolution reads and rewrites
+class LiveAuction(_Record):
+    __slots__ = (
+        "auction_id", "channel_id", "channel_post_id", "title", "description", "sb", "rp", "min_inc",
+        "end_time", "anti_snipe", "highest_bid", "highest_bidder", "highest_bidder_name", "reply_anchor",
+        "owner_user_id", "status", "bot_id",
+    )
+
+
+class DueAuction(_Record):
+    __slots__ = (
+        "auction_id", "channel_id", "channel_post_id", "title", "description", "rp",
+        "highest_bid", "highest_bidder", "reply_anchor", "end_time", "bot_id", "highest_bidder_name",
+    )
+
+
+class ScheduledAuction(_Record):
+    __slots__ = (
+        "auction_id", "channel_id", "title", "description", "sb", "rp", "min_inc",
+        "end_time", "anti_snipe", "photo_file_id", "bot_id", "start_time",
+    )
+
+
+# Every statement is a fixed string built once, so sqlite3's per-connection
+# statement cache prepares each exactly once. Variable-length id lists go
+# through json_each(?) instead of a generated IN (?, ?, ...).
+class AuctionRepository:
+    _FIND_BY_POST = f"SELECT {AuctionRef.columns()} FROM auctions WHERE channel_id = ? AND channel_post_id = ?"
+    _FIND_BY_THREAD = f"""
+        SELECT {AuctionRef.columns("a")}
+        FROM thread_index t JOIN auctions a ON a.auction_id = t.auction_id
+        WHERE t.chat_id = ? AND t.message_id IN (?, ?)
+        LIMIT 1
+    """
+    _GET_MANY = f"""
+        SELECT {LiveAuction.columns()} FROM auctions
+        WHERE auction_id IN (SELECT value FROM json_each(?))
+    """
+    _DUE = f"SELECT {DueAuction.columns()} FROM auctions WHERE status = 'LIVE' AND end_time <= ?"
+    _CLOSE = """
+        UPDATE auctions SET status = 'ENDED'
+        WHERE auction_id = ? AND status = 'LIVE' AND end_time <= ? AND highest_bid IS ? AND highest_bidder IS ?
+    """
+    _GET_SCHEDULED_MANY = f"""
+        SELECT {ScheduledAuction.columns()} FROM auctions
+        WHERE auction_id IN (SELECT value FROM json_each(?)) AND status = 'SCHEDULED'
+    """
+    _SCHEDULED = f"SELECT {ScheduledAuction.columns()} FROM auctions WHERE status = 'SCHEDULED'"
+    _PUBLISH = """
+        UPDATE auctions SET channel_post_id = ?, status = 'LIVE'
+        WHERE auction_id = ? AND status IN ('SCHEDULED', 'POSTING')
+    """
+    _LIVE = f"SELECT {LiveAuction.columns()} FROM auctions WHERE status = 'LIVE'"
+    _LIVE_ENDING = f"""
+        SELECT {LiveAuction.columns()} FROM auctions
+        WHERE status = 'LIVE' AND end_time > ? AND end_time <= ?
+    """
+    _APPLY_BIDS = """
+        UPDATE auctions
+        SET highest_bid = ?, highest_bidder = ?, highest_bidder_name = ?, end_time = ?, reply_anchor = ?,
+            bid_count = COALESCE(bid_count, 0) + ?
+        WHERE auction_id = ?
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def find_by_post(self, channel_id: int, post_id: int) -> Optional[AuctionRef]:
+        row = self.conn.execute(self._FIND_BY_POST, (channel_id, post_id)).fetchone()
+        return AuctionRef(*row) if row else None
+
+    # Looks up either message id in the discussion-thread index
+    def find_by_thread(self, chat_id: int, message_id: int, thread_id: Optional[int] = None) -> Optional[AuctionRef]:
+        row = self.conn.execute(self._FIND_BY_THREAD, (chat_id, message_id, thread_id or message_id)).fetchone()
+        return AuctionRef(*row) if row else None
+
+    def get(self, auction_id: int) -> Optional[LiveAuction]:
+        return self.get_many((auction_id,)).get(auction_id)
+
+    def get_many(self, auction_ids: Iterable[int]) -> Dict[int, LiveAuction]:
+        rows = self.conn.execute(self._GET_MANY, (_json_ids(auction_ids),)).fetchall()
+        return {row[0]: LiveAuction(*row) for row in rows}
+
+    def live(self) -> List[LiveAuction]:
+        return [LiveAuction(*row) for row in self.conn.execute(self._LIVE).fetchall()]
+
+    def live_ending(self, after: int, until: int) -> List[LiveAuction]:
+        return [LiveAuction(*row) for row in self.conn.execute(self._LIVE_ENDING, (after, until)).fetchall()]
+
+    def due(self, ts: int) -> List[DueAuction]:
+        return [DueAuction(*row) for row in self.conn.execute(self._DUE, (ts,)).fetchall()]
+
+    # Closes each (auction_id, highest_bid, highest_bidder) only if no bid landed
+    # since it was read. Returns the ids actually closed; does not commit.
+    def close_many(self, closes: Iterable[Tuple[int, int, Optional[int]]], ts: int) -> List[int]:
+        closed = []
+        for auction_id, bid, bidder in closes:
+            if self.conn.execute(self._CLOSE, (auction_id, ts, bid, bidder)).rowcount:
+                closed.append(auction_id)
+        return closed
+
+    def scheduled(self) -> List[ScheduledAuction]:
+        return [ScheduledAuction(*row) for row in self.conn.execute(self._SCHEDULED).fetchall()]
+
+    def get_scheduled_many(self, auction_ids: Iterable[int]) -> List[ScheduledAuction]:
+        rows = self.conn.execute(self._GET_SCHEDULED_MANY, (_json_ids(auction_ids),)).fetchall()
+        return [ScheduledAuction(*row) for row in rows]
+
+    # (auction_id, channel_post_id) pairs for scheduled or just-posted lots; does not commit
+    def publish_many(self, published: Sequence[Tuple[int, int]]):
+        self.conn.executemany(self._PUBLISH, [(post_id, auction_id) for auction_id, post_id in published])
+
+    # Does not commit
+    def apply_bids(
+        self, auction_id: int, highest: int, holder: int, holder_name: str, end_time: int, anchor: Optional[str], count: int
+    ):
+        self.conn.execute(self._APPLY_BIDS, (highest, holder, holder_name, end_time, anchor, count, auction_id))
+
+
+def _json_ids(ids: Iterable[int]) -> str:
+    return "[" + ",".join(str(int(i)) for i in ids) + "]"
+
+
+AUCTIONS = AuctionRepository(DB)
@@ -0,0 +1,73 @@
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from typing import List, Tuple
+
+
+# Copies the DB at `src_path` into `dest_path` with the online backup API,
+# `pages` pages per step, sleeping `pause` seconds between steps. Blocking:
+# run it in a worker thread. It reads from its own connection holding one WAL
+# read transaction, so the bot keeps writing on its connection throughout and
+# the copy is the snapshot taken when the backup started (never restarted by
+# those writes).
+def snapshot(src_path: str, dest_path: str, pages: int, pause: float) -> int:
+    src = sqlite3.connect(f"file:{src_path}?mode=ro", uri=True)
+    dest = sqlite3.connect(dest_path)
+    steps = 0
+
+    def progress(_status, _remaining, _total):
+        nonlocal steps
+        steps += 1
+        if pause > 0:
+            time.sleep(pause)
+
+    try:
+        src.execute("BEGIN")
+        src.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+        src.backup(dest, pages=pages, progress=progress)
+        # A standalone file: no -wal/-shm companions needed to open it
+        dest.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        src.close()
+        dest.close()
+    return steps
+
+
+def verify(path: str) -> str:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# Gzips `path` into `gz_path` (renamed into place once complete) and removes `path`
+def compress(path: str, gz_path: str):
+    tmp = gz_path + ".partial"
+    with open(path, "rb") as f_in, gzip.open(tmp, "wb", compresslevel=6) as f_out:
+        shutil.copyfileobj(f_in, f_out, 1 << 20)
+    os.replace(tmp, gz_path)
+    os.remove(path)
+
+
+# Snapshots named <stem>-<YYYYmmdd-HHMMSS>.db.gz, newest first
+def existing(backup_dir: str, stem: str) -> List[Tuple[str, float]]:
+    if not os.path.isdir(backup_dir):
+        return []
+    prefix = f"{stem}-"
+    found = [
+        (os.path.join(backup_dir, name), os.path.getmtime(os.path.join(backup_dir, name)))
+        for name in os.listdir(backup_dir)
+        if name.startswith(prefix) and name.endswith(".db.gz") and name[len(prefix):-len(".db.gz")].replace("-", "").isdigit()
+    ]
+    return sorted(found, key=lambda f: f[0], reverse=True)
+
+
+def rotate(backup_dir: str, stem: str, keep: int) -> int:
+    removed = 0
+    for path, _ in existing(backup_dir, stem)[keep:]:
+        os.remove(path)
+        removed += 1
+    return removed
@@ -0,0 +1,95 @@
+import sys
+from typing import Dict, List, Optional, Tuple
+from db.connection import DB
+
+FIELDS = ("lots_total", "active_lots", "total_bids", "ended_lots", "reserve_met_lots", "gmv")
+
+# Read-through mirror of channel_stats rows. bump() only drops the entry, so an
+# uncommitted or rolled-back delta can never leak into it.
+_mirror: Dict[int, Tuple[int, ...]] = {}
+
+_AGGREGATE_SQL = """
+    SELECT channel_id,
+           SUM(CASE WHEN status IN ('LIVE', 'ENDED') THEN 1 ELSE 0 END),
+           SUM(CASE WHEN status = 'LIVE' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN status IN ('LIVE', 'ENDED') THEN COALESCE(bid_count, 0) ELSE 0 END),
+           SUM(CASE WHEN status = 'ENDED' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN status = 'ENDED' AND highest_bidder IS NOT NULL AND highest_bid >= rp THEN 1 ELSE 0 END),
+           SUM(CASE WHEN status = 'ENDED' AND highest_bidder IS NOT NULL AND highest_bid >= rp THEN highest_bid ELSE 0 END)
+    FROM auctions
+    WHERE channel_id IS NOT NULL
+    GROUP BY channel_id
+"""
+
+
+# Does not commit: call inside the transaction that makes the auction change.
+def bump(channel_id: int, **deltas: int):
+    cols = [f for f in FIELDS if deltas.get(f)]
+    if not cols or channel_id is None:
+        return
+    DB.execute(
+        f"""
+        INSERT INTO channel_stats (channel_id, {", ".join(cols)}) VALUES (?, {", ".join("?" for _ in cols)})
+        ON CONFLICT (channel_id) DO UPDATE SET {", ".join(f"{c} = {c} + excluded.{c}" for c in cols)}
+        """,
+        (channel_id, *(deltas[c] for c in cols)),
+    )
+    _mirror.pop(channel_id, None)
+
+
+# For rows changed by another process (a standby following the active instance)
+def invalidate():
+    _mirror.clear()
+
+
+def get(channel_id: int) -> Optional[Dict[str, int]]:
+    row = _mirror.get(channel_id)
+    if row is None:
+        row = DB.execute(
+            f"SELECT {', '.join(FIELDS)} FROM channel_stats WHERE channel_id = ?",
+            (channel_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        _mirror[channel_id] = row
+    return dict(zip(FIELDS, row))
+
+
+# Recomputes every channel from the auctions table. Returns the channels whose
+# maintained counters disagreed with the recomputation before it was applied.
+def rebuild(apply: bool = True) -> List[Tuple[int, Dict[str, Tuple[int, int]]]]:
+    fresh = {row[0]: tuple(v or 0 for v in row[1:]) for row in DB.execute(_AGGREGATE_SQL).fetchall()}
+    current = {
+        row[0]: tuple(row[1:])
+        for row in DB.execute(f"SELECT channel_id, {', '.join(FIELDS)} FROM channel_stats").fetchall()
+    }
+
+    mismatches = []
+    for channel_id in sorted(set(fresh) | set(current)):
+        want = fresh.get(channel_id, (0,) * len(FIELDS))
+        have = current.get(channel_id, (0,) * len(FIELDS))
+        diff = {f: (h, w) for f, h, w in zip(FIELDS, have, want) if h != w}
+        if diff:
+            mismatches.append((channel_id, diff))
+
+    if apply:
+        DB.execute("DELETE FROM channel_stats")
+        DB.executemany(
+            f"INSERT INTO channel_stats (channel_id, {', '.join(FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(channel_id, *values) for channel_id, values in fresh.items()],
+        )
+        DB.commit()
+        _mirror.clear()
+    return mismatches
+
+
+if __name__ == "__main__":
+    # python -m db.channel_stats [--verify]   (--verify reports without rewriting)
+    from config.settings import configure_logging
+    configure_logging()
+    verify_only = "--verify" in sys.argv[1:]
+    found = rebuild(apply=not verify_only)
+    for channel_id, diff in found:
+        print(channel_id, " ".join(f"{f}={h}->{w}" for f, (h, w) in diff.items()))
+    print(f"{len(found)} channel(s) {'differ' if verify_only else 'corrected'}")
+    sys.exit(1 if verify_only and found else 0)
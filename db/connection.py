@@ -1,7 +1,10 @@
 import os
 import sqlite3
+import time
 from typing import Optional
 from config.settings import logger
+from db.instrumented import InstrumentedConnection
+from utils import startup
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 SCHEMA_PATH = os.path.join(BASE_DIR, "schema.sql")
@@ -26,8 +29,9 @@ def _connect(candidate: str, *, uri: bool = False) -> Optional[sqlite3.Connectio
         return None
 
 
-def _init_db() -> sqlite3.Connection:
-    env = os.environ.get("SQLITE_DB_PATH")
+def _init_db(path: Optional[str] = None) -> sqlite3.Connection:
+    started = time.perf_counter()
+    env = path or os.environ.get("SQLITE_DB_PATH")
     logger.info("DB env: SQLITE_DB_PATH=%s", env)
 
     uri_candidate = None
@@ -84,6 +88,9 @@ def _init_db() -> sqlite3.Connection:
     except Exception as e:
         logger.warning("Failed to set PRAGMAs or log DB path: %s", e)
 
+    opened = time.perf_counter()
+    startup.record("db_open", opened - started)
+
     try:
         cur = db.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='auctions'"
@@ -113,6 +120,92 @@ def _init_db() -> sqlite3.Connection:
     except Exception as e:
         logger.error("Failed to ensure bindings table: %s", e)
 
+    # Create outbox table for deferred Telegram side effects
+    try:
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                method TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                dedupe_key TEXT,
+                status TEXT NOT NULL DEFAULT 'PENDING',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at INTEGER NOT NULL,
+                last_error TEXT,
+                created_at INTEGER NOT NULL
+            )
+        """)
+        if "bot_id" not in {row[1] for row in db.execute("PRAGMA table_info(outbox)").fetchall()}:
+            db.execute("ALTER TABLE outbox ADD COLUMN bot_id INTEGER")
+        db.execute("CREATE INDEX IF NOT EXISTS outbox_status_next ON outbox(status, next_attempt_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS outbox_dedupe ON outbox(dedupe_key)")
+        db.commit()
+    except Exception as e:
+        logger.error("Failed to ensure outbox table: %s", e)
+
+    # Create proxy_bids table for private maximum bids
+    try:
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS proxy_bids (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                auction_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                max_bid INTEGER NOT NULL,
+                display_name TEXT,
+                created_at INTEGER NOT NULL,
+                UNIQUE (auction_id, user_id)
+            )
+        """)
+        db.commit()
+    except Exception as e:
+        logger.error("Failed to ensure proxy_bids table: %s", e)
+
+    # Create watchers table for outbid / ending-soon DMs
+    try:
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS watchers (
+                auction_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                PRIMARY KEY (auction_id, user_id)
+            )
+        """)
+        db.commit()
+    except Exception as e:
+        logger.error("Failed to ensure watchers table: %s", e)
+
+    # Create thread_index table mapping discussion messages to auctions
+    try:
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS thread_index (
+                chat_id INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                auction_id INTEGER NOT NULL,
+                PRIMARY KEY (chat_id, message_id)
+            ) WITHOUT ROWID
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS thread_index_auction ON thread_index(auction_id)")
+        db.commit()
+    except Exception as e:
+        logger.error("Failed to ensure thread_index table: %s", e)
+
+    # Create channel_stats table: per-channel counters maintained by delta
+    try:
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS channel_stats (
+                channel_id INTEGER PRIMARY KEY,
+                lots_total INTEGER NOT NULL DEFAULT 0,
+                active_lots INTEGER NOT NULL DEFAULT 0,
+                total_bids INTEGER NOT NULL DEFAULT 0,
+                ended_lots INTEGER NOT NULL DEFAULT 0,
+                reserve_met_lots INTEGER NOT NULL DEFAULT 0,
+                gmv INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        db.commit()
+    except Exception as e:
+        logger.error("Failed to ensure channel_stats table: %s", e)
+
     # Migration: add columns/indexes if missing
     try:
         cols = {row[1] for row in db.execute("PRAGMA table_info(auctions)").fetchall()}
@@ -138,7 +231,21 @@ def _init_db() -> sqlite3.Connection:
         if "reply_anchor" not in cols:
             db.execute("ALTER TABLE auctions ADD COLUMN reply_anchor TEXT")
             db.commit()
+        # Which bot (numeric id from its token) owns the auction; NULL means the primary bot
+        if "bot_id" not in cols:
+            db.execute("ALTER TABLE auctions ADD COLUMN bot_id INTEGER")
+            db.commit()
+        # Per-auction accepted-bid counter feeding channel_stats; history before it is approximated
+        if "bid_count" not in cols:
+            db.execute("ALTER TABLE auctions ADD COLUMN bid_count INTEGER DEFAULT 0")
+            db.execute("UPDATE auctions SET bid_count = CASE WHEN highest_bidder IS NULL THEN 0 ELSE 1 END")
+            db.commit()
+        # Holder's display name, so captions can be re-rendered without an API lookup
+        if "highest_bidder_name" not in cols:
+            db.execute("ALTER TABLE auctions ADD COLUMN highest_bidder_name TEXT")
+            db.commit()
         db.execute("CREATE UNIQUE INDEX IF NOT EXISTS auctions_channel_message_unique ON auctions(channel_id, channel_post_id)")
+        db.execute("CREATE INDEX IF NOT EXISTS auctions_owner_status_end ON auctions(owner_user_id, status, end_time)")
         db.commit()
     except Exception as e:
         logger.warning("Schema migration adjustments failed: %s", e)
@@ -185,7 +292,88 @@ def _init_db() -> sqlite3.Connection:
     except Exception as e:
         logger.warning("Unique constraint migration failed: %s", e)
 
+    # Full-text index over auction titles and descriptions for /search, kept in
+    # sync by triggers. Created after the table migrations above, which would
+    # drop the triggers along with the old table.
+    try:
+        if db.execute("SELECT 1 FROM sqlite_master WHERE name = 'auctions_fts'").fetchone() is None:
+            db.executescript("""
+                CREATE VIRTUAL TABLE auctions_fts USING fts5(
+                    title, description,
+                    content='auctions', content_rowid='auction_id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                );
+                INSERT INTO auctions_fts (auctions_fts, rank) VALUES ('rank', 'bm25(4.0, 1.0)');
+                INSERT INTO auctions_fts (auctions_fts) VALUES ('rebuild');
+            """)
+        db.executescript("""
+            CREATE TRIGGER IF NOT EXISTS auctions_fts_insert AFTER INSERT ON auctions BEGIN
+                INSERT INTO auctions_fts (rowid, title, description) VALUES (new.auction_id, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS auctions_fts_delete AFTER DELETE ON auctions BEGIN
+                INSERT INTO auctions_fts (auctions_fts, rowid, title, description)
+                VALUES ('delete', old.auction_id, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS auctions_fts_update AFTER UPDATE OF title, description ON auctions BEGIN
+                INSERT INTO auctions_fts (auctions_fts, rowid, title, description)
+                VALUES ('delete', old.auction_id, old.title, old.description);
+                INSERT INTO auctions_fts (rowid, title, description) VALUES (new.auction_id, new.title, new.description);
+            END;
+        """)
+        db.commit()
+    except Exception as e:
+        logger.warning("Failed to ensure auctions_fts search index (is SQLite built with FTS5?): %s", e)
+
+    # Counter bumped by triggers on every write to the tables a standby mirrors
+    # (auctions, channel_stats). Unlike PRAGMA data_version it stays put on the
+    # active instance's lease renewals. Same placement reason as auctions_fts.
+    try:
+        db.execute("CREATE TABLE IF NOT EXISTS data_changes (id INTEGER PRIMARY KEY CHECK (id = 1), n INTEGER NOT NULL)")
+        db.execute("INSERT OR IGNORE INTO data_changes (id, n) VALUES (1, 0)")
+        for table in ("auctions", "channel_stats"):
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                db.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_changes_{event.lower()} AFTER {event} ON {table} BEGIN
+                        UPDATE data_changes SET n = n + 1 WHERE id = 1;
+                    END
+                """)
+        db.commit()
+    except Exception as e:
+        logger.error("Failed to ensure data_changes counter: %s", e)
+
+    startup.record("migrations", time.perf_counter() - opened)
     return db
 
 
-DB = _init_db()
\ No newline at end of file
+# Separate read-only connection for long scans (exports) so they read a WAL
+# snapshot instead of sharing a cursor with the bid path. None for in-memory DBs.
+def open_reader() -> Optional[sqlite3.Connection]:
+    row = DB.execute("PRAGMA database_list").fetchone()
+    path = row[2] if row else ""
+    if not path:
+        return None
+    try:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    except Exception as e:
+        logger.warning("Read-only DB connect failed for %s: %s", path, e)
+        return None
+
+
+# The DB is opened (and migrated) on first use rather than at import, so
+# tools and tests can import any module without touching the database.
+class _LazyConnection:
+    __slots__ = ("_conn",)
+
+    def __init__(self):
+        self._conn: Optional[InstrumentedConnection] = None
+
+    def open(self) -> InstrumentedConnection:
+        if self._conn is None:
+            self._conn = InstrumentedConnection(_init_db())
+        return self._conn
+
+    def __getattr__(self, name):
+        return getattr(self.open(), name)
+
+
+DB = _LazyConnection()
@@ -0,0 +1,51 @@
+import csv
+import gzip
+import io
+from datetime import datetime
+from typing import Iterator, Tuple
+from config.settings import SG_TZ
+
+EXPORT_COLUMNS = ["auction_id", "title", "winning_bid", "winner_user_id", "reserve_met", "end_time"]
+
+
+# Streams ENDED auctions through a single cursor, batch by batch; nothing is
+# materialised beyond `batch` rows whatever the seller's history size.
+def iter_results(conn, owner_user_id: int, start_ts: int, end_ts: int, batch: int = 500) -> Iterator[Tuple]:
+    cur = conn.execute(
+        """
+        SELECT auction_id, title, highest_bid, highest_bidder, rp, end_time
+        FROM auctions
+        WHERE owner_user_id = ? AND status = 'ENDED' AND end_time >= ? AND end_time < ?
+        ORDER BY end_time ASC
+        """,
+        (owner_user_id, start_ts, end_ts),
+    )
+    try:
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                return
+            for auction_id, title, bid, bidder, rp, end_time in rows:
+                met = bool(bidder) and (bid or 0) >= (rp or 0)
+                yield (
+                    auction_id,
+                    title,
+                    bid if met else "",
+                    bidder if met else "",
+                    "yes" if met else "no",
+                    datetime.fromtimestamp(end_time, tz=SG_TZ).strftime("%Y-%m-%d %H:%M"),
+                )
+    finally:
+        cur.close()
+
+
+def write_csv(rows: Iterator[Tuple], path: str, compress: bool = False) -> int:
+    count = 0
+    raw = gzip.open(path, "wb") if compress else open(path, "wb")
+    with raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
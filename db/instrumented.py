@@ -0,0 +1,126 @@
+import re
+import sqlite3
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from config.settings import logger, DB_SLOW_MS, DB_STATS_MAX
+
+_WS = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|-?\b\d+(?:\.\d+)?\b")
+
+
+def normalize(sql: str) -> str:
+    return _LITERALS.sub("?", _WS.sub(" ", sql).strip())
+
+
+class StatementStats:
+    __slots__ = ("count", "total", "max", "recent", "plan")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=512)
+        self.plan: Optional[str] = None
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.recent.append(elapsed)
+
+    def p99(self) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+# Thin wrapper over the shared sqlite3 connection: times every statement and
+# commit, keeps bounded per-statement stats, and logs slow statements with
+# their query plan. Anything not wrapped falls through to the connection.
+class InstrumentedConnection:
+    def __init__(self, conn: sqlite3.Connection, slow_ms: float = DB_SLOW_MS, max_statements: int = DB_STATS_MAX):
+        self.conn = conn
+        self.slow = slow_ms / 1000
+        self.max_statements = max_statements
+        self.stats: Dict[str, StatementStats] = {}
+        self._norm_cache: Dict[str, str] = {}
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    def _key(self, sql: str) -> str:
+        key = self._norm_cache.get(sql)
+        if key is None:
+            if len(self._norm_cache) >= self.max_statements * 4:
+                self._norm_cache.clear()
+            key = self._norm_cache[sql] = normalize(sql)
+        return key
+
+    def _record(self, key: str, elapsed: float, sql: Optional[str] = None, params=()):
+        st = self.stats.get(key)
+        if st is None:
+            if len(self.stats) >= self.max_statements:
+                # Evict the statement that has cost the least so far
+                del self.stats[min(self.stats, key=lambda k: self.stats[k].total)]
+            st = self.stats[key] = StatementStats()
+        st.add(elapsed)
+        if elapsed >= self.slow:
+            if sql is not None and st.plan is None:
+                st.plan = self._explain(sql, params)
+            logger.warning(
+                "slow query: %.1fms sql=%s plan=%s",
+                elapsed * 1000,
+                key,
+                st.plan or "-",
+            )
+
+    def _explain(self, sql: str, params) -> str:
+        head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if head not in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE"):
+            return "-"
+        try:
+            rows = self.conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+            return " | ".join(row[-1] for row in rows)
+        except Exception as e:
+            return f"unavailable ({e})"
+
+    def execute(self, sql: str, params=()):
+        t = time.perf_counter()
+        try:
+            return self.conn.execute(sql, params)
+        finally:
+            self._record(self._key(sql), time.perf_counter() - t, sql, params)
+
+    def executemany(self, sql: str, seq):
+        t = time.perf_counter()
+        try:
+            return self.conn.executemany(sql, seq)
+        finally:
+            self._record(self._key(sql), time.perf_counter() - t)
+
+    def executescript(self, script: str):
+        t = time.perf_counter()
+        try:
+            return self.conn.executescript(script)
+        finally:
+            self._record("<script>", time.perf_counter() - t)
+
+    def commit(self):
+        t = time.perf_counter()
+        try:
+            self.conn.commit()
+        finally:
+            self._record("COMMIT", time.perf_counter() - t)
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def top(self, limit: int = 10) -> List[tuple]:
+        ranked = sorted(self.stats.items(), key=lambda kv: kv[1].total, reverse=True)
+        return [(key, st.count, st.total, st.p99(), st.max) for key, st in ranked[:limit]]
+
+    def reset(self):
+        self.stats.clear()
@@ -0,0 +1,27 @@
+import json
+from typing import Optional
+from db.connection import DB
+from utils.time import now
+
+
+# Queue a Bot API call on the given bot (None: primary). Does not commit: the
+# caller's DB.commit() makes it durable together with the auction change that caused it.
+def enqueue(method: str, *, bot_id: Optional[int] = None, dedupe_key: Optional[str] = None, **kwargs) -> None:
+    if dedupe_key:
+        # A newer edit of the same message supersedes any that have not gone out yet
+        DB.execute(
+            "DELETE FROM outbox WHERE dedupe_key = ? AND status = 'PENDING'",
+            (dedupe_key,),
+        )
+    ts = now()
+    DB.execute(
+        """
+        INSERT INTO outbox (bot_id, method, payload, dedupe_key, status, attempts, next_attempt_at, created_at)
+        VALUES (?, ?, ?, ?, 'PENDING', 0, ?, ?)
+        """,
+        (bot_id, method, json.dumps(kwargs), dedupe_key, ts, ts),
+    )
+
+
+def caption_key(chat_id: int, message_id: int) -> str:
+    return f"caption:{chat_id}:{message_id}"
@@ -0,0 +1,36 @@
+from typing import List, Optional
+from db.connection import DB
+from utils.proxy_bidding import ProxyBid
+from utils.time import now
+
+
+def load_proxies(auction_id: int) -> List[ProxyBid]:
+    rows = DB.execute(
+        "SELECT user_id, max_bid, seq FROM proxy_bids WHERE auction_id = ?",
+        (auction_id,),
+    ).fetchall()
+    return [ProxyBid(*row) for row in rows]
+
+
+def display_name(auction_id: int, user_id: int) -> Optional[str]:
+    row = DB.execute(
+        "SELECT display_name FROM proxy_bids WHERE auction_id = ? AND user_id = ?",
+        (auction_id, user_id),
+    ).fetchone()
+    return row[0] if row else None
+
+
+# Does not commit; the caller commits together with the resolution it triggers.
+# Tie priority (seq) is set by a user's first max on the lot and kept when they
+# raise, lower or re-send it, so updating a max never costs a user their place.
+def register_proxy(auction_id: int, user_id: int, max_bid: int, name: str):
+    DB.execute(
+        """
+        INSERT INTO proxy_bids (auction_id, user_id, max_bid, display_name, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (auction_id, user_id) DO UPDATE SET
+            max_bid = excluded.max_bid,
+            display_name = excluded.display_name
+        """,
+        (auction_id, user_id, max_bid, name, now()),
+    )
@@ -0,0 +1,47 @@
+from typing import List, Optional, Sequence, Tuple
+from config.settings import SEARCH_RANK_CAP
+
+# (rank, auction_id, channel_id, channel_post_id, title, status, highest_bid, sb, end_time)
+Hit = Tuple[float, int, int, int, str, str, int, int, int]
+
+# bm25 is only computed for the newest `cap` matches (FTS5 walks rowids in
+# order, so the inner LIMIT stops the scan); those are then ranked.
+_SEARCH = """
+    SELECT c.rank, a.auction_id, a.channel_id, a.channel_post_id, a.title, a.status, a.highest_bid, a.sb, a.end_time
+    FROM (
+        SELECT f.rowid AS auction_id, f.rank AS rank
+        FROM auctions_fts f JOIN auctions a ON a.auction_id = f.rowid
+        WHERE auctions_fts MATCH ?
+          AND a.status IN (SELECT value FROM json_each(?))
+          AND (? IS NULL OR a.channel_id = ?)
+        ORDER BY f.rowid DESC
+        LIMIT ?
+    ) c JOIN auctions a ON a.auction_id = c.auction_id
+    ORDER BY c.rank
+    LIMIT ? OFFSET ?
+"""
+
+
+# Every word must match. Words are quoted so FTS5 query syntax in the input is
+# searched for literally; a trailing * keeps its prefix meaning ("vint*").
+def match_expression(terms: Sequence[str]) -> str:
+    parts = []
+    for term in terms:
+        prefix = term.endswith("*")
+        word = term.rstrip("*")
+        if word.strip('"'):
+            parts.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+# Best-ranked first, optionally within one channel. Takes the connection so
+# /search can run it on its own read-only one, off the event loop.
+def search(
+    conn, terms: Sequence[str], statuses: Sequence[str], channel_id: Optional[int] = None,
+    limit: int = 10, offset: int = 0, cap: int = SEARCH_RANK_CAP,
+) -> List[Hit]:
+    match = match_expression(terms)
+    if not match:
+        return []
+    status_json = "[" + ",".join(f'"{s}"' for s in statuses) + "]"
+    return conn.execute(_SEARCH, (match, status_json, channel_id, channel_id, cap, limit, offset)).fetchall()
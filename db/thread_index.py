@@ -0,0 +1,10 @@
+from db.connection import DB
+
+
+# Does not commit; callers commit with the write that discovered the mapping.
+def index_message(chat_id: int, message_id: int, auction_id: int):
+    DB.execute(
+        "INSERT OR IGNORE INTO thread_index (chat_id, message_id, auction_id) VALUES (?, ?, ?)",
+        (chat_id, message_id, auction_id),
+    )
+
@@ -0,0 +1,39 @@
+from typing import List, Tuple
+from db.connection import DB
+
+
+# Does not commit. Bidding upgrades a plain watch so the user gets "outbid" wording.
+def watch(auction_id: int, user_id: int, kind: str = "WATCH"):
+    if kind == "BIDDER":
+        DB.execute(
+            """
+            INSERT INTO watchers (auction_id, user_id, kind) VALUES (?, ?, 'BIDDER')
+            ON CONFLICT (auction_id, user_id) DO UPDATE SET kind = 'BIDDER'
+            """,
+            (auction_id, user_id),
+        )
+    else:
+        DB.execute(
+            "INSERT OR IGNORE INTO watchers (auction_id, user_id, kind) VALUES (?, ?, ?)",
+            (auction_id, user_id, kind),
+        )
+
+
+def unwatch(auction_id: int, user_id: int) -> int:
+    cur = DB.execute(
+        "DELETE FROM watchers WHERE auction_id = ? AND user_id = ?",
+        (auction_id, user_id),
+    )
+    return cur.rowcount
+
+
+# Does not commit
+def unwatch_all(user_id: int) -> int:
+    return DB.execute("DELETE FROM watchers WHERE user_id = ?", (user_id,)).rowcount
+
+
+def watchers_of(auction_id: int) -> List[Tuple[int, str]]:
+    return DB.execute(
+        "SELECT user_id, kind FROM watchers WHERE auction_id = ?",
+        (auction_id,),
+    ).fetchall()
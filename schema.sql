@@ -14,7 +14,11 @@ CREATE TABLE IF NOT EXISTS auctions (
     title TEXT,
     start_time INTEGER,
     photo_file_id TEXT,
-    owner_user_id INTEGER
+    owner_user_id INTEGER,
+    reply_anchor TEXT,
+    bid_count INTEGER DEFAULT 0,
+    bot_id INTEGER,
+    highest_bidder_name TEXT
 );
 -- Ensure config storage for binding
 CREATE TABLE IF NOT EXISTS settings (
@@ -26,3 +30,56 @@ CREATE TABLE IF NOT EXISTS bindings (
     channel_id INTEGER
 );
 CREATE UNIQUE INDEX IF NOT EXISTS auctions_channel_message_unique ON auctions(channel_id, channel_post_id);
+CREATE INDEX IF NOT EXISTS auctions_owner_status_end ON auctions(owner_user_id, status, end_time);
+-- auctions_fts (FTS5 over title/description), the data_changes counter and their triggers are created in db/connection.py,
+-- so a SQLite build without FTS5 still gets every other table
+-- Discussion-group message -> auction, so any reply in a comment thread resolves with one key lookup
+CREATE TABLE IF NOT EXISTS thread_index (
+    chat_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    auction_id INTEGER NOT NULL,
+    PRIMARY KEY (chat_id, message_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS thread_index_auction ON thread_index(auction_id);
+-- Durable queue of Telegram side effects, written in the same transaction as the auction change
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'PENDING',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at INTEGER NOT NULL,
+    last_error TEXT,
+    created_at INTEGER NOT NULL,
+    bot_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS outbox_status_next ON outbox(status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_dedupe ON outbox(dedupe_key);
+-- Private maximum (proxy) bids; never shown to anyone but their owner
+CREATE TABLE IF NOT EXISTS proxy_bids (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    auction_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    max_bid INTEGER NOT NULL,
+    display_name TEXT,
+    created_at INTEGER NOT NULL,
+    UNIQUE (auction_id, user_id)
+);
+-- Users who get DM updates for an auction; kind is 'BIDDER' (auto) or 'WATCH' (/watch)
+CREATE TABLE IF NOT EXISTS watchers (
+    auction_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    PRIMARY KEY (auction_id, user_id)
+);
+-- Per-channel counters maintained by delta in the same transaction as auction writes
+CREATE TABLE IF NOT EXISTS channel_stats (
+    channel_id INTEGER PRIMARY KEY,
+    lots_total INTEGER NOT NULL DEFAULT 0,
+    active_lots INTEGER NOT NULL DEFAULT 0,
+    total_bids INTEGER NOT NULL DEFAULT 0,
+    ended_lots INTEGER NOT NULL DEFAULT 0,
+    reserve_met_lots INTEGER NOT NULL DEFAULT 0,
+    gmv INTEGER NOT NULL DEFAULT 0
+);
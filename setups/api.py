@@ -0,0 +1,158 @@
+import asyncio
+import json
+import re
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qs, urlsplit
+from config.settings import logger, API_HOST, API_PORT, API_LONGPOLL_MAX
+from db.auctions import AUCTIONS, LiveAuction
+from utils.live_state import LiveState
+
+LIVE = LiveState()
+_loaded = False
+
+_ROUTES = (
+    (re.compile(r"^/channels/(-?\d+)/auctions$"), "channel"),
+    (re.compile(r"^/auctions/(\d+)$"), "auction"),
+)
+_STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _public(a: LiveAuction) -> dict:
+    return {
+        "auction_id": a.auction_id,
+        "channel_id": a.channel_id,
+        "channel_post_id": a.channel_post_id,
+        "title": a.title,
+        "sb": a.sb,
+        "rp": a.rp,
+        "min_inc": a.min_inc,
+        "highest_bid": a.highest_bid,
+        "highest_bidder_name": a.highest_bidder_name if a.highest_bidder is not None else None,
+        "next_min_bid": a.sb if not a.highest_bid else a.highest_bid + a.min_inc,
+        "end_time": a.end_time,
+        "status": a.status,
+    }
+
+
+# Call after committing a change to these auctions
+def refresh(auction_ids: Iterable[int]):
+    if not API_PORT:
+        return
+    try:
+        put_many(AUCTIONS.get_many(auction_ids).values())
+    except Exception as e:
+        logger.warning("api: live state refresh failed: %s", e)
+
+
+def put_many(auctions: Iterable[LiveAuction]):
+    if not API_PORT:
+        return
+    for a in auctions:
+        if a.status in ("LIVE", "ENDED"):
+            LIVE.put(_public(a))
+
+
+# `live` is every live auction; read from the DB when not given
+def load(live: Optional[List[LiveAuction]] = None):
+    global _loaded
+    put_many(AUCTIONS.live() if live is None else live)
+    _loaded = True
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+def _response(status: int, body: bytes = b"", etag: Optional[str] = None) -> bytes:
+    head = [
+        f"HTTP/1.1 {status} {_STATUS_TEXT[status]}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Cache-Control: no-cache",
+        "Connection: close",
+    ]
+    if etag:
+        head.append(f"ETag: {etag}")
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+
+def _error(status: int, message: str) -> bytes:
+    return _response(status, json.dumps({"error": message}).encode())
+
+
+# GET /channels/<channel_id>/auctions and GET /auctions/<auction_id>.
+# ?since=<version> long-polls up to ?timeout= seconds (capped at
+# API_LONGPOLL_MAX) for a newer version, answering 304 if none arrives.
+async def _handle(method: str, target: str, headers: dict) -> bytes:
+    if method not in ("GET", "HEAD"):
+        return _error(405, "method not allowed")
+    url = urlsplit(target)
+    for pattern, kind in _ROUTES:
+        m = pattern.match(url.path)
+        if m:
+            break
+    else:
+        return _error(404, "not found")
+
+    key = int(m.group(1))
+    if kind == "channel":
+        version_of, body_of = (lambda: LIVE.channel_version(key)), (lambda: LIVE.channel_body(key))
+    else:
+        version_of, body_of = (lambda: LIVE.auction_version(key)), (lambda: LIVE.auction_body(key))
+
+    query = parse_qs(url.query)
+    try:
+        since = int(query["since"][0]) if "since" in query else None
+        timeout = min(float(query.get("timeout", [API_LONGPOLL_MAX])[0]), API_LONGPOLL_MAX)
+    except ValueError:
+        return _error(400, "since and timeout must be numbers")
+
+    if since is not None and not await LIVE.wait_past(version_of, since, max(timeout, 0)):
+        return _response(304, etag=f'"{version_of() or 0}"')
+
+    found = body_of()
+    if found is None:
+        return _error(404, f"{kind} not found")
+    version, body = found
+    etag = f'"{version}"'
+    if headers.get("if-none-match") == etag:
+        return _response(304, etag=etag)
+    return _response(200, body, etag)
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        try:
+            method, target, headers = await _read_request(reader)
+        except (ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            writer.write(_error(400, "bad request"))
+        else:
+            response = await _handle(method, target, headers)
+            if method == "HEAD":
+                # Same headers as GET, Content-Length included; no payload
+                response = response[: response.index(b"\r\n\r\n") + 4]
+            writer.write(response)
+        await writer.drain()
+    except Exception as e:
+        logger.debug("api: request failed: %s", e)
+    finally:
+        writer.close()
+
+
+async def start_api() -> Optional[asyncio.AbstractServer]:
+    if not API_PORT:
+        return None
+    # A standby taking over has kept the state current already
+    if not _loaded:
+        load()
+    server = await asyncio.start_server(_serve, API_HOST, API_PORT)
+    logger.info("api: serving live auction state on http://%s:%s (%d lots)", API_HOST, API_PORT, len(LIVE))
+    return server
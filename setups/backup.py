@@ -0,0 +1,69 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from config.settings import logger, SG_TZ, BACKUP_DIR, BACKUP_KEEP, BACKUP_PAGES, BACKUP_STEP_PAUSE
+from db import backup
+from db.connection import DB
+from utils.time import now
+
+# Outcome of the most recent run in this process, for /backup
+LAST: Dict[str, object] = {}
+_lock = asyncio.Lock()
+
+
+def _db_path(conn) -> str:
+    row = conn.execute("PRAGMA database_list").fetchone()
+    return row[2] if row else ""
+
+
+def _backup_file(src_path: str, stem: str, stamp: str) -> dict:
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    path = os.path.join(BACKUP_DIR, f"{stem}-{stamp}.db.gz")
+    partial = os.path.join(BACKUP_DIR, f"{stem}-{stamp}.db.partial")
+    started = time.monotonic()
+    try:
+        steps = backup.snapshot(src_path, partial, BACKUP_PAGES, BACKUP_STEP_PAUSE)
+        check = backup.verify(partial)
+        if check != "ok":
+            raise RuntimeError(f"integrity_check: {check}")
+        backup.compress(partial, path)
+    except Exception:
+        for leftover in (partial, path + ".partial"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+    rotated = backup.rotate(BACKUP_DIR, stem, BACKUP_KEEP)
+    return {
+        "file": os.path.basename(path),
+        "bytes": os.path.getsize(path),
+        "steps": steps,
+        "seconds": time.monotonic() - started,
+        "rotated": rotated,
+    }
+
+
+# Snapshots the DB off the event loop
+async def run_backup() -> Optional[Dict[str, object]]:
+    if _lock.locked():
+        logger.info("backup: previous run still in progress, skipping")
+        return None
+    async with _lock:
+        stamp = datetime.fromtimestamp(now(), tz=SG_TZ).strftime("%Y%m%d-%H%M%S")
+        started = time.monotonic()
+        files: List[dict] = []
+        errors: List[str] = []
+        src_path = _db_path(DB)
+        if src_path:
+            stem = os.path.splitext(os.path.basename(src_path))[0]
+            try:
+                files.append(await asyncio.to_thread(_backup_file, src_path, stem, stamp))
+            except Exception as e:
+                logger.warning("backup: failed db=%s error=%s", src_path, e)
+                errors.append(f"{stem}: {e}")
+
+        LAST.clear()
+        LAST.update(finished_at=now(), seconds=time.monotonic() - started, files=files, errors=errors)
+        logger.info("backup: %d file(s), %d error(s) in %.1fs", len(files), len(errors), LAST["seconds"])
+        return dict(LAST)
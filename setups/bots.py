@@ -0,0 +1,36 @@
+from typing import Dict, List, Optional
+from telegram import Bot
+from telegram.ext import Application
+
+# Every Application served by this process, keyed by bot id. They share the
+# DB layer, scheduler, outbox and caches; only polling is per bot.
+APPS: Dict[int, Application] = {}
+_primary: Optional[int] = None
+
+
+def bot_id_from_token(token: str) -> int:
+    return int(token.split(":", 1)[0])
+
+
+def register(bot_id: int, app: Application):
+    global _primary
+    APPS[bot_id] = app
+    if _primary is None:
+        _primary = bot_id
+
+
+def primary_id() -> Optional[int]:
+    return _primary
+
+
+def all_apps() -> List[Application]:
+    return list(APPS.values())
+
+
+# Auctions and outbox rows from before multi-bot support carry no bot id: they belong to the primary
+def owner_id(bot_id: Optional[int]) -> Optional[int]:
+    return bot_id if bot_id in APPS else _primary
+
+
+def bot_for(bot_id: Optional[int]) -> Bot:
+    return APPS[owner_id(bot_id)].bot
@@ -0,0 +1,72 @@
+from typing import Dict, List, Optional, Tuple
+from config.settings import logger, COUNTDOWN_MARKS, COUNTDOWN_EDITS_PER_TICK
+from db.connection import DB
+from db.auctions import AUCTIONS, LiveAuction
+from db.outbox import enqueue, caption_key
+from setups.bots import owner_id
+from utils.captions import bid_caption, live_caption
+from utils.countdown import mark_for
+from utils.time import now
+
+# Mark each live lot's caption currently shows. A lot seen for the first time
+# starts at None (no line), so entering the window is owed an edit like any
+# later mark change: a caption rendered earlier may not carry the line yet.
+_shown: Dict[int, Optional[int]] = {}
+
+
+def _caption(a: LiveAuction) -> str:
+    if a.highest_bidder is not None:
+        return bid_caption(
+            a.title, a.description, a.sb, a.rp, a.min_inc, a.anti_snipe, a.highest_bid,
+            a.highest_bidder, a.highest_bidder_name or "User", a.end_time, a.auction_id,
+        )
+    return live_caption(a.title, a.description, a.sb, a.rp, a.min_inc, a.end_time, a.anti_snipe, a.auction_id)
+
+
+# One pass: lots whose mark changed since the last edit are re-captioned,
+# nearest-to-closing first, up to COUNTDOWN_EDITS_PER_TICK. The rest stay
+# owed for the next tick. Lots at or past end_time are left to
+# check_auctions, whose ended caption supersedes any edit still pending here.
+async def tick_countdowns():
+    ts = now()
+    live = set()
+    owed: List[Tuple[int, int]] = []
+
+    for a in AUCTIONS.live_ending(ts, ts + COUNTDOWN_MARKS[0]):
+        live.add(a.auction_id)
+        mark = mark_for(a.end_time - ts, COUNTDOWN_MARKS)
+        if _shown.setdefault(a.auction_id, None) != mark:
+            owed.append((a.end_time, a.auction_id))
+
+    owed.sort()
+    due = [auction_id for _, auction_id in owed[:COUNTDOWN_EDITS_PER_TICK]]
+
+    edited = 0
+    if due:
+        shown = {}
+        try:
+            for a in AUCTIONS.get_many(due).values():
+                if a.status != "LIVE" or a.end_time <= ts:
+                    continue
+                enqueue(
+                    "edit_message_caption",
+                    bot_id=owner_id(a.bot_id),
+                    dedupe_key=caption_key(a.channel_id, a.channel_post_id),
+                    chat_id=a.channel_id,
+                    message_id=a.channel_post_id,
+                    caption=_caption(a),
+                    parse_mode="HTML",
+                )
+                shown[a.auction_id] = mark_for(a.end_time - ts, COUNTDOWN_MARKS)
+            DB.commit()
+            _shown.update(shown)
+            edited = len(shown)
+        except Exception as e:
+            logger.warning("countdown: caption refresh failed error=%s", e)
+            DB.rollback()
+
+    for auction_id in list(_shown):
+        if auction_id not in live:
+            del _shown[auction_id]
+    if owed:
+        logger.info("countdown: %d caption(s) refreshed, %d deferred", edited, len(owed) - len(due))
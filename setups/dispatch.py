@@ -0,0 +1,77 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Hashable, List, Tuple
+from telegram import Update
+from telegram.constants import ChatType
+from telegram.ext import BaseUpdateProcessor
+from config.settings import UPDATE_CONCURRENCY, UPDATE_MAX_PENDING
+
+
+# Updates that touch the same thing share a key: a channel post's discussion
+# thread (its auto-forward and every bid under it), or one user's private chat.
+# Anything else gets a key of its own and is not ordered against other updates.
+def update_key(update: object) -> Hashable:
+    if not isinstance(update, Update):
+        return ("other", id(update))
+    msg, chat = update.effective_message, update.effective_chat
+    if chat and chat.type == ChatType.PRIVATE:
+        return ("user", chat.id)
+    if msg and chat:
+        if msg.is_automatic_forward:
+            return ("thread", chat.id, msg.message_id)
+        if msg.message_thread_id:
+            return ("thread", chat.id, msg.message_thread_id)
+        if msg.reply_to_message:
+            return ("thread", chat.id, msg.reply_to_message.message_id)
+        return ("chat", chat.id)
+    return ("update", update.update_id)
+
+
+# Runs updates with the same key one at a time in arrival order and unrelated
+# keys in parallel, at most `concurrency` handlers at once. PTB's own semaphore
+# (max_pending) only bounds how many updates may be waiting in total; the
+# running cap is taken after the key's turn comes up, so a busy key never ties
+# up slots other keys could use.
+class KeyedUpdateProcessor(BaseUpdateProcessor):
+    def __init__(self, concurrency: int, max_pending: int):
+        super().__init__(max(max_pending, concurrency))
+        self.concurrency = concurrency
+        self._running = asyncio.Semaphore(concurrency)
+        self._keys: Dict[Hashable, Tuple[asyncio.Lock, List[int]]] = {}
+        self.counters = {"processed": 0, "running": 0, "peak_running": 0, "deepest": 0}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]):
+        key = update_key(update)
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = self._keys[key] = (asyncio.Lock(), [0])
+        lock, depth = entry
+        depth[0] += 1
+        self.counters["deepest"] = max(self.counters["deepest"], depth[0])
+        try:
+            async with lock, self._running:
+                self.counters["running"] += 1
+                self.counters["peak_running"] = max(self.counters["peak_running"], self.counters["running"])
+                try:
+                    await coroutine
+                finally:
+                    self.counters["running"] -= 1
+                    self.counters["processed"] += 1
+        finally:
+            depth[0] -= 1
+            if not depth[0]:
+                del self._keys[key]
+
+    # Keys with the most updates queued or running, deepest first
+    def busiest(self, limit: int = 5) -> List[Tuple[Hashable, int]]:
+        depths = sorted(((key, depth[0]) for key, (_, depth) in self._keys.items()), key=lambda kv: -kv[1])
+        return depths[:limit]
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+# Shared by every Application, so the cap holds across all bots in the process
+DISPATCH = KeyedUpdateProcessor(UPDATE_CONCURRENCY, UPDATE_MAX_PENDING)
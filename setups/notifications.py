@@ -0,0 +1,73 @@
+from config.settings import logger, NOTIFY_MAX_PER_FLUSH, NOTIFY_ENDING_SOON
+from db.connection import DB
+from db.outbox import enqueue
+from db.watchers import watchers_of
+from setups.bots import owner_id
+from utils.captions import fmt_time
+from utils.notifications import NotificationQueue
+from utils.time import now
+
+NOTIFY = NotificationQueue()
+_ending_sent = set()
+
+
+# DMs come from the auction's own bot, so recipients are (bot_id, user_id)
+def notify_price_change(auction_id: int, title: str, bid: int, holder: int, bot_id: int):
+    NOTIFY.discard((bot_id, holder), auction_id, "outbid")
+    for user_id, kind in watchers_of(auction_id):
+        if user_id == holder:
+            continue
+        if kind == "BIDDER":
+            line = f"📉 Outbid on <b>{title}</b> (#{auction_id}) — current bid <b>{bid}</b>"
+        else:
+            line = f"🔔 New bid on <b>{title}</b> (#{auction_id}) — current bid <b>{bid}</b>"
+        NOTIFY.push((bot_id, user_id), auction_id, "outbid", line)
+
+
+def _queue_ending_soon():
+    global _ending_sent
+    rows = DB.execute(
+        """
+        SELECT auction_id, title, highest_bid, highest_bidder, end_time, bot_id
+        FROM auctions
+        WHERE status = 'LIVE' AND end_time <= ?
+        """,
+        (now() + NOTIFY_ENDING_SOON,),
+    ).fetchall()
+
+    for auction_id, title, bid, holder, end_time, bot_id in rows:
+        if auction_id in _ending_sent:
+            continue
+        for user_id, _kind in watchers_of(auction_id):
+            status = "you're leading" if user_id == holder else f"current bid <b>{bid}</b>"
+            NOTIFY.push(
+                (owner_id(bot_id), user_id),
+                auction_id,
+                "ending",
+                f"⏳ <b>{title}</b> (#{auction_id}) ends at {fmt_time(end_time)} — {status}",
+            )
+    # Auctions that closed or were extended out of the window drop out of the set
+    _ending_sent = {row[0] for row in rows}
+
+
+async def flush_notifications():
+    try:
+        _queue_ending_soon()
+    except Exception as e:
+        logger.warning("notifications: ending-soon scan failed: %s", e)
+
+    batch = NOTIFY.pop_batch(NOTIFY_MAX_PER_FLUSH)
+    if not batch:
+        return
+
+    for (bot_id, user_id), lines in batch:
+        enqueue(
+            "send_message",
+            bot_id=bot_id,
+            chat_id=user_id,
+            text="🔔 <b>Auction updates</b>\n\n" + "\n".join(lines),
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
+    DB.commit()
+    logger.info("notifications: queued %d DMs, %d recipients waiting", len(batch), len(NOTIFY))
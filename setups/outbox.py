@@ -0,0 +1,177 @@
+import asyncio
+import json
+from typing import Dict, List, Optional
+from telegram.error import BadRequest, Forbidden, RetryAfter
+from config.settings import (
+    logger,
+    OUTBOX_POLL_SECONDS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BASE_DELAY,
+    OUTBOX_MAX_DELAY,
+    OUTBOX_CONCURRENCY,
+    OUTBOX_DEAD_RETENTION,
+)
+from db.connection import DB
+from db.watchers import unwatch_all
+from setups.bots import bot_for, owner_id
+from utils.time import now
+
+
+def _retry_after_seconds(e: RetryAfter) -> float:
+    delay = e.retry_after
+    if hasattr(delay, "total_seconds"):
+        delay = delay.total_seconds()
+    return float(delay)
+
+
+def _mark_sent(out_id: int):
+    DB.execute("DELETE FROM outbox WHERE id = ?", (out_id,))
+    DB.commit()
+
+
+# A dead row's next_attempt_at records when it died, for prune_outbox
+def _mark_dead(out_id: int, attempts: int, error: str):
+    DB.execute(
+        """
+        UPDATE outbox SET status = 'DEAD', attempts = ?, last_error = ?, next_attempt_at = ?
+        WHERE id = ? AND status = 'PENDING'
+        """,
+        (attempts, error, now(), out_id),
+    )
+    DB.commit()
+
+
+# A DM recipient who blocked the bot (or never started it) cannot be reached:
+# drop the row rather than dead-letter it, and stop watching on their behalf
+def _drop_unreachable(out_id: int, user_id: int) -> int:
+    _mark_sent(out_id)
+    removed = unwatch_all(user_id)
+    DB.commit()
+    return removed
+
+
+def _reschedule(out_id: int, attempts: int, error: str, delay: Optional[float] = None):
+    if attempts >= OUTBOX_MAX_ATTEMPTS:
+        _mark_dead(out_id, attempts, error)
+        logger.warning("outbox: dead-lettered id=%s attempts=%s error=%s", out_id, attempts, error)
+        return
+    if delay is None:
+        delay = min(OUTBOX_BASE_DELAY * (2 ** (attempts - 1)), OUTBOX_MAX_DELAY)
+    DB.execute(
+        """
+        UPDATE outbox SET attempts = ?, last_error = ?, next_attempt_at = ?
+        WHERE id = ? AND status = 'PENDING'
+        """,
+        (attempts, error, now() + int(delay), out_id),
+    )
+    DB.commit()
+
+
+# Rows for one chat go out one at a time in id order; different chats are
+# delivered concurrently, at most OUTBOX_CONCURRENCY calls in flight.
+async def drain_outbox() -> int:
+    rows = DB.execute(
+        """
+        SELECT id, bot_id, method, payload, attempts
+        FROM outbox
+        WHERE status = 'PENDING' AND next_attempt_at <= ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (now(), OUTBOX_BATCH_SIZE),
+    ).fetchall()
+
+    lanes: Dict[tuple, List[tuple]] = {}
+    for out_id, bot_id, method, payload, attempts in rows:
+        kwargs = json.loads(payload)
+        chat = kwargs.get("chat_id", ("row", out_id))
+        lanes.setdefault((owner_id(bot_id), chat), []).append((out_id, bot_id, method, kwargs, attempts + 1))
+
+    if lanes:
+        slots = asyncio.Semaphore(OUTBOX_CONCURRENCY)
+        await asyncio.gather(*(_drain_lane(lane, slots) for lane in lanes.values()))
+    return len(rows)
+
+
+async def _drain_lane(rows: List[tuple], slots: asyncio.Semaphore):
+    for i, (out_id, bot_id, method, kwargs, attempts) in enumerate(rows):
+        async with slots:
+            delay = await _deliver(out_id, bot_id, method, kwargs, attempts)
+        if delay is not None:
+            # This chat is rate limited: the rest of its rows wait out the
+            # same delay, keeping their order, while other chats carry on
+            _defer([row[0] for row in rows[i + 1:]], delay)
+            return
+
+
+def _defer(out_ids: List[int], delay: float):
+    if not out_ids:
+        return
+    DB.executemany(
+        "UPDATE outbox SET next_attempt_at = ? WHERE id = ? AND status = 'PENDING'",
+        [(now() + int(delay), out_id) for out_id in out_ids],
+    )
+    DB.commit()
+
+
+# Returns the Retry-After delay when Telegram flood-limited the call, else None
+async def _deliver(out_id: int, bot_id: Optional[int], method: str, kwargs: dict, attempts: int) -> Optional[float]:
+    call = getattr(bot_for(bot_id), method, None)
+    if call is None:
+        _mark_dead(out_id, attempts, f"unknown method {method}")
+        logger.error("outbox: unknown method id=%s method=%s", out_id, method)
+        return None
+
+    try:
+        await call(**kwargs)
+    except RetryAfter as e:
+        delay = _retry_after_seconds(e)
+        _reschedule(out_id, attempts, str(e), delay)
+        logger.warning("outbox: flood limited id=%s chat=%s retry_after=%s", out_id, kwargs.get("chat_id"), delay)
+        return delay
+    except BadRequest as e:
+        if "not modified" in str(e).lower():
+            _mark_sent(out_id)
+        else:
+            _mark_dead(out_id, attempts, str(e))
+            logger.warning("outbox: rejected id=%s method=%s error=%s", out_id, method, e)
+    except Forbidden as e:
+        chat_id = kwargs.get("chat_id")
+        if method == "send_message" and isinstance(chat_id, int) and chat_id > 0:
+            removed = _drop_unreachable(out_id, chat_id)
+            logger.info("outbox: user unreachable id=%s user=%s unwatched=%s error=%s", out_id, chat_id, removed, e)
+        else:
+            _mark_dead(out_id, attempts, str(e))
+            logger.warning("outbox: forbidden id=%s method=%s error=%s", out_id, method, e)
+    except Exception as e:
+        _reschedule(out_id, attempts, str(e))
+        logger.info("outbox: delivery failed id=%s method=%s attempt=%s error=%s", out_id, method, attempts, e)
+    else:
+        _mark_sent(out_id)
+    return None
+
+
+# Dead-lettered rows stay OUTBOX_DEAD_RETENTION seconds for /outbox to show
+# and retry, then go
+async def prune_outbox() -> int:
+    removed = DB.execute(
+        "DELETE FROM outbox WHERE status = 'DEAD' AND next_attempt_at < ?",
+        (now() - OUTBOX_DEAD_RETENTION,),
+    ).rowcount
+    DB.commit()
+    if removed:
+        logger.info("outbox: pruned %s dead row(s)", removed)
+    return removed
+
+
+async def run_outbox():
+    logger.info("Outbox drainer started")
+    while True:
+        try:
+            processed = await drain_outbox()
+        except Exception as e:
+            logger.exception("outbox: drain failed: %s", e)
+            processed = 0
+        if processed < OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(OUTBOX_POLL_SECONDS)
@@ -1,75 +1,163 @@
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from config.settings import logger, DEFAULT_CHANNEL_ID, SG_TZ
+from config.settings import (
+    logger, DEFAULT_CHANNEL_ID, NOTIFY_WINDOW, PROFILE_ON_START, PROFILE_DIR, COUNTDOWN_ENABLED, COUNTDOWN_TICK,
+    BACKUP_INTERVAL,
+)
 from controllers.check_auctions import check_auctions
+from controllers.bid import BATCHER
+from controllers.new_auction import sweep_posting
+from setups.outbox import run_outbox, prune_outbox
+from setups.notifications import flush_notifications
+from setups import api
+from setups.countdown import tick_countdowns
+from setups.backup import run_backup
+from setups.bots import bot_for
 from db.connection import DB
-from datetime import datetime
+from db.auctions import AUCTIONS
+from db import channel_stats
+import asyncio
+import time
 from utils.time import now
+from utils.jobs import JobScheduler
+from utils.captions import live_caption
+from utils.profiler import run_profile
+from utils import startup
 
-async def publish_scheduled(app, a_id: int):
-    row = DB.execute(
-        """
-        SELECT title, description, sb, rp, min_inc, end_time, anti_snipe, channel_id, photo_file_id
-        FROM auctions
-        WHERE auction_id = ? AND status = 'SCHEDULED'
-        """,
-        (a_id,),
-    ).fetchone()
-    if not row:
-        return
+# Posts each still-scheduled auction and records it LIVE as soon as its post
+# exists, so a failure later in the batch cannot leave a sent post unrecorded
+# (and re-sent as a duplicate lot on the next run)
+async def publish_scheduled(*auction_ids: int):
+    for a in AUCTIONS.get_scheduled_many(auction_ids):
+        caption = live_caption(a.title, a.description, a.sb, a.rp, a.min_inc, a.end_time, a.anti_snipe, a.auction_id)
+        try:
+            sent = await bot_for(a.bot_id).send_photo(
+                chat_id=a.channel_id, photo=a.photo_file_id, caption=caption, parse_mode="HTML"
+            )
+        except Exception as e:
+            logger.warning("publish_scheduled: send failed auction_id=%s error=%s", a.auction_id, e)
+            continue
+        AUCTIONS.publish_many([(a.auction_id, sent.message_id)])
+        channel_stats.bump(a.channel_id, lots_total=1, active_lots=1)
+        DB.commit()
+        api.refresh((a.auction_id,))
 
-    title, description, sb, rp, min_inc, end_time, anti, chan_id, photo_id = row
-    caption = (
-        f"🛒 <b>{title}</b>\n\n"
-        f"{description}\n\n"
-        f"💰 SB: {sb}\n"
-        f"🏷 RP: {rp}\n"
-        f"➕ Min Inc: {min_inc}\n"
-        f"⏱ Ends: <b>{datetime.fromtimestamp(end_time, tz=SG_TZ).strftime('%Y-%m-%d %H:%M')}</b>\n"
-        f"🛡 Anti-snipe: {anti} min\n\n"
-        f"💬 Comment with a number to bid (or 'SB')"
-    )
-    sent = await app.bot.send_photo(chat_id=chan_id, photo=photo_id, caption=caption, parse_mode="HTML")
-    DB.execute("UPDATE auctions SET channel_post_id = ?, status = 'LIVE' WHERE auction_id = ?", (sent.message_id, a_id))
-    DB.commit()
+# Every periodic job. Each decides what is due from utils.time.now(), so a
+# scheduler stepped on a VirtualClock drives them exactly as production does.
+def add_periodic_jobs(scheduler: JobScheduler):
+    # First pass right away: after a restart or failover, overdue lots close now
+    scheduler.every(15, check_auctions, first_run=now())
+    scheduler.every(NOTIFY_WINDOW, flush_notifications)
+    if COUNTDOWN_ENABLED:
+        scheduler.every(COUNTDOWN_TICK, tick_countdowns)
+    if BACKUP_INTERVAL > 0:
+        scheduler.every(BACKUP_INTERVAL, run_backup)
+    scheduler.every(3600, prune_outbox)
 
-async def on_startup(app):
-    scheduler = AsyncIOScheduler()
-    scheduler.add_job(check_auctions, "interval", seconds=15, args=[app])
+def schedule_publish(scheduler: JobScheduler, auction_id: int, start_time: int):
+    scheduler.at(start_time, publish_scheduled, auction_id, job_id=f"publish_{auction_id}")
+
+async def _profile_startup(seconds: float):
+    try:
+        result = await run_profile(seconds, "sample", PROFILE_DIR)
+        logger.info("Startup profile written: %s\n%s", result.files, result.report)
+    except Exception as e:
+        logger.warning("Startup profile failed: %s", e)
+
+# Runs once per process, however many bots it serves: one scheduler, one
+# check_auctions poll and one outbox drainer shared by every Application.
+# Only what handlers need is done before polling starts; stats backfill, the
+# API and scheduled-auction rehydration follow in the background.
+async def on_startup(apps):
+    started = time.perf_counter()
+    primary = apps[0]
+    if PROFILE_ON_START > 0:
+        primary.bot_data["profile_task"] = asyncio.get_running_loop().create_task(_profile_startup(PROFILE_ON_START))
+
+    scheduler = JobScheduler()
+    add_periodic_jobs(scheduler)
     scheduler.start()
-    app.bot_data["scheduler"] = scheduler
+    for app in apps:
+        app.bot_data["scheduler"] = scheduler
+    primary.bot_data["outbox_task"] = asyncio.get_running_loop().create_task(run_outbox())
     try:
         row = DB.execute("SELECT value FROM settings WHERE key = 'channel_id'").fetchone()
+        channel_id = int(row[0]) if row else DEFAULT_CHANNEL_ID
         if row:
-            app.bot_data["channel_id"] = int(row[0])
-            logger.info("Channel bound: %s", app.bot_data["channel_id"])
+            logger.info("Channel bound: %s", channel_id)
         elif DEFAULT_CHANNEL_ID:
-            app.bot_data["channel_id"] = DEFAULT_CHANNEL_ID
             logger.info("Default CHANNEL_ID used: %s", DEFAULT_CHANNEL_ID)
         else:
             logger.info("No channel bound. Use /bind in private chat.")
+        if channel_id:
+            for app in apps:
+                app.bot_data["channel_id"] = channel_id
     except Exception as e:
         logger.warning("Failed to load channel_id: %s", e)
 
+    primary.bot_data["warm_up_task"] = asyncio.get_running_loop().create_task(_warm_up(primary, scheduler))
+    startup.record("scheduler", time.perf_counter() - started)
+    logger.info("Scheduler started")
+
+async def _warm_up(primary, scheduler):
+    started = time.perf_counter()
+    try:
+        primary.bot_data["api_server"] = await api.start_api()
+    except Exception as e:
+        logger.warning("Failed to start the live state API: %s", e)
+
+    # Backfill per-channel stats the first time they exist
+    try:
+        if DB.execute("SELECT 1 FROM channel_stats LIMIT 1").fetchone() is None:
+            channel_stats.rebuild()
+            logger.info("Channel stats backfilled")
+    except Exception as e:
+        logger.warning("Failed to backfill channel stats: %s", e)
+
+    # Auctions whose post was never confirmed
+    try:
+        swept = sweep_posting()
+        if swept:
+            logger.warning("Discarded %d auction(s) left POSTING by an unconfirmed post", swept)
+    except Exception as e:
+        logger.warning("Failed to sweep POSTING auctions: %s", e)
+
     # Rehydrate scheduled auctions
     try:
-        rows = DB.execute(
-            "SELECT auction_id, start_time FROM auctions WHERE status = 'SCHEDULED'"
-        ).fetchall()
-        for a_id, start_ts in rows:
-            run_dt = datetime.fromtimestamp(int(start_ts), tz=SG_TZ)
-            if int(start_ts) > now():
-                scheduler.add_job(
-                    publish_scheduled,
-                    "date",
-                    run_date=run_dt,
-                    args=[app, a_id],
-                    id=f"publish_{a_id}",
-                    replace_existing=True,
-                )
+        rows = AUCTIONS.scheduled()
+        overdue = []
+        for a in rows:
+            if int(a.start_time) > now():
+                schedule_publish(scheduler, a.auction_id, int(a.start_time))
             else:
-                await publish_scheduled(app, a_id)
+                overdue.append(a.auction_id)
+        if overdue:
+            await publish_scheduled(*overdue)
         logger.info("Rehydrated %d scheduled auctions", len(rows))
     except Exception as e:
         logger.warning("Failed to rehydrate scheduled auctions: %s", e)
 
-    logger.info("Scheduler started")
\ No newline at end of file
+    startup.record("rehydration", time.perf_counter() - started)
+    logger.info("Startup: %s", startup.report())
+
+async def on_shutdown(apps):
+    primary = apps[0]
+    warm_up = primary.bot_data.get("warm_up_task")
+    if warm_up and not warm_up.done():
+        warm_up.cancel()
+        try:
+            await warm_up
+        except asyncio.CancelledError:
+            pass
+    await BATCHER.drain()
+    task = primary.bot_data.get("outbox_task")
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    scheduler = primary.bot_data.get("scheduler")
+    if scheduler:
+        scheduler.shutdown()
+    server = primary.bot_data.get("api_server")
+    if server:
+        server.close()
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import socket
+import uuid
+from typing import Optional, Set
+from config.settings import logger, LEASE_TTL, LEASE_RENEW, STANDBY_POLL
+from db.connection import DB
+from db.auctions import AUCTIONS
+from db import channel_stats
+from setups import api
+from utils.time import now
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+# Taken when free, expired, or already ours; one statement, so two instances
+# racing for it cannot both win.
+_ACQUIRE = """
+    INSERT INTO settings (key, value) VALUES ('lease', json_object('holder', ?, 'expires', ?))
+    ON CONFLICT (key) DO UPDATE SET value = excluded.value
+    WHERE json_extract(settings.value, '$.holder') = ? OR json_extract(settings.value, '$.expires') <= ?
+"""
+_RELEASE = """
+    UPDATE settings SET value = json_object('holder', ?, 'expires', 0)
+    WHERE key = 'lease' AND json_extract(value, '$.holder') = ?
+"""
+
+_version: Optional[int] = None
+_live: Set[int] = set()
+
+
+def try_acquire() -> bool:
+    ts = now()
+    cur = DB.execute(_ACQUIRE, (INSTANCE_ID, ts + LEASE_TTL, INSTANCE_ID, ts))
+    DB.commit()
+    return cur.rowcount > 0
+
+
+def holder() -> Optional[str]:
+    row = DB.execute("SELECT json_extract(value, '$.holder') FROM settings WHERE key = 'lease'").fetchone()
+    return row[0] if row else None
+
+
+# Lets a standby take over at once on a clean shutdown instead of waiting out the TTL
+def release():
+    try:
+        DB.execute(_RELEASE, (INSTANCE_ID, INSTANCE_ID))
+        DB.commit()
+    except Exception as e:
+        logger.warning("standby: lease release failed: %s", e)
+
+
+# Follows the active instance's writes: the data_changes counter moves with
+# every auction or channel_stats write (but not with lease renewals), and only
+# then are the caches reloaded.
+def _warm():
+    global _version, _live
+    version = DB.execute("SELECT n FROM data_changes WHERE id = 1").fetchone()[0]
+    if version == _version:
+        return
+    _version = version
+
+    channel_stats.invalidate()
+    live = AUCTIONS.live()
+    ids = {a.auction_id for a in live}
+    gone = _live - ids
+    api.load(live)
+    if gone:
+        api.put_many(AUCTIONS.get_many(gone).values())
+    _live = ids
+
+
+# Standby loop: keeps caches warm until this instance holds the lease.
+# Returns False if `stop` was set first.
+async def wait_for_lease(stop: asyncio.Event) -> bool:
+    logger.info("standby: %s waiting for the lease (held by %s)", INSTANCE_ID, holder())
+    while not stop.is_set():
+        try:
+            if try_acquire():
+                logger.info("standby: %s acquired the lease, taking over", INSTANCE_ID)
+                return True
+            _warm()
+        except Exception as e:
+            logger.warning("standby: poll failed: %s", e)
+        try:
+            await asyncio.wait_for(stop.wait(), STANDBY_POLL)
+        except asyncio.TimeoutError:
+            pass
+    return False
+
+
+# Active loop: renews every LEASE_RENEW seconds. If another instance holds the
+# lease, or renewals keep failing until it would have expired, this instance
+# stops so two never poll and close auctions at once.
+async def hold_lease(stop: asyncio.Event):
+    renewed = now()
+    while not stop.is_set():
+        await asyncio.sleep(LEASE_RENEW)
+        try:
+            if try_acquire():
+                renewed = now()
+                continue
+            logger.error("standby: lease taken over by %s, stopping", holder())
+        except Exception as e:
+            if now() < renewed + LEASE_TTL:
+                logger.warning("standby: lease renewal failed: %s", e)
+                continue
+            logger.error("standby: lease expired after failed renewals (%s), stopping", e)
+        stop.set()
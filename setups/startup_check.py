@@ -0,0 +1,50 @@
+import asyncio
+import json
+from typing import List, Optional
+from telegram.request import BaseRequest
+from utils.time import now
+
+
+# Stand-in for the Bot API used by `python bot.py --startup-check`: answers
+# getMe, hands out `updates` on the first getUpdates, then idles like a long
+# poll. Every other method succeeds with `true`.
+class OfflineRequest(BaseRequest):
+    def __init__(self, updates: Optional[List[dict]] = None):
+        self._updates = list(updates or [])
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **_timeouts):
+        endpoint = url.rsplit("/", 1)[-1]
+        if endpoint == "getMe":
+            token_id = int(url.rsplit("/", 2)[-2].removeprefix("bot").split(":", 1)[0])
+            result = {"id": token_id, "is_bot": True, "first_name": "Startup check", "username": "startup_check_bot"}
+        elif endpoint == "getUpdates":
+            result, self._updates = self._updates, []
+            if not result:
+                await asyncio.sleep(0.05)
+        else:
+            result = True
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+# A plain group message no handler acts on, so nothing goes out
+def first_update_payload() -> dict:
+    return {
+        "update_id": 1,
+        "message": {
+            "message_id": 1,
+            "date": now(),
+            "chat": {"id": -1, "type": "supergroup", "title": "startup check"},
+            "from": {"id": 1, "is_bot": False, "first_name": "check"},
+            "text": "startup check",
+        },
+    }
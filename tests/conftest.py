@@ -0,0 +1,87 @@
+import os
+import sys
+
+# Settings are read at import time; the suite runs on an in-memory DB with bids resolved inline
+os.environ.setdefault("SQLITE_DB_PATH", ":memory:")
+os.environ.setdefault("BID_BATCH_MS", "0")
+os.environ.setdefault("COUNTDOWN_ENABLED", "1")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from types import SimpleNamespace
+import pytest
+from utils.time import VirtualClock, get_clock, set_clock
+
+BOT_ID = 42
+
+
+# Stands in for telegram.Bot: records every call with the clock time it was
+# made at and answers sends with increasing message ids
+class FakeBot:
+    def __init__(self, bot_id: int):
+        self.id = bot_id
+        self.calls = []
+        self._message_id = 1000
+
+    def __getattr__(self, method):
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        async def call(**kwargs):
+            self.calls.append((get_clock().time(), method, kwargs))
+            self._message_id += 1
+            return SimpleNamespace(message_id=self._message_id, id=kwargs.get("chat_id"), first_name="Winner", username=None)
+
+        return call
+
+
+@pytest.fixture(scope="session")
+def bot():
+    from setups.bots import APPS, register
+    if BOT_ID not in APPS:
+        register(BOT_ID, SimpleNamespace(bot=FakeBot(BOT_ID), bot_data={}))
+    fake = APPS[BOT_ID].bot
+    fake.calls.clear()
+    return fake
+
+
+@pytest.fixture
+def clock():
+    previous = get_clock()
+    virtual = VirtualClock(1_800_000_000)
+    set_clock(virtual)
+    yield virtual
+    set_clock(previous)
+
+
+def _empty(conn):
+    for table in ("auctions", "proxy_bids", "watchers", "outbox", "thread_index", "channel_stats"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+
+
+# Every table the auction lifecycle writes to, empty before the test and again after it
+@pytest.fixture
+def db():
+    from db.connection import DB
+    _empty(DB)
+    yield DB
+    _empty(DB)
+
+
+# Inserts a LIVE lot in channel -100 owned by the fake bot; returns its auction_id
+@pytest.fixture
+def lot(db, bot):
+    def make(post_id, end_time, bid=0, bidder=None, name=None):
+        cur = db.execute(
+            """
+            INSERT INTO auctions (channel_id, channel_post_id, title, description, sb, rp, min_inc, end_time,
+                                  anti_snipe, highest_bid, highest_bidder, highest_bidder_name, status, bot_id)
+            VALUES (-100, ?, 'Lot', 'd', 10, 10, 1, ?, 0, ?, ?, ?, 'LIVE', ?)
+            """,
+            (post_id, end_time, bid, bidder, name, bot.id),
+        )
+        db.commit()
+        return cur.lastrowid
+
+    return make
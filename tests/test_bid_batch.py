@@ -0,0 +1,30 @@
+import asyncio
+from controllers import bid
+from controllers.bid import PendingBid, resolve_bids
+from utils.batching import KeyedBatcher
+
+
+def test_failed_batch_replies_to_every_bidder(db, bot, clock, monkeypatch):
+    def broken(_auction_id):
+        raise RuntimeError("disk I/O error")
+
+    monkeypatch.setattr(bid.AUCTIONS, "get", broken)
+    items = [PendingBid(-2001, mid, 5, "u5", 100, int(clock.time()), bot.id) for mid in (11, 12)]
+    asyncio.run(resolve_bids(1, items))
+
+    replies = [(kw["chat_id"], kw["reply_to_message_id"]) for _, method, kw in bot.calls if method == "send_message"]
+    assert replies == [(-2001, 11), (-2001, 12)]
+
+
+def test_batcher_survives_a_failing_flush():
+    async def flush(_key, _items):
+        raise RuntimeError("boom")
+
+    async def run():
+        batcher = KeyedBatcher(0, flush)
+        batcher.submit("a", 1)
+        await batcher.drain()
+        return batcher.counters
+
+    counters = asyncio.run(run())
+    assert counters["batches"] == 1 and counters["failed"] == 1
@@ -0,0 +1,30 @@
+import asyncio
+import json
+from controllers.check_auctions import check_auctions
+
+
+def _captions(db):
+    rows = db.execute("SELECT payload FROM outbox WHERE method = 'edit_message_caption' ORDER BY id").fetchall()
+    return {json.loads(p)["message_id"]: json.loads(p)["caption"] for (p,) in rows}
+
+
+def test_closes_with_stored_names_without_bot_api_calls(db, bot, clock, lot):
+    ended = int(clock.time()) - 1
+    lot(1, ended, 50, 501, "Alice")
+    lot(2, ended, 0, None, None)
+    asyncio.run(check_auctions())
+
+    assert {s for (s,) in db.execute("SELECT status FROM auctions")} == {"ENDED"}
+    assert not [c for c in bot.calls if c[1] == "get_chat"]
+    captions = _captions(db)
+    assert "tg://user?id=501'>Alice</a>" in captions[1]
+    assert "Reserve not met" in captions[2]
+
+
+def test_legacy_rows_without_a_name_are_looked_up_after_closing(db, bot, clock, lot):
+    lot(3, int(clock.time()) - 1, 50, 502, None)
+    asyncio.run(check_auctions())
+
+    assert db.execute("SELECT status FROM auctions").fetchone()[0] == "ENDED"
+    assert [kw["chat_id"] for _, method, kw in bot.calls if method == "get_chat"] == [502]
+    assert "Winner</a>" in _captions(db)[3]
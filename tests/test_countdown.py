@@ -0,0 +1,28 @@
+import asyncio
+import json
+from setups import countdown
+
+
+def _edited(db):
+    rows = db.execute("SELECT payload FROM outbox WHERE method = 'edit_message_caption'").fetchall()
+    return sorted(json.loads(p)["message_id"] for (p,) in rows)
+
+
+def test_lot_entering_the_window_is_edited_once_per_mark(db, bot, clock, lot):
+    countdown._shown.clear()
+    # Posted with a day to go, before any mark applied to its caption
+    lot(1, int(clock.time()) + 3000)
+    asyncio.run(countdown.tick_countdowns())
+    assert _edited(db) == [1]
+
+    # Same mark on the next tick: nothing owed
+    db.execute("DELETE FROM outbox")
+    db.commit()
+    clock.advance(30)
+    asyncio.run(countdown.tick_countdowns())
+    assert _edited(db) == []
+
+    # Crossing into the next mark is owed again
+    clock.advance(1500)
+    asyncio.run(countdown.tick_countdowns())
+    assert _edited(db) == [1]
@@ -0,0 +1,54 @@
+import asyncio
+from utils.jobs import JobScheduler
+
+
+def test_jobs_follow_the_virtual_clock(clock):
+    ran = []
+    scheduler = JobScheduler()
+
+    async def tick():
+        ran.append(("tick", clock.time()))
+
+    async def once(name):
+        ran.append((name, clock.time()))
+
+    t0 = clock.time()
+    scheduler.every(10, tick)
+    scheduler.at(t0 + 25, once, "a", job_id="once")
+    scheduler.at(t0 + 15, once, "cancelled", job_id="gone")
+    scheduler.cancel("gone")
+    asyncio.run(scheduler.run_until(t0 + 30))
+
+    assert ran == [("tick", t0 + 10), ("tick", t0 + 20), ("a", t0 + 25), ("tick", t0 + 30)]
+    assert clock.time() == t0 + 30
+
+
+def test_late_periodic_job_runs_once_and_keeps_cadence(clock):
+    ran = []
+    scheduler = JobScheduler()
+
+    async def tick():
+        ran.append(clock.time())
+
+    t0 = clock.time()
+    scheduler.every(10, tick)
+    clock.advance(35)
+    asyncio.run(scheduler.run_due())
+
+    assert ran == [t0 + 35]
+    assert scheduler.next_run() == t0 + 40
+
+
+def test_rescheduling_replaces_the_pending_job(clock):
+    ran = []
+    scheduler = JobScheduler()
+
+    async def publish(auction_id):
+        ran.append((auction_id, clock.time()))
+
+    t0 = clock.time()
+    scheduler.at(t0 + 5, publish, 1, job_id="publish_1")
+    scheduler.at(t0 + 8, publish, 1, job_id="publish_1")
+    asyncio.run(scheduler.run_until(t0 + 10))
+
+    assert ran == [(1, t0 + 8)]
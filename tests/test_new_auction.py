@@ -0,0 +1,59 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from telegram.error import BadRequest, TimedOut
+from controllers.new_auction import handle_newauction, sweep_posting
+
+SELLER = 7
+
+
+@pytest.fixture
+def seller(db):
+    db.execute("INSERT OR REPLACE INTO bindings (user_id, channel_id) VALUES (?, -100)", (SELLER,))
+    db.commit()
+    yield SELLER
+    db.execute("DELETE FROM bindings WHERE user_id = ?", (SELLER,))
+    db.commit()
+
+
+def _post(bot):
+    async def reply_text(text, **kwargs):
+        pass
+
+    msg = SimpleNamespace(
+        photo=[SimpleNamespace(file_id="photo")],
+        caption='/sa "Lamp" 10 10 1 60 0 "brass"',
+        from_user=SimpleNamespace(id=SELLER),
+        reply_text=reply_text,
+    )
+    return asyncio.run(handle_newauction(SimpleNamespace(message=msg), SimpleNamespace(bot=bot)))
+
+
+def _statuses(db):
+    return [s for (s,) in db.execute("SELECT status FROM auctions")]
+
+
+def test_refused_post_discards_the_row(db, bot, seller, monkeypatch):
+    async def send_photo(**kwargs):
+        raise BadRequest("chat not found")
+
+    monkeypatch.setattr(bot, "send_photo", send_photo, raising=False)
+    with pytest.raises(BadRequest):
+        _post(bot)
+    assert _statuses(db) == []
+
+
+def test_unconfirmed_post_is_kept_until_the_startup_sweep(db, bot, seller, monkeypatch):
+    async def send_photo(**kwargs):
+        raise TimedOut()
+
+    monkeypatch.setattr(bot, "send_photo", send_photo, raising=False)
+    with pytest.raises(TimedOut):
+        _post(bot)
+    assert _statuses(db) == ["POSTING"]
+
+    assert sweep_posting() == 1
+    assert _statuses(db) == []
+    (payload,) = db.execute("SELECT payload FROM outbox WHERE method = 'send_message'").fetchone()
+    assert json.loads(payload)["chat_id"] == SELLER
@@ -0,0 +1,63 @@
+import asyncio
+import time
+from telegram.error import RetryAfter
+from db.outbox import enqueue
+from setups import outbox
+
+
+def _pending(db):
+    return db.execute("SELECT id, next_attempt_at FROM outbox WHERE status = 'PENDING' ORDER BY id").fetchall()
+
+
+def test_flood_limited_chat_is_skipped_without_stalling_others(db, bot, clock, monkeypatch):
+    async def send_message(**kwargs):
+        if kwargs["chat_id"] == 1:
+            raise RetryAfter(30)
+        bot.calls.append((clock.time(), "send_message", kwargs))
+
+    monkeypatch.setattr(bot, "send_message", send_message, raising=False)
+    for chat_id, text in ((1, "a1"), (2, "b1"), (1, "a2"), (2, "b2")):
+        enqueue("send_message", bot_id=bot.id, chat_id=chat_id, text=text)
+    db.commit()
+    bot.calls.clear()
+
+    started = time.perf_counter()
+    assert asyncio.run(outbox.drain_outbox()) == 4
+    assert time.perf_counter() - started < 1
+    assert [kwargs["text"] for _, _, kwargs in bot.calls] == ["b1", "b2"]
+
+    # Both of chat 1's rows wait out the delay, still in order
+    due = int(clock.time()) + 30
+    assert [at for _, at in _pending(db)] == [due, due]
+    assert asyncio.run(outbox.drain_outbox()) == 0
+
+
+def test_chats_are_delivered_concurrently(db, bot, clock, monkeypatch):
+    async def send_message(**kwargs):
+        await asyncio.sleep(0.1)
+
+    monkeypatch.setattr(bot, "send_message", send_message, raising=False)
+    monkeypatch.setattr(outbox, "OUTBOX_CONCURRENCY", 8)
+    for chat_id in range(1, 9):
+        enqueue("send_message", bot_id=bot.id, chat_id=chat_id, text="hi")
+    db.commit()
+
+    started = time.perf_counter()
+    asyncio.run(outbox.drain_outbox())
+    assert time.perf_counter() - started < 0.5
+    assert _pending(db) == []
+
+
+def test_dead_rows_are_pruned_after_retention(db, bot, clock, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_DEAD_RETENTION", 3600)
+    for text in ("old", "new"):
+        enqueue("send_message", bot_id=bot.id, chat_id=1, text=text)
+    db.commit()
+    old, new = (out_id for out_id, _ in _pending(db))
+    outbox._mark_dead(old, 8, "boom")
+    clock.advance(1800)
+    outbox._mark_dead(new, 8, "boom")
+
+    clock.advance(1801)
+    assert asyncio.run(outbox.prune_outbox()) == 1
+    assert [out_id for (out_id,) in db.execute("SELECT id FROM outbox WHERE status = 'DEAD'")] == [new]
@@ -0,0 +1,71 @@
+from itertools import permutations
+from utils.proxy_bidding import ProxyBid, Resolution, resolve_proxies
+
+SB, INC = 10, 5
+
+
+def test_no_proxies_leaves_price():
+    assert resolve_proxies(50, 1, SB, INC, []) is None
+    assert resolve_proxies(0, None, SB, INC, []) is None
+
+
+def test_lone_proxy_opens_at_starting_bid():
+    assert resolve_proxies(0, None, SB, INC, [ProxyBid(2, 100, 1)]) == Resolution(SB, 2)
+
+
+def test_lone_proxy_below_starting_bid_is_ignored():
+    assert resolve_proxies(0, None, SB, INC, [ProxyBid(2, 9, 1)]) is None
+
+
+def test_price_is_runner_up_plus_min_inc():
+    proxies = [ProxyBid(2, 100, 1), ProxyBid(3, 80, 2)]
+    assert resolve_proxies(0, None, SB, INC, proxies) == Resolution(85, 2)
+
+
+def test_price_is_capped_at_winner_max():
+    proxies = [ProxyBid(2, 100, 1), ProxyBid(3, 98, 2)]
+    assert resolve_proxies(0, None, SB, INC, proxies) == Resolution(100, 2)
+
+
+def test_tie_goes_to_earliest_registration():
+    proxies = [ProxyBid(2, 100, 7), ProxyBid(3, 100, 4)]
+    assert resolve_proxies(0, None, SB, INC, proxies) == Resolution(100, 3)
+
+
+def test_result_does_not_depend_on_input_order():
+    proxies = [ProxyBid(2, 100, 3), ProxyBid(3, 100, 1), ProxyBid(4, 60, 2)]
+    results = {resolve_proxies(20, 9, SB, INC, list(p)) for p in permutations(proxies)}
+    assert results == {Resolution(100, 3)}
+
+
+def test_proxy_outbids_plain_holder_by_one_step():
+    assert resolve_proxies(50, 1, SB, INC, [ProxyBid(2, 100, 1)]) == Resolution(55, 2)
+
+
+def test_min_inc_stepping_from_current_price():
+    assert resolve_proxies(50, 1, SB, INC, [ProxyBid(2, 54, 1)]) is None
+    assert resolve_proxies(50, 1, SB, INC, [ProxyBid(2, 55, 1)]) == Resolution(55, 2)
+
+
+def test_holder_with_proxy_alone_keeps_price():
+    assert resolve_proxies(50, 1, SB, INC, [ProxyBid(1, 200, 1)]) is None
+
+
+def test_holder_with_proxy_defends_against_challenger():
+    proxies = [ProxyBid(1, 200, 1), ProxyBid(2, 120, 2)]
+    assert resolve_proxies(50, 1, SB, INC, proxies) == Resolution(125, 1)
+
+
+def test_holder_wins_tie_against_earlier_proxy():
+    proxies = [ProxyBid(2, 120, 1), ProxyBid(1, 120, 2)]
+    assert resolve_proxies(50, 1, SB, INC, proxies) == Resolution(120, 1)
+
+
+def test_holder_proxy_beaten_by_higher_max():
+    proxies = [ProxyBid(1, 80, 1), ProxyBid(2, 100, 2)]
+    assert resolve_proxies(50, 1, SB, INC, proxies) == Resolution(85, 2)
+
+
+def test_challenger_below_holder_current_price_step_is_ignored():
+    proxies = [ProxyBid(1, 200, 1), ProxyBid(2, 52, 2)]
+    assert resolve_proxies(50, 1, SB, INC, proxies) is None
@@ -0,0 +1,20 @@
+from db.proxy_bids import register_proxy, load_proxies, display_name
+
+
+def _seq(auction_id, user_id):
+    return {p.user_id: p.seq for p in load_proxies(auction_id)}[user_id]
+
+
+def test_updating_a_max_keeps_tie_priority(db):
+    register_proxy(901, 1, 100, "first")
+    register_proxy(901, 2, 100, "second")
+    db.commit()
+    seq = _seq(901, 1)
+
+    register_proxy(901, 1, 100, "first")
+    register_proxy(901, 1, 150, "renamed")
+    db.commit()
+
+    assert _seq(901, 1) == seq < _seq(901, 2)
+    assert {p.user_id: p.max_bid for p in load_proxies(901)} == {1: 150, 2: 100}
+    assert display_name(901, 1) == "renamed"
@@ -0,0 +1,10 @@
+from db.search import search
+
+
+def test_only_the_newest_matches_are_ranked(db, lot):
+    ids = [lot(post_id, 1_800_000_600) for post_id in range(1, 6)]
+    db.execute("UPDATE auctions SET status = 'ENDED' WHERE auction_id = ?", (ids[-1],))
+    db.commit()
+
+    hits = search(db, ["lot"], ("LIVE",), cap=3)
+    assert sorted(hit[1] for hit in hits) == ids[1:4]
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import random
+import time
+import tracemalloc
+from config.settings import COUNTDOWN_MARKS
+from controllers.bid import PendingBid, resolve_bids
+from db.auctions import AUCTIONS
+from db.proxy_bids import load_proxies, register_proxy
+from setups import countdown
+from setups.notifications import NOTIFY
+from setups.outbox import drain_outbox
+from setups.scheduler import add_periodic_jobs, schedule_publish
+from utils.jobs import JobScheduler
+from utils.proxy_bidding import resolve_proxies
+from utils.time import now
+
+# Days of auction lifecycles on a VirtualClock, driven by the production jobs
+# (publish, bids and proxy resolution, countdown, notifications, closing and
+# outbox delivery). Scale it up with SOAK_AUCTIONS / SOAK_DAYS / SOAK_BURST;
+# run with -s for the report.
+AUCTION_COUNT = int(os.environ.get("SOAK_AUCTIONS", 500))
+DAYS = float(os.environ.get("SOAK_DAYS", 1))
+BURST = int(os.environ.get("SOAK_BURST", 200))  # lots that all end within one minute
+SEED = int(os.environ.get("SOAK_SEED", 1))
+
+CHANNEL, CHAT, SELLER = -1009, -2009, 7
+CHECK_EVERY, DRAIN_EVERY, SAMPLE_EVERY = 15, 5, 6 * 3600
+# Ended caption delivered at most one check pass plus one outbox pass after end_time
+CLOSE_SLA = CHECK_EVERY + DRAIN_EVERY
+
+
+class Soak:
+    def __init__(self, db, bot, clock):
+        self.db, self.bot, self.clock = db, bot, clock
+        self.rng = random.Random(SEED)
+        self.scheduler = JobScheduler()
+        self.expected = {}  # auction_id -> (highest_bid, highest_bidder)
+        self.bids = {}  # auction_id -> bids placed
+        self.burst = set()
+        self.ended_at = {}  # channel_post_id -> clock time the ended caption went out
+        self.countdown_edits = 0
+        self.dms = 0
+        self.samples = []
+        self._message_id = 0
+
+    def _lot(self, start: int, end: int, sb: int, rp: int, min_inc: int) -> int:
+        cur = self.db.execute(
+            """
+            INSERT INTO auctions (
+                channel_id, title, description, sb, rp, min_inc, end_time, anti_snipe, highest_bid,
+                status, owner_user_id, start_time, photo_file_id, bot_id
+            )
+            VALUES (?, 'Soak lot', 'soak', ?, ?, ?, ?, 2, 0, 'SCHEDULED', ?, ?, 'photo', ?)
+            """,
+            (CHANNEL, sb, rp, min_inc, end, SELLER, start, self.bot.id),
+        )
+        return cur.lastrowid
+
+    def plan(self):
+        t0, span = now(), int(DAYS * 86400)
+        burst_end = t0 + span // 2
+        for i in range(AUCTION_COUNT):
+            in_burst = i < BURST
+            if in_burst:
+                end = burst_end + self.rng.randrange(60)
+                start = end - self.rng.randrange(1800, 6 * 3600)
+            else:
+                start = t0 + self.rng.randrange(60, span - 7 * 3600)
+                end = start + self.rng.randrange(1800, 6 * 3600)
+            sb, min_inc = self.rng.choice((10, 50, 100)), self.rng.choice((1, 5, 10))
+            auction_id = self._lot(start, end, sb, sb + self.rng.randrange(0, 200), min_inc)
+            if in_burst:
+                self.burst.add(auction_id)
+            schedule_publish(self.scheduler, auction_id, start)
+
+            if i % 5 == 0:
+                # Registered maxima, then one opening bid they all respond to
+                for k in range(3):
+                    register_proxy(auction_id, 10_000 + i * 10 + k, sb + self.rng.randrange(0, 500), f"proxy{k}")
+                opener = 20_000 + i
+                outcome = resolve_proxies(sb, opener, sb, min_inc, load_proxies(auction_id))
+                self.expected[auction_id] = tuple(outcome) if outcome else (sb, opener)
+                self.scheduler.at(start + 60, self.bid, auction_id, opener, job_id=f"bid_{auction_id}_0")
+            else:
+                # Plain bidding war, some of it inside the anti-snipe window
+                count = self.rng.randrange(0, 9)
+                bidder = None
+                for k in range(count):
+                    bidder = 30_000 + self.rng.randrange(50)
+                    at = self.rng.randrange(start + 30, end)
+                    self.scheduler.at(at, self.bid, auction_id, bidder, job_id=f"bid_{auction_id}_{k}")
+                self.bids[auction_id] = count
+                self.expected[auction_id] = (sb + (count - 1) * min_inc, None) if count else (0, None)
+        self.db.commit()
+
+    async def bid(self, auction_id: int, user_id: int):
+        a = AUCTIONS.get(auction_id)
+        amount = a.sb if not a.highest_bid else a.highest_bid + a.min_inc
+        self._message_id += 1
+        await resolve_bids(auction_id, [PendingBid(CHAT, self._message_id, user_id, f"u{user_id}", amount, now(), self.bot.id)])
+
+    # Folds what the fake bot received into counters so the test itself does not grow
+    def harvest(self):
+        for ts, method, kwargs in self.bot.calls:
+            if method == "edit_message_caption":
+                if "Auction Ended" in kwargs["caption"]:
+                    self.ended_at.setdefault(kwargs["message_id"], ts)
+                elif "left" in kwargs["caption"]:
+                    self.countdown_edits += 1
+            elif method == "send_message" and kwargs["chat_id"] > 0:
+                self.dms += 1
+        self.bot.calls.clear()
+
+    async def sample(self):
+        self.harvest()
+        db_bytes = self.db.execute("PRAGMA page_count").fetchone()[0] * self.db.execute("PRAGMA page_size").fetchone()[0]
+        outbox = self.db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        self.samples.append((now(), tracemalloc.get_traced_memory()[0], db_bytes, outbox, len(countdown._shown), len(NOTIFY)))
+
+    async def run(self):
+        add_periodic_jobs(self.scheduler)
+        self.scheduler.every(DRAIN_EVERY, drain_outbox)
+        self.scheduler.every(SAMPLE_EVERY, self.sample)
+        self.plan()
+        tracemalloc.start()
+        try:
+            await self.scheduler.run_until(now() + int(DAYS * 86400) + 3600)
+            await self.sample()
+        finally:
+            tracemalloc.stop()
+
+
+def test_soak(db, bot, clock):
+    soak = Soak(db, bot, clock)
+    started = time.perf_counter()
+    asyncio.run(soak.run())
+    took = time.perf_counter() - started
+
+    rows = db.execute("SELECT auction_id, channel_post_id, status, end_time, highest_bid, highest_bidder FROM auctions").fetchall()
+    lags = {auction_id: soak.ended_at.get(post_id, float("inf")) - end for auction_id, post_id, _, end, _, _ in rows}
+    burst_lags = sorted(lags[a] for a in soak.burst)
+    all_lags = sorted(lags.values())
+
+    print(f"\nsoak: {len(rows)} lots over {DAYS:g} virtual days in {took:.1f}s wall")
+    print(f"close lag p50={all_lags[len(all_lags) // 2]:.0f}s max={all_lags[-1]:.0f}s; burst of {len(burst_lags)} max={burst_lags[-1] if burst_lags else 0:.0f}s")
+    print(f"countdown edits={soak.countdown_edits} DMs={soak.dms}")
+    print(f"{'virtual hour':>12}{'py KiB':>10}{'db KiB':>10}{'outbox':>8}{'shown':>7}{'notify':>8}")
+    t0 = soak.samples[0][0] - SAMPLE_EVERY
+    for ts, mem, db_bytes, outbox, shown, pending in soak.samples:
+        print(f"{(ts - t0) / 3600:>12.0f}{mem / 1024:>10.0f}{db_bytes / 1024:>10.0f}{outbox:>8}{shown:>7}{pending:>8}")
+
+    # Every lot published, closed and announced within one check and one outbox pass
+    assert {status for _, _, status, _, _, _ in rows} == {"ENDED"}
+    assert all_lags[-1] <= CLOSE_SLA
+
+    # Prices: proxy lots match the engine, bidding wars match the bids placed
+    for auction_id, _, _, _, highest, holder in rows:
+        want_bid, want_holder = soak.expected[auction_id]
+        assert highest == want_bid, auction_id
+        if want_holder is not None:
+            assert holder == want_holder, auction_id
+
+    # Countdown lines went out, and nothing is left queued or tracked once every lot ended
+    assert soak.countdown_edits >= (len(rows) - len(soak.burst)) // 2
+    final = soak.samples[-1]
+    assert final[3] == 0 and final[4] == 0 and final[5] == 0
+
+    # Python memory settles: the second half grows by far less than the first
+    first_half = [s[1] for s in soak.samples[: len(soak.samples) // 2]]
+    second_half = [s[1] for s in soak.samples[len(soak.samples) // 2:]]
+    assert max(second_half) - min(second_half) <= max(2 * (max(first_half) - min(first_half)), 1 << 20)
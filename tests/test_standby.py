@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from config.settings import LEASE_TTL
+from setups import standby
+
+
+@pytest.fixture
+def lease(db, clock, monkeypatch):
+    monkeypatch.setattr(standby, "_version", None)
+    monkeypatch.setattr(standby, "_live", set())
+    db.execute("DELETE FROM settings WHERE key = 'lease'")
+    db.commit()
+    yield
+    db.execute("DELETE FROM settings WHERE key = 'lease'")
+    db.commit()
+
+
+def _acquire_as(monkeypatch, instance):
+    monkeypatch.setattr(standby, "INSTANCE_ID", instance)
+    return standby.try_acquire()
+
+
+def test_only_one_instance_wins_the_lease_until_it_lapses(lease, clock, monkeypatch):
+    assert _acquire_as(monkeypatch, "a")
+    assert not _acquire_as(monkeypatch, "b")
+    clock.advance(LEASE_TTL - 1)
+    assert _acquire_as(monkeypatch, "a")
+
+    # Renewed just now: still not free a TTL after the first acquisition
+    clock.advance(LEASE_TTL - 1)
+    assert not _acquire_as(monkeypatch, "b")
+
+    # Both racing for an expired lease: the first statement takes it
+    clock.advance(1)
+    assert _acquire_as(monkeypatch, "b")
+    assert not _acquire_as(monkeypatch, "a")
+    assert standby.holder() == "b"
+
+
+def test_hold_lease_stops_once_taken_over(lease, clock, monkeypatch):
+    assert _acquire_as(monkeypatch, "b")
+    clock.advance(LEASE_TTL)
+    assert _acquire_as(monkeypatch, "a")
+
+    # "b" wakes up after its lease lapsed and "a" took over
+    monkeypatch.setattr(standby, "INSTANCE_ID", "b")
+    monkeypatch.setattr(standby, "LEASE_RENEW", 0)
+    stop = asyncio.Event()
+    asyncio.run(asyncio.wait_for(standby.hold_lease(stop), 1))
+    assert stop.is_set()
+    assert standby.holder() == "a"
+
+
+# The standby follows the active instance's commits on its own connection to a
+# shared file, as in production
+def test_lease_renewals_do_not_reload_the_standby(tmp_path, clock, monkeypatch):
+    from db.connection import DB, InstrumentedConnection, _init_db
+    path = str(tmp_path / "ha.db")
+    monkeypatch.setattr(DB, "_conn", InstrumentedConnection(_init_db(path)))
+    monkeypatch.setattr(standby, "_version", None)
+    monkeypatch.setattr(standby, "_live", set())
+    loads = []
+    monkeypatch.setattr(standby.api, "load", lambda live: loads.append(len(live)))
+    active = _init_db(path)
+
+    def commit(sql, *args):
+        active.execute(sql, args)
+        active.commit()
+
+    def add_lot(post_id):
+        commit(
+            "INSERT INTO auctions (channel_id, channel_post_id, title, status, end_time) VALUES (-100, ?, 'Lot', 'LIVE', ?)",
+            post_id, int(clock.time()) + 600,
+        )
+
+    add_lot(1)
+    standby._warm()
+    assert loads == [1]
+
+    for _ in range(3):
+        ts = int(clock.time())
+        commit(standby._ACQUIRE, "active", ts + LEASE_TTL, "active", ts)
+        clock.advance(1)
+        standby._warm()
+    assert loads == [1]
+
+    add_lot(2)
+    standby._warm()
+    assert loads == [1, 2]
+    active.close()
+    DB.close()
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+from config.settings import logger
+
+
+# Groups items by key and hands each group to `flush` once, `window` seconds
+# after its first item arrived. Items keep their arrival order; a key that
+# receives more while its batch is being flushed starts a new batch.
+class KeyedBatcher:
+    def __init__(self, window: float, flush: Callable[[Hashable, List[Any]], Awaitable[None]]):
+        self.window = window
+        self.flush = flush
+        self._pending: Dict[Hashable, List[Any]] = {}
+        self._tasks = set()
+        self.counters = {"items": 0, "batches": 0, "largest": 0, "failed": 0}
+
+    def submit(self, key: Hashable, item: Any):
+        items = self._pending.get(key)
+        if items is None:
+            items = self._pending[key] = []
+            task = asyncio.get_running_loop().create_task(self._run(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        items.append(item)
+        self.counters["items"] += 1
+
+    async def _run(self, key: Hashable):
+        await asyncio.sleep(self.window)
+        items = self._pending.pop(key)
+        self.counters["batches"] += 1
+        self.counters["largest"] = max(self.counters["largest"], len(items))
+        try:
+            await self.flush(key, items)
+        except Exception as e:
+            self.counters["failed"] += 1
+            logger.exception("batching: flush failed key=%s items=%d error=%s", key, len(items), e)
+
+    # Lets in-flight batches finish, e.g. before the DB is closed on shutdown
+    async def drain(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Optional
+from config.settings import SG_TZ, COUNTDOWN_ENABLED, COUNTDOWN_MARKS
+from utils.countdown import mark_for, mark_label
+from utils.time import now
+
+
+def fmt_time(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=SG_TZ).strftime('%Y-%m-%d %H:%M')
+
+
+def _max_bid_hint(auction_id: Optional[int]) -> str:
+    if auction_id is None:
+        return ""
+    return f"\n🔒 Private max bid: DM me <code>/maxbid {auction_id} &lt;amount&gt;</code>"
+
+
+# Rendered into every live caption while countdowns are on, so a bid edit
+# never wipes the line the ticker last wrote
+def _countdown(end_time: int) -> str:
+    if not COUNTDOWN_ENABLED:
+        return ""
+    mark = mark_for(end_time - now(), COUNTDOWN_MARKS)
+    return f"\n⏳ Less than {mark_label(mark)} left" if mark else ""
+
+
+def live_caption(title, description, sb, rp, min_inc, end_time, anti, auction_id=None) -> str:
+    return (
+        f"🛒 <b>{title}</b>\n\n"
+        f"{description}\n\n"
+        f"💰 SB: {sb}\n"
+        f"🏷 RP: {rp}\n"
+        f"➕ Min Inc: {min_inc}\n"
+        f"⏱ Ends: <b>{fmt_time(end_time)}</b>{_countdown(end_time)}\n"
+        f"🛡 Anti-snipe: {anti} min\n\n"
+        f"💬 Comment with a number to bid (or 'SB')"
+        f"{_max_bid_hint(auction_id)}"
+    )
+
+
+def bid_caption(title, description, sb, rp, min_inc, anti, bid, bidder_id, bidder_name, end_time, auction_id=None) -> str:
+    return (
+        f"🛒 <b>{title}</b>\n\n"
+        f"{description}\n\n"
+        f"💰 SB: {sb}\n"
+        f"🏷 RP: {rp}\n"
+        f"➕ Min Inc: {min_inc}\n"
+        f"🛡 Anti-snipe: {anti} min\n\n"
+        f"💰 Current bid: <b>{bid}</b>\n"
+        f"👤 Bidder: <a href='tg://user?id={bidder_id}'>{bidder_name}</a>\n"
+        f"⏱ Ends: <b>{fmt_time(end_time)}</b>{_countdown(end_time)}"
+        f"{_max_bid_hint(auction_id)}"
+    )
@@ -0,0 +1,24 @@
+from typing import Optional, Sequence
+
+
+# The smallest mark still at or above the time remaining; None beyond the
+# largest mark or once the auction is over. Marks are sorted largest first.
+def mark_for(remaining: int, marks: Sequence[int]) -> Optional[int]:
+    if remaining <= 0 or not marks or remaining > marks[0]:
+        return None
+    current = marks[0]
+    for m in marks:
+        if remaining > m:
+            break
+        current = m
+    return current
+
+
+def mark_label(mark: int) -> str:
+    if mark % 86400 == 0:
+        n, unit = mark // 86400, "day"
+    elif mark % 3600 == 0:
+        n, unit = mark // 3600, "hour"
+    else:
+        n, unit = max(1, mark // 60), "min"
+    return f"{n} {unit}{'s' if n > 1 and unit != 'min' else ''}"
@@ -0,0 +1,131 @@
+import asyncio
+import heapq
+import itertools
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from config.settings import logger
+from utils.time import get_clock
+
+
+class Job:
+    __slots__ = ("id", "func", "args", "interval", "next_run", "running")
+
+    def __init__(self, job_id: str, func: Callable[..., Awaitable[Any]], args: Tuple, interval: Optional[float], next_run: float):
+        self.id = job_id
+        self.func = func
+        self.args = args
+        self.interval = interval
+        self.next_run = next_run
+        self.running = False
+
+
+# Periodic and one-off coroutine jobs timed by utils.time, so the same jobs run
+# on the wall clock in production and on a VirtualClock in soak runs. A job is
+# never run twice at once: one still running when it comes due again is
+# skipped, and a periodic job that fell behind runs once and keeps its cadence.
+class JobScheduler:
+    def __init__(self, poll: float = 1.0):
+        self.poll = poll
+        self._jobs: Dict[str, Job] = {}
+        # (next_run, order, job); entries for cancelled, replaced or rescheduled jobs are skipped when popped
+        self._heap: List[Tuple[float, int, Job]] = []
+        self._order = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._running = set()
+
+    def every(self, seconds: float, func: Callable[[], Awaitable[Any]], *, job_id: Optional[str] = None, first_run: Optional[float] = None):
+        start = get_clock().time() + seconds if first_run is None else first_run
+        return self._add(Job(job_id or func.__name__, func, (), seconds, start))
+
+    # Replaces any pending job with the same id
+    def at(self, ts: float, func: Callable[..., Awaitable[Any]], *args, job_id: str):
+        return self._add(Job(job_id, func, args, None, ts))
+
+    def _add(self, job: Job) -> Job:
+        self._jobs[job.id] = job
+        heapq.heappush(self._heap, (job.next_run, next(self._order), job))
+        return job
+
+    def _current(self, entry: Tuple[float, int, Job]) -> bool:
+        ts, _, job = entry
+        return self._jobs.get(job.id) is job and job.next_run == ts
+
+    def cancel(self, job_id: str) -> bool:
+        return self._jobs.pop(job_id, None) is not None
+
+    def jobs(self) -> List[Job]:
+        return sorted(self._jobs.values(), key=lambda j: j.next_run)
+
+    def next_run(self) -> Optional[float]:
+        while self._heap and not self._current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # Runs every job due at the clock's current time, earliest first. With
+    # wait=False each runs in its own task (the live loop); with wait=True they
+    # run one after another and are finished when this returns (virtual time).
+    async def run_due(self, wait: bool = True) -> int:
+        ts = get_clock().time()
+        started = 0
+        due = []
+        while self._heap and self._heap[0][0] <= ts:
+            entry = heapq.heappop(self._heap)
+            if self._current(entry):
+                due.append(entry[2])
+        for job in due:
+            if job.interval:
+                while job.next_run <= ts:
+                    job.next_run += job.interval
+                heapq.heappush(self._heap, (job.next_run, next(self._order), job))
+            else:
+                del self._jobs[job.id]
+            if job.running:
+                logger.warning("jobs: %s still running, skipped", job.id)
+                continue
+            started += 1
+            if wait:
+                await self._run(job)
+            else:
+                task = asyncio.get_running_loop().create_task(self._run(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+        return started
+
+    async def _run(self, job: Job):
+        job.running = True
+        try:
+            await job.func(*job.args)
+        except Exception as e:
+            logger.exception("jobs: %s failed: %s", job.id, e)
+        finally:
+            job.running = False
+
+    # Virtual time only: steps the clock from job to job up to `ts`, running
+    # each as it comes due, and leaves the clock at `ts`
+    async def run_until(self, ts: float) -> int:
+        clock = get_clock()
+        ran = 0
+        while True:
+            upcoming = self.next_run()
+            if upcoming is None or upcoming > ts:
+                break
+            clock.set(max(clock.time(), upcoming))
+            ran += await self.run_due()
+        clock.set(max(clock.time(), ts))
+        return ran
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    # Checks at least every `poll` seconds, so jobs added meanwhile and clock
+    # changes are picked up without a wake-up signal
+    async def _loop(self):
+        while True:
+            await self.run_due(wait=False)
+            upcoming = self.next_run()
+            delay = self.poll if upcoming is None else upcoming - get_clock().time()
+            await asyncio.sleep(min(max(delay, 0.01), self.poll))
+
+    def shutdown(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+from typing import Dict, Optional, Tuple
+
+
+# In-memory mirror of public auction state for the HTTP API. Every change takes
+# the next value of one global version counter, so a channel's or an auction's
+# version is simply the counter value of its latest change. Encoded bodies are
+# cached per version and shared by every client asking for the same one.
+class LiveState:
+    def __init__(self, ended_ttl: float = 3600):
+        self.version = 0
+        self.ended_ttl = ended_ttl
+        self._auctions: Dict[int, Tuple[int, dict]] = {}
+        self._channels: Dict[int, int] = {}
+        self._ended: Dict[int, float] = {}
+        self._bodies: Dict[Tuple[str, int], Tuple[int, bytes]] = {}
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._auctions)
+
+    def put(self, auction: dict):
+        current = self._auctions.get(auction["auction_id"])
+        if current and current[1] == auction:
+            return
+        self.version += 1
+        self._auctions[auction["auction_id"]] = (self.version, auction)
+        self._channels[auction["channel_id"]] = self.version
+        if auction["status"] != "LIVE":
+            self._ended.setdefault(auction["auction_id"], time.monotonic())
+        self._prune()
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    # Ended lots stay readable for ended_ttl seconds so pollers see the final price
+    def _prune(self):
+        cutoff = time.monotonic() - self.ended_ttl
+        for auction_id, ended_at in list(self._ended.items()):
+            if ended_at < cutoff:
+                del self._ended[auction_id]
+                self._auctions.pop(auction_id, None)
+
+    def auction_version(self, auction_id: int) -> Optional[int]:
+        entry = self._auctions.get(auction_id)
+        return entry[0] if entry else None
+
+    def channel_version(self, channel_id: int) -> Optional[int]:
+        return self._channels.get(channel_id)
+
+    def auction_body(self, auction_id: int) -> Optional[Tuple[int, bytes]]:
+        entry = self._auctions.get(auction_id)
+        if entry is None:
+            return None
+        return self._cached(("a", auction_id), entry[0], lambda: {"version": entry[0], "auction": entry[1]})
+
+    def channel_body(self, channel_id: int) -> Optional[Tuple[int, bytes]]:
+        version = self._channels.get(channel_id)
+        if version is None:
+            return None
+
+        def build():
+            lots = [a for _, a in self._auctions.values() if a["channel_id"] == channel_id and a["status"] == "LIVE"]
+            lots.sort(key=lambda a: a["end_time"])
+            return {"version": version, "channel_id": channel_id, "auctions": lots}
+
+        return self._cached(("c", channel_id), version, build)
+
+    def _cached(self, key, version: int, build) -> Tuple[int, bytes]:
+        hit = self._bodies.get(key)
+        if hit is None or hit[0] != version:
+            hit = self._bodies[key] = (version, json.dumps(build(), separators=(",", ":")).encode())
+        return hit
+
+    # Waits until version_of() moves past `since` or `timeout` runs out.
+    # Returns whether it moved.
+    async def wait_past(self, version_of, since: int, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (version_of() or 0) <= since:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
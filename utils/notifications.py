@@ -0,0 +1,32 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple
+
+
+# Per-recipient queue of pending DM lines. A recipient is any hashable key
+# (the caller uses (bot_id, user_id)). Events for the same (auction, kind)
+# replace each other, so a bidding war collapses into one line per recipient.
+class NotificationQueue:
+    def __init__(self):
+        self._pending: "OrderedDict[Hashable, Dict[Tuple[int, str], str]]" = OrderedDict()
+        self.counters = {"events": 0, "messages": 0}
+
+    def push(self, recipient: Hashable, auction_id: int, kind: str, line: str):
+        self._pending.setdefault(recipient, {})[(auction_id, kind)] = line
+        self.counters["events"] += 1
+
+    def discard(self, recipient: Hashable, auction_id: int, kind: str):
+        lines = self._pending.get(recipient)
+        if lines and lines.pop((auction_id, kind), None) is not None and not lines:
+            del self._pending[recipient]
+
+    # Oldest recipients first; anyone over the limit waits for the next window
+    def pop_batch(self, limit: int) -> List[Tuple[Hashable, List[str]]]:
+        batch = []
+        while self._pending and len(batch) < limit:
+            recipient, lines = self._pending.popitem(last=False)
+            batch.append((recipient, list(lines.values())))
+        self.counters["messages"] += len(batch)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._pending)
@@ -0,0 +1,132 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, NamedTuple
+
+
+class ProfileResult(NamedTuple):
+    report: str
+    files: List[str]
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+# Samples the event-loop thread's stack from a side thread. Handlers and
+# scheduled jobs all run on that loop, so they all show up in the samples.
+class StackSampler:
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def top(self, limit: int = 20) -> str:
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for f in set(frames):
+                total[f] += count
+        n = max(self.samples, 1)
+        lines = [f"{'self%':>6} {'total%':>6}  function"]
+        for func, count in own.most_common(limit):
+            lines.append(f"{100 * count / n:6.1f} {100 * total[func] / n:6.1f}  {func}")
+        return "\n".join(lines)
+
+
+# Delay between when a callback was due and when the loop actually ran it
+async def measure_loop_lag(duration: float, interval: float = 0.05) -> List[float]:
+    loop = asyncio.get_running_loop()
+    lags = []
+    deadline = loop.time() + duration
+    while loop.time() < deadline:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+    return lags
+
+
+def _lag_summary(lags: List[float]) -> str:
+    if not lags:
+        return "loop lag: no samples"
+    ordered = sorted(lags)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (
+        f"loop lag ms: p50={p50 * 1000:.1f} p99={p99 * 1000:.1f} "
+        f"max={ordered[-1] * 1000:.1f} samples={len(ordered)}"
+    )
+
+
+async def run_profile(seconds: float, mode: str, out_dir: str) -> ProfileResult:
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    files = []
+
+    if mode == "cprofile":
+        # cProfile only traces the thread that enables it: this one, the loop thread
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            lags = await measure_loop_lag(seconds)
+        finally:
+            prof.disable()
+        buf = io.StringIO()
+        stats = pstats.Stats(prof, stream=buf)
+        stats.sort_stats("cumulative").print_stats(25)
+        path = os.path.join(out_dir, f"profile-{stamp}.prof")
+        stats.dump_stats(path)
+        files.append(path)
+        top = "\n".join(line for line in buf.getvalue().splitlines() if line.strip())
+    else:
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            lags = await measure_loop_lag(seconds)
+        finally:
+            sampler.stop()
+        path = os.path.join(out_dir, f"profile-{stamp}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(sampler.collapsed())
+        files.append(path)
+        top = f"samples={sampler.samples}\n{sampler.top()}"
+
+    report = f"mode={mode} seconds={seconds:g}\n{_lag_summary(lags)}\n\n{top}"
+    report_path = os.path.join(out_dir, f"profile-{stamp}.txt")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+    files.insert(0, report_path)
+    return ProfileResult(report, files)
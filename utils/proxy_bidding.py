@@ -0,0 +1,56 @@
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+
+class ProxyBid(NamedTuple):
+    user_id: int
+    max_bid: int
+    seq: int  # registration order; earlier wins ties
+
+
+class Resolution(NamedTuple):
+    bid: int
+    bidder: int
+
+
+# Resolve all registered maxima against the current price in one step.
+# The current holder wins ties; between proxies the earlier registration wins.
+# Returns None when the price and holder stay as they are.
+def resolve_proxies(
+    highest: int,
+    holder: Optional[int],
+    sb: int,
+    min_inc: int,
+    proxies: Iterable[ProxyBid],
+) -> Optional[Resolution]:
+    has_holder = holder is not None and highest > 0
+    min_next = highest + min_inc if has_holder else sb
+    holder_cap = highest if has_holder else None
+
+    challengers = []
+    for p in proxies:
+        if has_holder and p.user_id == holder:
+            holder_cap = max(holder_cap, p.max_bid)
+        elif p.max_bid >= min_next:
+            challengers.append(p)
+
+    if not challengers:
+        return None
+
+    # Rank by (max, priority): the holder outranks any proxy at the same max
+    ranked: list[Tuple[int, float, int]] = [(p.max_bid, -p.seq, p.user_id) for p in challengers]
+    if has_holder:
+        ranked.append((holder_cap, float("inf"), holder))
+    ranked.sort(reverse=True)
+
+    win_max, _, winner = ranked[0]
+    runner_max = ranked[1][0] if len(ranked) > 1 else None
+
+    if has_holder and winner == holder:
+        price = min(holder_cap, runner_max + min_inc)
+        if price <= highest:
+            return None
+        return Resolution(price, holder)
+
+    if runner_max is None:
+        return Resolution(min_next, winner)
+    return Resolution(max(min_next, min(win_max, runner_max + min_inc)), winner)
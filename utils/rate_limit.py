@@ -0,0 +1,70 @@
+import time
+from collections import deque
+from typing import Dict, Hashable, Optional
+
+
+class SlidingWindowLimiter:
+    __slots__ = ("limit", "window", "_hits", "_next_sweep")
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._hits: Dict[Hashable, deque] = {}
+        self._next_sweep = 0.0
+
+    def hit(self, key: Hashable, ts: Optional[float] = None) -> bool:
+        ts = time.monotonic() if ts is None else ts
+        if ts >= self._next_sweep:
+            self.sweep(ts)
+
+        q = self._hits.get(key)
+        if q is None:
+            q = self._hits[key] = deque()
+        cutoff = ts - self.window
+        while q and q[0] <= cutoff:
+            q.popleft()
+        if len(q) >= self.limit:
+            return False
+        q.append(ts)
+        return True
+
+    def sweep(self, ts: float):
+        # Drop keys with no hit inside the window so idle users/chats don't accumulate
+        cutoff = ts - self.window
+        for key in [k for k, q in self._hits.items() if not q or q[-1] <= cutoff]:
+            del self._hits[key]
+        self._next_sweep = ts + self.window
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+
+class BidFloodControl:
+    def __init__(self, user_limit: int, chat_limit: int, window: float):
+        self.users = SlidingWindowLimiter(user_limit, window)
+        self.chats = SlidingWindowLimiter(chat_limit, window)
+        self.window = window
+        self._warned = SlidingWindowLimiter(1, window)
+        self.counters = {"allowed": 0, "dropped_user": 0, "dropped_chat": 0, "warned": 0}
+
+    # Returns None when the bid may proceed, otherwise "user" or "chat"
+    def check(self, user_id: int, chat_id: int, ts: Optional[float] = None) -> Optional[str]:
+        ts = time.monotonic() if ts is None else ts
+        if not self.users.hit(user_id, ts):
+            self.counters["dropped_user"] += 1
+            return "user"
+        if not self.chats.hit(chat_id, ts):
+            self.counters["dropped_chat"] += 1
+            return "chat"
+        self.counters["allowed"] += 1
+        return None
+
+    # At most one warning per user per window
+    def should_warn(self, user_id: int, ts: Optional[float] = None) -> bool:
+        if self._warned.hit(user_id, ts):
+            self.counters["warned"] += 1
+            return True
+        return False
+
+    def stats(self) -> dict:
+        return {**self.counters, "tracked_users": len(self.users), "tracked_chats": len(self.chats)}
@@ -0,0 +1,40 @@
+import time
+from typing import Dict, Optional
+
+# Cold-start timings in seconds, by phase. Phases recorded more than once add up.
+_phases: Dict[str, float] = {}
+_t0: Optional[float] = None
+_first_update: Optional[float] = None
+
+
+def begin(t0: float):
+    global _t0
+    _t0 = t0
+
+
+def elapsed() -> float:
+    return time.perf_counter() - (_t0 if _t0 is not None else time.perf_counter())
+
+
+def record(phase: str, seconds: float):
+    _phases[phase] = _phases.get(phase, 0.0) + seconds
+
+
+# Returns True only for the first call
+def first_update() -> bool:
+    global _first_update
+    if _first_update is not None:
+        return False
+    _first_update = elapsed()
+    return True
+
+
+def time_to_first_update() -> Optional[float]:
+    return _first_update
+
+
+def report() -> str:
+    parts = [f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in _phases.items()]
+    if _first_update is not None:
+        parts.append(f"first_update={_first_update * 1000:.0f}ms")
+    return " ".join(parts)
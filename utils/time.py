@@ -2,8 +2,42 @@ import time
 from datetime import datetime
 from config.settings import SG_TZ
 
+class SystemClock:
+    def time(self) -> float:
+        return time.time()
+
+
+# Stands in for the wall clock when driving auction lifecycles faster than
+# real time: nothing moves until advance() or set() is called.
+class VirtualClock:
+    def __init__(self, start: float = None):
+        self._ts = time.time() if start is None else float(start)
+
+    def time(self) -> float:
+        return self._ts
+
+    def advance(self, seconds: float) -> float:
+        self._ts += seconds
+        return self._ts
+
+    def set(self, ts: float):
+        self._ts = float(ts)
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    global _clock
+    _clock = clock or SystemClock()
+
+
 def now() -> int:
-    return int(time.time())
+    return int(_clock.time())
 
 def parse_end_time(duration_or_time: str) -> int:
     try: